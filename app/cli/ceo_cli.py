@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime, date
 
 from app.cli import ui
+from app.db.instrumentation import track_action
 from app.models import ReportType
 from app.services.report_service import ReportService
 from app.cli.staff_cli import _update_profile as _staff_update_profile
@@ -29,6 +30,7 @@ def ceo_portal(account) -> None:
             return
 
 
+@track_action()
 def _view_existing_reports(svc: ReportService) -> None:
     rows = svc.list_all_reports()
     table = Table(title="Existing Reports", show_lines=True)
@@ -69,11 +71,22 @@ def _view_existing_reports(svc: ReportService) -> None:
     _show_report(gen, svc, ask_continue=True)
 
 
+@track_action()
 def _generate_new_report(svc: ReportService) -> None:
     kind = ui.select("Type", ["Daily", "Weekly", "Monthly"])
     ds = ui.text("Enter start date (YYYY-MM-DD):").strip()
     try:
         start_day = datetime.strptime(ds, "%Y-%m-%d").date()
+        rtype = ReportType(kind)
+        window_start = start_day.replace(day=1) if rtype is ReportType.MONTHLY else start_day
+        existing = svc.find_precomputed(rtype, datetime.combine(window_start, datetime.min.time()))
+        if existing is not None and ui.select(
+            f"A {kind.lower()} report for this period already exists (#{existing.report.id}).",
+            ["Show existing report", "Regenerate"],
+        ) == "Show existing report":
+            _show_report(existing, svc, ask_continue=False)
+            ui.wait_continue()
+            return
         if kind == "Daily":
             gen = svc.generate_daily(start_day)
         elif kind == "Weekly":
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from app.cli import ui
+from app.cli.ui import console
+from app.config.settings import settings
+from app.models import Message
+from app.services.messaging_service import MessagingService
+from app.services.notification_bus import MessageEvent, MessageNotice
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# (message id, author id, role label, content)
+_Line = Tuple[int, str, str, str]
+
+
+def chat_repl(svc: MessagingService, account, conversation_id: int, reply: Callable[[str], None]) -> None:
+    """
+    Interactive chat shared by the customer and staff portals.
+    - Opens with the newest settings.chat_history_page messages; /older loads
+      the previous page through a keyset cursor.
+    - New messages arrive as pushed events and only the new lines are printed,
+      so per-message cost does not grow with the conversation and an idle chat
+      issues no queries. Notices of messages sent from other consoles carry
+      ids only; the message is then read from the database. Only while push
+      delivery from other processes is unavailable (logged) does the chat
+      catch up with get_since every settings.chat_poll_s seconds; after a
+      reconnect it catches up once.
+    - Lines are merged by message id, so a message whose event arrives after
+      a newer one (commits finishing out of order) is still shown, in place.
+    """
+    sub = svc.subscribe(conversation_id)  # before the first read, so nothing falls in between
+    try:
+        conv = svc.get_conversation(conversation_id)
+        if conv is None:
+            ui.err("Conversation not found")
+            ui.wait_continue()
+            return
+        page = svc.get_message_page(conversation_id, settings.chat_history_page)
+        lines: List[_Line] = [_line(m) for m in page.messages]
+        seen = {ln[0] for ln in lines}
+        state = {"watch": True, "last_id": max(seen, default=0), "older": page.older_cursor}
+        lock = threading.Lock()
+
+        def fmt(ln: _Line) -> str:
+            who = "You" if ln[1] == account.id else ln[2]
+            return f"[{who}] {ln[3]}"
+
+        def render_all() -> None:
+            body = [f"Subject: {conv.subject}", ""]
+            if state["older"] is not None:
+                body += ["(older messages: type /older)", ""]
+            body += [fmt(ln) for ln in lines]
+            ui.banner(f"Conversation #{conversation_id}", "\n".join(body))
+
+        def append(new: List[_Line]) -> None:
+            with lock:
+                fresh = sorted({ln[0]: ln for ln in new if ln[0] not in seen}.values())
+                if not fresh:
+                    return
+                seen.update(ln[0] for ln in fresh)
+                in_order = fresh[0][0] > state["last_id"]
+                lines.extend(fresh)
+                state["last_id"] = max(state["last_id"], fresh[-1][0])
+                if in_order:
+                    for ln in fresh:
+                        console.print(fmt(ln), markup=False, highlight=False)
+                else:
+                    lines.sort()
+                    render_all()
+
+        def catch_up(after_id: Optional[int] = None) -> None:
+            since = state["last_id"] if after_id is None else after_id
+            append([_line(m) for m in svc.get_since(conversation_id, since)])
+
+        def load_older() -> None:
+            with lock:
+                if state["older"] is None:
+                    ui.info("No older messages.")
+                    return
+                older = svc.get_message_page(conversation_id, settings.chat_history_page, state["older"])
+                earlier = [_line(m) for m in older.messages if m.id not in seen]
+                seen.update(ln[0] for ln in earlier)
+                lines[:0] = earlier
+                state["older"] = older.older_cursor
+                render_all()
+
+        def watcher() -> None:
+            polling = False
+            while state["watch"]:
+                try:
+                    # Wakes every chat_poll_s, but only queries while push delivery is down
+                    ev = sub.get(timeout=settings.chat_poll_s)
+                    if not state["watch"]:
+                        return
+                    if isinstance(ev, MessageEvent):
+                        append([(ev.message_id, ev.user_id, ev.role.value, ev.content)])
+                    elif isinstance(ev, MessageNotice):
+                        if ev.message_id not in seen:
+                            catch_up(min(state["last_id"], ev.message_id - 1))
+                    elif ev is not None or polling:
+                        catch_up()  # RESYNC, or polling fallback
+                    if polling != (not svc.push_is_distributed()):
+                        polling = not polling
+                        if polling:
+                            logger.warning(
+                                "conversation %d: push delivery unavailable; polling every %.1fs",
+                                conversation_id, settings.chat_poll_s,
+                            )
+                        else:
+                            logger.info("conversation %d: push delivery restored; polling stopped", conversation_id)
+                except Exception as e:
+                    ui.err(str(e))
+
+        render_all()
+        threading.Thread(target=watcher, daemon=True).start()
+
+        while True:
+            txt = ui.text("Type a message (/older, /quit):").strip()
+            if txt == "/quit":
+                state["watch"] = False
+                return
+            if txt == "/older":
+                load_older()
+                continue
+            if not txt:
+                continue
+            try:
+                reply(txt)  # our own message comes back through the subscription
+            except Exception as e:
+                ui.err(str(e))
+                ui.wait_continue()
+    finally:
+        sub.close()
+
+
+def _line(m: Message) -> _Line:
+    return (int(m.id or 0), m.user_id, m.role.value, m.content)
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from app.models import Account, Role, PaymentMethod
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+from app.models import Account, Item, Role, PaymentMethod
 from app.cli import ui
+from app.cli.chat import chat_repl
+from app.db.instrumentation import track_action
 from app.services.messaging_service import MessagingService
-from app.services.catalog_service import CatalogService
+from app.services.catalog_service import CatalogFilter, CatalogService
 from app.services.cart_service import CartService
 from app.services.like_service import LikeService
 from app.services.order_service import OrderService
@@ -54,27 +59,119 @@ def customer_portal(account: Account) -> None:
             ui.banner(choice, f"{choice} is in development.")
             ui.wait_continue()
 
+def _describe_filter(filters: CatalogFilter) -> str:
+    parts = []
+    if filters.category is not None:
+        parts.append(filters.category or "Uncategorized")
+    if filters.min_price is not None or filters.max_price is not None:
+        low = f"${filters.min_price}" if filters.min_price is not None else ""
+        high = f"${filters.max_price}" if filters.max_price is not None else ""
+        parts.append(f"{low}-{high}")
+    if filters.sort != "popular":
+        parts.append("price low-high" if filters.sort == "price_asc" else "price high-low")
+    return f" [{', '.join(parts)}]" if parts else ""
+
+
+def _prompt_price(prompt: str) -> Optional[Decimal]:
+    while True:
+        raw = ui.text(prompt).strip().lstrip("$")
+        if not raw:
+            return None
+        try:
+            value = Decimal(raw)
+        except InvalidOperation:
+            ui.err("Please enter a valid price.")
+            continue
+        if value < 0:
+            ui.err("Price cannot be negative.")
+            continue
+        return value
+
+
+def _prompt_catalog_filter(current: CatalogFilter) -> CatalogFilter:
+    min_price = _prompt_price("Minimum price (blank for none):")
+    max_price = _prompt_price("Maximum price (blank for none):")
+    if min_price is not None and max_price is not None and min_price > max_price:
+        min_price, max_price = max_price, min_price
+    facets = _catalog.category_facets(min_price, max_price)
+    labels = {"All categories": None}
+    for f in facets:
+        labels[f"{f.category or 'Uncategorized'} ({f.count})"] = f.category if f.category is not None else ""
+    category = labels.get(ui.select("Category", list(labels)))
+    sorts = {"Most popular": "popular", "Price: low to high": "price_asc", "Price: high to low": "price_desc"}
+    sort = sorts.get(ui.select("Sort by", list(sorts)), current.sort)
+    return CatalogFilter(category=category, min_price=min_price, max_price=max_price, sort=sort)
+
+
+def _resolve_item(raw: str) -> Optional[Item]:
+    """Item by numeric ID, or by (misspelled) name via "did you mean" suggestions."""
+    if raw.isdigit():
+        item = _items.get_by_id(int(raw))
+        if item is None:
+            ui.err(f"Item {raw} does not exist.")
+        return item
+    suggestions = _items.did_you_mean(raw)
+    if not suggestions:
+        ui.err(f"No item name resembles \"{raw}\".")
+        return None
+    labels = [f"{s.item.name} (ID {s.item.id}, ${s.item.price})" for s in suggestions]
+    choice = ui.select("Did you mean:", labels + ["None of these"])
+    if choice not in labels:
+        return None
+    return suggestions[labels.index(choice)].item
+
+
+@track_action()
 def _browse_catalog(account) -> None:
-    items = _catalog.list_popular_first()
-    table = Table(title="Catalog", show_lines=True)
-    table.add_column("ID"); table.add_column("Name"); table.add_column("Category")
-    table.add_column("Price"); table.add_column("Stock"); table.add_column("Likes")
-    for it in items:
-        table.add_row(str(it.id), it.name or "", it.category or "", f"${it.price}", str(it.stock_quantity), str(it.like_count))
-    console.print(table)
-    action = ui.select("Choose an action", ["Add items to cart", "View items", "Like items", "Back"])
+    cursor = None
+    page_no = 1
+    query = None  # set while showing search results instead of the catalog listing
+    filters = CatalogFilter()
+    while True:
+        if query:
+            results = _catalog.search(query, page=page_no)
+            items, next_cursor = results.items, None
+            has_next = results.has_more
+            title = f"Search \"{query}\" (page {page_no})"
+        else:
+            page = _catalog.browse(filters, cursor=cursor)
+            items, next_cursor = page.items, page.next_cursor
+            has_next = next_cursor is not None
+            title = f"Catalog{_describe_filter(filters)} (page {page_no})"
+        table = Table(title=title, show_lines=True)
+        table.add_column("ID"); table.add_column("Name"); table.add_column("Category")
+        table.add_column("Price"); table.add_column("Stock"); table.add_column("Likes")
+        for it in items:
+            table.add_row(str(it.id), it.name or "", it.category or "", f"${it.price}", str(it.stock_quantity), str(it.like_count))
+        console.print(table)
+        if query and not items:
+            ui.info("No items match your search.")
+        choices = ["Add items to cart", "View items", "Like items", "Search items", "Filter / sort"]
+        if has_next:
+            choices.append("Next page")
+        action = ui.select("Choose an action", choices + ["Back"])
+        if action == "Search items":
+            query = ui.text("Search for (blank for the full catalog):").strip() or None
+            cursor, page_no = None, 1
+            continue
+        if action == "Filter / sort":
+            query = None
+            filters = _prompt_catalog_filter(filters)
+            cursor, page_no = None, 1
+            continue
+        if action != "Next page":
+            break
+        cursor = next_cursor
+        page_no += 1
     if action == "Add items to cart":
         while True:
-            raw = ui.text("Item ID to add (or /quit):").strip()
+            raw = ui.text("Item ID or name to add (or /quit):").strip()
             if raw == "/quit" or not raw:
                 break
-            if not raw.isdigit():
-                ui.err("Please enter a valid numeric item ID.")
-                continue
-            iid = int(raw)
-            if _items.get_by_id(iid) is None:
-                ui.err(f"Item {iid} does not exist.")
+            item = _resolve_item(raw)
+            if item is None:
                 continue
+            iid = item.id
             qty_raw = ui.text("Quantity:").strip()
             if not qty_raw.isdigit():
                 ui.err("Please enter a valid numeric quantity.")
@@ -83,7 +180,6 @@ def _browse_catalog(account) -> None:
             if qty <= 0:
                 ui.err("Quantity must be greater than 0.")
                 continue
-            item = _items.get_by_id(iid)
             if qty > item.stock_quantity:
                 ui.err(f"Item {iid} does not have enough stock.")
                 continue
@@ -92,16 +188,11 @@ def _browse_catalog(account) -> None:
         # ui.wait_continue()
     elif action == "View items":
         while True:
-            raw = ui.text("Item ID to view (or /quit):").strip()
+            raw = ui.text("Item ID or name to view (or /quit):").strip()
             if raw == "/quit" or not raw:
                 break
-            if not raw.isdigit():
-                ui.err("Please enter a valid numeric item ID.")
-                continue
-            iid = int(raw)
-            item = _items.get_by_id(iid)
+            item = _resolve_item(raw)
             if item is None:
-                ui.err(f"Item {iid} does not exist.")
                 continue
 
             item_table = Table(title="Item", show_lines=True)
@@ -118,17 +209,17 @@ def _browse_catalog(account) -> None:
         # ui.wait_continue()
     elif action == "Like items":
         while True:
-            raw = ui.text("Item ID to like (or /quit):").strip()
+            raw = ui.text("Item ID or name to like (or /quit):").strip()
             if raw == "/quit" or not raw:
                 break
-            if not raw.isdigit():
-                ui.err("Please enter a valid numeric item ID.")
+            item = _resolve_item(raw)
+            if item is None:
                 continue
-            iid = int(raw)
-            if _items.get_by_id(iid) is None:
-                ui.err(f"Item {iid} does not exist.")
+            try:
+                liked = _likes.like_items(account.id, [item.id])
+            except Exception as e:
+                ui.err(str(e))
                 continue
-            liked = _likes.like_items(account.id, [iid])
             if liked:
                 ui.ok("Item liked.")
             else:
@@ -137,6 +228,7 @@ def _browse_catalog(account) -> None:
     else:
         return
 
+@track_action()
 def _shopping_cart(account) -> None:
     while True:
         items = _cart.list_items(account.id)
@@ -155,8 +247,9 @@ def _shopping_cart(account) -> None:
             if not ids:
                 ui.info("No items specified.")
             else:
+                existing = _items.get_by_ids(ids)
                 for iid in ids:
-                    if _items.get_by_id(iid) is None:
+                    if iid not in existing:
                         ui.err(f"Item {iid} does not exist.")
                         continue
                     if iid not in _cart.get_quantities(account.id):
@@ -251,6 +344,7 @@ def _shopping_cart(account) -> None:
         else:
             return
 
+@track_action()
 def _my_orders(account: Account) -> None:
     rows = _orders.list_orders(account.id)
     if not rows:
@@ -264,6 +358,7 @@ def _my_orders(account: Account) -> None:
     console.print(table)
     ui.wait_continue()
 
+@track_action()
 def _my_liked_items(account: Account) -> None:
     rows = _likes.list_liked(account.id)
     if not rows:
@@ -281,11 +376,17 @@ def _my_liked_items(account: Account) -> None:
         return
     if cmd.startswith("/remove"):
         ids = _parse_ids(cmd[len("/remove"):])
+        existing = _items.get_by_ids(ids)
         for iid in ids:
-            if _items.get_by_id(iid) is None:
+            if iid not in existing:
                 ui.err(f"Item {iid} does not exist.")
                 continue
-        removed = _likes.unlike_items(account.id, ids)
+        try:
+            removed = _likes.unlike_items(account.id, ids)
+        except Exception as e:
+            ui.err(str(e))
+            ui.wait_continue()
+            return
         if removed:
             ui.ok(f"Removed {removed} liked items.")
         else:
@@ -295,6 +396,7 @@ def _my_liked_items(account: Account) -> None:
         ui.err("Unknown command")
         ui.wait_continue()
 
+@track_action()
 def _update_profile(account: Account) -> None:
     # Display current info
     acc = AccountService.get_by_id(account.id) or account
@@ -395,6 +497,7 @@ def _parse_ids(text: str) -> list[int]:
             out.append(int(tok))
     return out
 
+@track_action()
 def _customer_messaging_portal(account: Account) -> None:
     svc = MessagingService()
     while True:
@@ -434,55 +537,4 @@ def _customer_messaging_portal(account: Account) -> None:
 
 
 def _chat_repl(svc: MessagingService, account, conversation_id: int, as_staff: bool) -> None:
-    import threading
-    import time
-
-    state = {"watch": True, "interval": 1.0, "last_id": 0}
-
-    def render_full():
-        conv = svc.get_conversation(conversation_id)
-        if conv is None:
-            ui.err("Conversation not found")
-            return False
-        msgs = svc.get_conversation_messages(conversation_id)
-        state["last_id"] = max((m.id or 0) for m in msgs) if msgs else 0
-        lines = [f"Subject: {conv.subject}", ""]
-        for m in msgs:
-            who = "You" if m.user_id == account.id else m.role.value
-            lines.append(f"[{who}] {m.content}")
-        ui.banner(f"Conversation #{conversation_id}", "\n".join(lines))
-        return True
-
-    def watcher():
-        while state["watch"]:
-            try:
-                new_msgs = svc.get_since(conversation_id, state["last_id"])
-                if new_msgs:
-                    for m in new_msgs:
-                        state["last_id"] = max(state["last_id"], m.id or state["last_id"])
-                    render_full()
-                time.sleep(state["interval"])
-            except Exception as e:
-                ui.err(str(e))
-                time.sleep(state["interval"])
-
-    if not render_full():
-        ui.wait_continue()
-        return
-
-    t = threading.Thread(target=watcher, daemon=True)
-    t.start()
-
-    while True:
-        txt = ui.text("Type a message (/quit):").strip()
-        if txt == "/quit":
-            state["watch"] = False
-            return
-        if not txt:
-            continue
-        try:
-            svc.customer_reply(account.id, conversation_id, txt)
-            render_full()
-        except Exception as e:
-            ui.err(str(e))
-            ui.wait_continue()
+    chat_repl(svc, account, conversation_id, lambda txt: svc.customer_reply(account.id, conversation_id, txt))
@@ -2,9 +2,14 @@ from __future__ import annotations
 
 from typing import Callable, Dict
 
+from app.config.settings import settings
 from app.models import Account, Role
+from app.repositories.like_counter_buffer import get_like_buffer
 from app.services.auth_service import AuthService
+from app.services.password_hasher import get_hasher
+from app.services.report_scheduler_service import ReportSchedulerService
 from app.cli import ui
+from app.db.instrumentation import track_action
 from app.cli.customer_cli import customer_portal
 from app.cli.staff_cli import staff_portal
 from app.cli.ceo_cli import ceo_portal
@@ -18,7 +23,22 @@ def _input(prompt: str) -> str:
 
 
 def main() -> None:
-    auth = AuthService()
+    # Precompute reports in the background while the console is open
+    scheduler = ReportSchedulerService() if settings.report_scheduler_enabled else None
+    if scheduler is not None:
+        scheduler.start()
+    try:
+        _main_menu(AuthService())
+    finally:
+        if scheduler is not None:
+            scheduler.stop(timeout=5)
+        get_hasher().shutdown()
+        like_buffer = get_like_buffer()
+        if like_buffer is not None:
+            like_buffer.stop(timeout=5)  # writes pending like counts
+
+
+def _main_menu(auth: AuthService) -> None:
     while True:
         ui.clear()
         choice = ui.menu_select("Welcome", "Choose an option", ["Register", "Login", "Exit"])
@@ -42,6 +62,7 @@ def main() -> None:
             ui.wait_continue()
 
 
+@track_action()
 def _handle_register(auth: AuthService):
     ui.clear()
     ui.banner("Register", "Create a new account")
@@ -81,6 +102,7 @@ def _handle_register(auth: AuthService):
         ui.wait_continue()
 
 
+@track_action()
 def _handle_login(auth: AuthService):
     ui.clear()
     ui.banner("Login", "Enter your credentials")
@@ -2,6 +2,8 @@ from __future__ import annotations
 from decimal import Decimal
 
 from app.cli import ui
+from app.cli.chat import chat_repl
+from app.db.instrumentation import track_action
 from app.models.item import Item
 from app.services.account_service import AccountService
 from app.services.item_service import ItemService
@@ -35,6 +37,7 @@ def staff_portal(account) -> None:
             ui.banner(choice, f"{choice} is in development.")
             ui.wait_continue()
 
+@track_action()
 def _staff_inventory_portal() -> None:
     item_service = ItemService()
     while True:
@@ -90,15 +93,37 @@ def _handle_new_item(item_service: ItemService):
         ui.err(result.message)
         ui.wait_continue()
 
+def _prompt_item(item_service: ItemService) -> Item | None:
+    """Ask for an item by ID, or by (misspelled) name with "did you mean" suggestions."""
+    raw = ui.text("Item ID or name:").strip()
+    if raw.isdigit():
+        item = item_service.get_by_id(int(raw))
+        if not item:
+            ui.err("No item exists with that ID.")
+            ui.wait_continue()
+        return item
+    if not raw:
+        return None
+    suggestions = item_service.did_you_mean(raw)
+    if not suggestions:
+        ui.err(f"No item name resembles \"{raw}\".")
+        ui.wait_continue()
+        return None
+    _render_items_table([s.item for s in suggestions], title="Did you mean")
+    labels = [f"{s.item.name} (ID {s.item.id})" for s in suggestions]
+    choice = ui.select("Choose an item", labels + ["None of these"])
+    if choice not in labels:
+        return None
+    return suggestions[labels.index(choice)].item
+
 def _handle_delete_item(item_service: ItemService):
     ui.clear()
     ui.banner("Inventory", "Delete an existing item")
 
-    id = int(ui.text("Item ID:"))
-    item = item_service.get_by_id(id)
+    item = _prompt_item(item_service)
     if not item:
-        ui.err("No item exists with that ID.")
         return
+    id = item.id
 
     _render_items_table([item], title="Item Preview")
 
@@ -119,15 +144,8 @@ def _handle_update_item(item_service: ItemService):
     ui.clear()
     ui.banner("Inventory", "Update an existing item")
 
-    try:
-        id = int(ui.text(f"Item ID:"))
-    except:
-        ui.err("Invalid input: item ID must be a whole number.")
-        ui.wait_continue()
-        return
-    item = item_service.get_by_id(id)
+    item = _prompt_item(item_service)
     if not item:
-        ui.err("No item exists with that ID.")
         return
     _render_items_table([item], title="Current Item")
 
@@ -161,7 +179,7 @@ def _handle_update_item(item_service: ItemService):
         like_count=item.like_count,
     )
 
-    result = item_service.update_item(id, updated_item)
+    result = item_service.update_item(item.id, updated_item)
     if result.success:
         ui.ok(result.message)
         ui.wait_continue()
@@ -169,6 +187,7 @@ def _handle_update_item(item_service: ItemService):
         ui.err(result.message)
         ui.wait_continue()
 
+@track_action()
 def _staff_customer_info_portal() -> None:
     while True:
         choice = ui.menu_select(
@@ -186,18 +205,29 @@ def _staff_customer_info_portal() -> None:
             ui.banner(choice, f"{choice} is in development.")
             ui.wait_continue()
 
-def _handle_search_customer() -> None:
-    first_name = ui.text("(optional) First name:")
-    last_name = ui.text("(optional) Last name:")
-    id = ui.text(f"(optional) Customer ID:")
+CUSTOMER_SEARCH_PAGE_SIZE = 20
 
-    rows = AccountService.get_by_name_or_id(first_name if first_name != "" else None, last_name if last_name != "" else None, id if id != "" else None)
-    if rows:
-        _render_accounts_table(rows, title="Customer Search Results")
-    else:
-        ui.err("No customers by that criteria were found.")
-    ui.wait_continue()
-    return
+
+def _handle_search_customer() -> None:
+    query = ui.text("Search customers (name, username, email or ID):").strip()
+    if not query:
+        return
+    page = 0
+    while True:
+        result = AccountService.search_customers(query, page, CUSTOMER_SEARCH_PAGE_SIZE)
+        if not result.accounts:
+            ui.err("No customers by that criteria were found.")
+            ui.wait_continue()
+            return
+        _render_accounts_table(result.accounts, title=f"Customer Search Results (page {page + 1})")
+        options = (["Next page"] if result.has_more else []) + (["Previous page"] if page > 0 else []) + ["Done"]
+        choice = ui.select("Results:", options)
+        if choice == "Next page":
+            page += 1
+        elif choice == "Previous page":
+            page -= 1
+        else:
+            return
 
 def _handle_search_order() -> None:
     order_service = OrderService()
@@ -216,6 +246,7 @@ def _handle_search_order() -> None:
         ui.err("No order exists with that ID.")
     ui.wait_continue()
 
+@track_action()
 def _staff_messaging_portal(account) -> None:
     svc = MessagingService()
     while True:
@@ -225,96 +256,62 @@ def _staff_messaging_portal(account) -> None:
             ["Check unread messages", "View all conversations", "Quit"],
         )
         if choice == "Check unread messages":
-            rows = svc.list_unread_conversation_summaries()
-            if not rows:
-                ui.banner("Unread", "No unread conversations.")
-                ui.wait_continue()
-            else:
-                body = "\n".join([f"{r['id']} - {r['subject']}" for r in rows])
-                ui.banner("Unread", body)
-                cid_str = ui.text("Enter conversation ID to open (or blank to cancel):").strip()
-                if cid_str and cid_str.isdigit():
-                    cid = int(cid_str)
-                    conv = svc.get_conversation(cid)
-                    if conv is None:
-                        ui.err("Conversation not found")
-                        ui.wait_continue()
-                    else:
-                        _chat_repl(svc, account, cid, as_staff=True)
+            _browse_inbox(svc, account, "Unread", unread_only=True)
         elif choice == "View all conversations":
-            convs = svc.list_all_conversations()
-            if not convs:
-                ui.banner("All Conversations", "No conversations.")
-                ui.wait_continue()
-            else:
-                body = "\n".join([f"{c.id} - {c.subject}" for c in convs])
-                ui.banner("All Conversations", body)
-                cid_str = ui.text("Enter conversation ID to open (or blank to cancel):").strip()
-                if cid_str and cid_str.isdigit():
-                    cid = int(cid_str)
-                    conv = svc.get_conversation(cid)
-                    if conv is None:
-                        ui.err("Conversation not found")
-                        ui.wait_continue()
-                    else:
-                        _chat_repl(svc, account, cid, as_staff=True)
+            _browse_inbox(svc, account, "All Conversations", unread_only=False)
         elif choice == "Quit":
             return
 
 
-def _chat_repl(svc: MessagingService, account, conversation_id: int, as_staff: bool) -> None:
-    import threading
-    import time
-
-    state = {"watch": True, "interval": 1.0, "last_id": 0}
-
-    def render_full():
-        conv = svc.get_conversation(conversation_id)
-        if conv is None:
-            ui.err("Conversation not found")
-            return False
-        msgs = svc.get_conversation_messages(conversation_id)
-        state["last_id"] = max((m.id or 0) for m in msgs) if msgs else 0
-        lines = [f"Subject: {conv.subject}", ""]
-        for m in msgs:
-            who = "You" if m.user_id == account.id else m.role.value
-            lines.append(f"[{who}] {m.content}")
-        ui.banner(f"Conversation #{conversation_id}", "\n".join(lines))
-        return True
-
-    def watcher():
-        while state["watch"]:
-            try:
-                new_msgs = svc.get_since(conversation_id, state["last_id"])
-                if new_msgs:
-                    for m in new_msgs:
-                        state["last_id"] = max(state["last_id"], m.id or state["last_id"])
-                    render_full()
-                time.sleep(state["interval"])
-            except Exception as e:
-                ui.err(str(e))
-                time.sleep(state["interval"])
-
-    if not render_full():
-        ui.wait_continue()
-        return
+INBOX_PAGE_SIZE = 20
 
-    t = threading.Thread(target=watcher, daemon=True)
-    t.start()
 
+def _browse_inbox(svc: MessagingService, account, title: str, unread_only: bool) -> None:
+    """Inbox pages ordered by latest activity; 'n' moves to the next page."""
+    cursor = None
     while True:
-        txt = ui.text("Type a message (/quit):").strip()
-        if txt == "/quit":
-            state["watch"] = False
+        page = svc.list_inbox(INBOX_PAGE_SIZE, unread_only=unread_only, cursor=cursor)
+        if not page.conversations:
+            ui.banner(title, "No unread conversations." if unread_only else "No conversations.")
+            ui.wait_continue()
             return
-        if not txt:
+        _render_inbox_table(page.conversations, title)
+        prompt = "Enter conversation ID to open"
+        if page.next_cursor is not None:
+            prompt += ", 'n' for the next page"
+        cid_str = ui.text(prompt + " (or blank to cancel):").strip()
+        if cid_str.lower() == "n" and page.next_cursor is not None:
+            cursor = page.next_cursor
             continue
-        try:
-            svc.staff_reply(account.id, conversation_id, txt)
-            render_full()
-        except Exception as e:
-            ui.err(str(e))
-            ui.wait_continue()
+        if cid_str and cid_str.isdigit():
+            cid = int(cid_str)
+            conv = svc.get_conversation(cid)
+            if conv is None:
+                ui.err("Conversation not found")
+                ui.wait_continue()
+            else:
+                _chat_repl(svc, account, cid, as_staff=True)
+        return
+
+
+def _render_inbox_table(convs, title: str) -> None:
+    table = Table(title=title, expand=True)
+    table.add_column("ID", justify="right")
+    table.add_column("Subject")
+    table.add_column("Unread", justify="right")
+    table.add_column("Last message")
+    for c in convs:
+        table.add_row(
+            str(c.id),
+            c.subject,
+            str(c.unread_count),
+            c.last_message_at.strftime("%Y-%m-%d %H:%M") if c.last_message_at else "",
+        )
+    ui.console.print(table)
+
+
+def _chat_repl(svc: MessagingService, account, conversation_id: int, as_staff: bool) -> None:
+    chat_repl(svc, account, conversation_id, lambda txt: svc.staff_reply(account.id, conversation_id, txt))
 
 
 def _render_items_table(items: list[Item], title: str = "Items") -> None:
@@ -442,6 +439,7 @@ def _prompt_address_update(acc):
     return AccountService.get_by_id(acc.id) or acc
 
 
+@track_action()
 def _update_profile(account) -> None:
     acc = AccountService.get_by_id(account.id) or account
     fields = [
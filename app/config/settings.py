@@ -1,6 +1,6 @@
 import os
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from dotenv import load_dotenv
 
@@ -17,6 +17,13 @@ def _env(key: str, *aliases: str, default: str = "") -> str:
     return default
 
 
+def _env_bool(key: str, *aliases: str, default: bool = False) -> bool:
+    raw = _env(key, *aliases, default="")
+    if not raw:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
 @dataclass(frozen=True)
 class Settings:
     # Match schema/init/creation.py variable conventions
@@ -26,6 +33,80 @@ class Settings:
     db_password: str = _env("DB_PASSWORD", "MYSQL_PASSWORD", "PASSWORD", default="")
     db_name: str = _env("DB_NAME", "DATABASE", default="shopping_mall")
 
+    # Connection pool sizing: pool_size connections are kept idle for reuse,
+    # up to max_overflow extra ones are opened under load and closed on release.
+    db_pool_size: int = int(_env("DB_POOL_SIZE", default="5"))
+    db_pool_max_overflow: int = int(_env("DB_POOL_MAX_OVERFLOW", default="5"))
+    # When the pool is exhausted, block up to timeout seconds for a connection
+    # (db_pool_block=True) or fail immediately (db_pool_block=False).
+    db_pool_timeout: float = float(_env("DB_POOL_TIMEOUT", default="10"))
+    db_pool_block: bool = _env_bool("DB_POOL_BLOCK", default=True)
+    # Connections older than this many seconds are replaced on checkout (0 disables).
+    db_pool_recycle: int = int(_env("DB_POOL_RECYCLE", default="3600"))
+    # Rows pulled per round trip by streaming reads (base.fetch_iter).
+    db_fetch_size: int = int(_env("DB_FETCH_SIZE", default="1000"))
+
+    # Read replicas: comma-separated host[:port] list sharing the primary's
+    # credentials and database. Empty means every query goes to the primary.
+    db_replicas: str = _env("DB_REPLICAS", default="")
+    # After a write, a thread keeps reading from the primary for this many
+    # seconds so it sees its own changes despite replication lag.
+    db_read_after_write_pin_s: float = float(_env("DB_READ_AFTER_WRITE_PIN_S", default="2"))
+
+    # Read-through cache for hot single-row lookups (app/repositories/cache.py)
+    cache_enabled: bool = _env_bool("CACHE_ENABLED", default=True)
+    cache_max_entries: int = int(_env("CACHE_MAX_ENTRIES", default="10000"))
+    cache_ttl_s: float = float(_env("CACHE_TTL_S", default="10"))
+
+    # Query instrumentation (app/db/instrumentation.py)
+    db_query_stats: bool = _env_bool("DB_QUERY_STATS", default=True)
+    db_slow_query_ms: float = float(_env("DB_SLOW_QUERY_MS", default="200"))
+    db_slow_query_log: str = _env("DB_SLOW_QUERY_LOG", default="")
+    # When set, query stats are written to this JSON file at interpreter exit.
+    db_query_stats_path: str = _env("DB_QUERY_STATS_PATH", default="")
+
+    # Background report scheduler (app/services/report_scheduler_service.py):
+    # complete daily/weekly windows are generated at report_time every day and
+    # the previous month on the 1st, on up to report_workers threads.
+    report_scheduler_enabled: bool = _env_bool("REPORT_SCHEDULER", default=False)
+    report_time: str = _env("REPORT_TIME", default="21:00")
+    report_workers: int = int(_env("REPORT_WORKERS", default="3"))
+    # Days back the scheduler looks for missing daily reports (weekly: whole weeks in range)
+    report_backfill_days: int = int(_env("REPORT_BACKFILL_DAYS", default="7"))
+
+    # New-message notifications (app/services/notification_bus.py):
+    # "socket" relays message ids (never content) between console processes
+    # through a localhost hub at notify_hub (the first process to start hosts
+    # it); chats poll only while the hub is unreachable. "inprocess" keeps
+    # events in this process, so chats always poll for other consoles' messages.
+    notify_bus: str = _env("NOTIFY_BUS", default="socket")
+    notify_hub: str = _env("NOTIFY_HUB", default="127.0.0.1:47100")
+    # Chat refresh interval while push delivery is unavailable.
+    chat_poll_s: float = float(_env("CHAT_POLL_S", default="1"))
+    # Messages shown when a chat opens; older ones load a page at a time.
+    chat_history_page: int = int(_env("CHAT_HISTORY_PAGE", default="30"))
+
+    # Password hashing (app/services/password_hasher.py): PBKDF2 cost for new
+    # hashes (older accounts are rehashed on login) and hashing processes;
+    # 0 hashes on the calling thread.
+    password_hash_iterations: int = int(_env("PASSWORD_HASH_ITERATIONS", default="100000"))
+    password_hash_workers: int = int(_env("PASSWORD_HASH_WORKERS", default=str(min(4, os.cpu_count() or 1))))
+
+    # Write-behind like counters (app/repositories/like_counter_buffer.py):
+    # likes only buffer a per-item delta, applied to item.like_count in batches
+    # every like_flush_interval_s seconds or once like_flush_max_pending items
+    # have pending deltas, so likes do not lock hot item rows.
+    like_count_write_behind: bool = _env_bool("LIKE_COUNT_WRITE_BEHIND", default=False)
+    like_flush_interval_s: float = float(_env("LIKE_FLUSH_INTERVAL_S", default="1"))
+    like_flush_max_pending: int = int(_env("LIKE_FLUSH_MAX_PENDING", default="1000"))
+
+    # Fuzzy item lookup (app/services/item_name_index.py): an in-memory
+    # trigram index over item names, built on first use and kept in sync with
+    # item writes. Items past item_fuzzy_max_items are not indexed, which
+    # bounds its memory; matches below item_fuzzy_min_similarity are dropped.
+    item_fuzzy_max_items: int = int(_env("ITEM_FUZZY_MAX_ITEMS", default="2000000"))
+    item_fuzzy_min_similarity: float = float(_env("ITEM_FUZZY_MIN_SIMILARITY", default="0.2"))
+
     def mysql_connector_config(self) -> Dict[str, Any]:
         return {
             "host": self.db_host,
@@ -38,6 +119,19 @@ class Settings:
             "charset": "utf8mb4",
         }
 
+    def replica_connector_configs(self) -> List[Dict[str, Any]]:
+        configs: List[Dict[str, Any]] = []
+        for endpoint in self.db_replicas.split(","):
+            endpoint = endpoint.strip()
+            if not endpoint:
+                continue
+            host, _, port = endpoint.partition(":")
+            cfg = self.mysql_connector_config()
+            cfg["host"] = host
+            cfg["port"] = int(port) if port else self.db_port
+            configs.append(cfg)
+        return configs
+
 
 settings = Settings()
 
@@ -1,36 +1,98 @@
+import itertools
+import threading
 from contextlib import contextmanager
-from typing import Iterator, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import mysql.connector
-from mysql.connector import pooling, Error, MySQLConnection
+from mysql.connector import Error, MySQLConnection
 
 from app.config.settings import settings
+from app.db.pool import ConnectionPool, PooledConnection
 
-_pool: Optional[pooling.MySQLConnectionPool] = None
+_pool: Optional[ConnectionPool] = None
+_replica_pools: Optional[List[ConnectionPool]] = None
+_replica_cycle: Optional[Iterator[int]] = None
+_pool_lock = threading.Lock()
 
 
-def _init_pool() -> pooling.MySQLConnectionPool:
+def _new_pool(name: str, config: Dict[str, Any]) -> ConnectionPool:
+    return ConnectionPool(
+        name=name,
+        config=config,
+        size=settings.db_pool_size,
+        max_overflow=settings.db_pool_max_overflow,
+        timeout=settings.db_pool_timeout,
+        block=settings.db_pool_block,
+        recycle=settings.db_pool_recycle,
+    )
+
+
+def _init_pool() -> ConnectionPool:
     global _pool
     if _pool is None:
-        _pool = pooling.MySQLConnectionPool(
-            pool_name="shopping_mall_pool",
-            pool_size=5,
-            **settings.mysql_connector_config(),
-        )
+        with _pool_lock:
+            if _pool is None:
+                _pool = _new_pool("shopping_mall_pool", settings.mysql_connector_config())
     return _pool
 
 
-def get_connection() -> MySQLConnection:
+def _init_replica_pools() -> List[ConnectionPool]:
+    global _replica_pools, _replica_cycle
+    if _replica_pools is None:
+        with _pool_lock:
+            if _replica_pools is None:
+                pools = [
+                    _new_pool(f"shopping_mall_replica_{i}", cfg)
+                    for i, cfg in enumerate(settings.replica_connector_configs())
+                ]
+                _replica_cycle = itertools.cycle(range(len(pools))) if pools else None
+                _replica_pools = pools
+    return _replica_pools
+
+
+def has_replicas() -> bool:
+    return bool(_init_replica_pools())
+
+
+def get_connection(readonly: bool = False) -> PooledConnection:
     """
     Get a pooled MySQL connection. Assumes schema already exists.
+    Blocks up to settings.db_pool_timeout when the pool is exhausted.
+    readonly=True routes to the next replica (round-robin) when replicas are
+    configured; if that replica is unreachable the primary is used instead.
     """
+    if readonly:
+        replicas = _init_replica_pools()
+        if replicas:
+            with _pool_lock:
+                idx = next(_replica_cycle)  # type: ignore[arg-type]
+            try:
+                return replicas[idx].get_connection()
+            except Error:
+                pass
     return _init_pool().get_connection()
 
 
+def pool_stats() -> Dict[str, Any]:
+    """
+    Live pool metrics: in-use/idle counts, checkout latency histogram,
+    exhaustion events and connection ages.
+    """
+    return _init_pool().stats()
+
+
+def replica_pool_stats() -> List[Dict[str, Any]]:
+    return [p.stats() for p in _init_replica_pools()]
+
+
 @contextmanager
-def db_cursor(dictionary: bool = True) -> Iterator[Tuple[MySQLConnection, mysql.connector.cursor.MySQLCursor]]:
+def db_cursor(
+    dictionary: bool = True,
+    readonly: bool = False,
+) -> Iterator[Tuple[MySQLConnection, mysql.connector.cursor.MySQLCursor]]:
     """
     Context manager yielding (connection, cursor) with commit/rollback handling.
+    readonly=True may route the connection to a replica (see get_connection).
     Usage:
         with db_cursor() as (conn, cur):
             cur.execute("SELECT 1")
@@ -39,17 +101,19 @@ def db_cursor(dictionary: bool = True) -> Iterator[Tuple[MySQLConnection, mysql.
     conn: Optional[MySQLConnection] = None
     cur = None
     try:
-        conn = get_connection()
+        conn = get_connection(readonly=readonly)
         cur = conn.cursor(dictionary=dictionary)
         yield conn, cur
         conn.commit()
-    except Error as exc:
+    except Exception:
+        # Roll back on any failure, not only driver errors: callers running a
+        # unit of work may abort it with a domain error (e.g. ValueError).
         if conn is not None:
             try:
                 conn.rollback()
             except Exception:
                 pass
-        raise exc
+        raise
     finally:
         if cur is not None:
             try:
@@ -0,0 +1,207 @@
+import atexit
+import functools
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+from app.config.settings import settings
+from app.utils.metrics import Histogram
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+slow_query_logger = logging.getLogger("app.db.slow_query")
+slow_query_logger.addHandler(logging.NullHandler())
+slow_query_logger.propagate = False
+if settings.db_slow_query_log:
+    _handler = logging.FileHandler(settings.db_slow_query_log, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_query_logger.addHandler(_handler)
+    slow_query_logger.setLevel(logging.INFO)
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%\([A-Za-z_][A-Za-z0-9_]*\)s|%s")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_RE = re.compile(r"\bVALUES\s*\((?:\s*\?\s*,?)+\)(?:\s*,\s*\((?:\s*\?\s*,?)+\))*", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Collapse a statement to its shape so executions group together:
+    literals and placeholders become '?', IN lists become 'IN (...)'.
+    """
+    s = _STRING_RE.sub("?", sql)
+    s = _PLACEHOLDER_RE.sub("?", s)
+    s = _NUMBER_RE.sub("?", s)
+    s = _IN_LIST_RE.sub("IN (...)", s)
+    s = _VALUES_RE.sub("VALUES (...)", s)
+    return _SPACE_RE.sub(" ", s).strip()
+
+
+class _ActionStats:
+    __slots__ = ("runs", "queries", "max_queries", "statements")
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.statements: Dict[str, int] = {}
+
+
+class QueryStats:
+    """
+    Process-wide query instrumentation.
+    - Latency histogram per normalized statement.
+    - Slow-query log for statements slower than `slow_ms`.
+    - Query counts per user action (see `action`), to spot N+1 patterns.
+    """
+
+    def __init__(self, slow_ms: float, keep_slow: int = 100) -> None:
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._statements: Dict[str, Histogram] = {}
+        self._actions: Dict[str, _ActionStats] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=keep_slow)
+        self._local = threading.local()
+
+    def record(self, sql: str, elapsed_ms: float) -> None:
+        shape = normalize_sql(sql)
+        with self._lock:
+            hist = self._statements.get(shape)
+            if hist is None:
+                hist = self._statements[shape] = Histogram()
+        hist.observe(elapsed_ms)
+
+        frame = self._current_frame()
+        if frame is not None:
+            frame["queries"] += 1
+            frame["statements"][shape] = frame["statements"].get(shape, 0) + 1
+
+        if elapsed_ms >= self.slow_ms:
+            action_name = frame["name"] if frame is not None else None
+            entry = {
+                "at": datetime.utcnow().isoformat(timespec="milliseconds"),
+                "ms": round(elapsed_ms, 3),
+                "action": action_name,
+                "sql": _SPACE_RE.sub(" ", sql).strip(),
+            }
+            with self._lock:
+                self._slow.append(entry)
+            slow_query_logger.info("%.1fms action=%s %s", elapsed_ms, action_name or "-", entry["sql"])
+
+    @contextmanager
+    def timed(self, sql: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(sql, (time.perf_counter() - start) * 1000.0)
+
+    @contextmanager
+    def action(self, name: str) -> Iterator[None]:
+        """Attribute every query issued in the block (on this thread) to `name`."""
+        stack: List[Dict[str, Any]] = self._stack()
+        frame = {"name": name, "queries": 0, "statements": {}}
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            with self._lock:
+                stats = self._actions.setdefault(name, _ActionStats())
+                stats.runs += 1
+                stats.queries += frame["queries"]
+                stats.max_queries = max(stats.max_queries, frame["queries"])
+                for shape, n in frame["statements"].items():
+                    stats.statements[shape] = stats.statements.get(shape, 0) + n
+            if stack:
+                # nested actions also count toward the enclosing one
+                parent = stack[-1]
+                parent["queries"] += frame["queries"]
+                for shape, n in frame["statements"].items():
+                    parent["statements"][shape] = parent["statements"].get(shape, 0) + n
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            statements = dict(self._statements)
+            actions = {
+                name: {
+                    "runs": a.runs,
+                    "queries": a.queries,
+                    "avg_queries": round(a.queries / a.runs, 2) if a.runs else 0.0,
+                    "max_queries": a.max_queries,
+                    "statements": dict(sorted(a.statements.items(), key=lambda kv: -kv[1])),
+                }
+                for name, a in self._actions.items()
+            }
+            slow = list(self._slow)
+        ordered = sorted(statements.items(), key=lambda kv: -kv[1].total)
+        return {
+            "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "slow_query_ms": self.slow_ms,
+            "statements": {shape: hist.snapshot() for shape, hist in ordered},
+            "actions": actions,
+            "slow_queries": slow,
+        }
+
+    def dump_json(self, path: Optional[str] = None) -> str:
+        text = json.dumps(self.snapshot(), indent=2, default=str)
+        if path:
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(text)
+        return text
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._actions.clear()
+            self._slow.clear()
+
+    def _stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _current_frame(self) -> Optional[Dict[str, Any]]:
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+
+query_stats = QueryStats(slow_ms=settings.db_slow_query_ms)
+
+
+@contextmanager
+def timed(sql: str) -> Iterator[None]:
+    if not settings.db_query_stats:
+        yield
+        return
+    with query_stats.timed(sql):
+        yield
+
+
+def track_action(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator: count queries issued by the wrapped CLI action under `name`."""
+
+    def decorator(fn: F) -> F:
+        label = name or fn.__name__.lstrip("_")
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with query_stats.action(label):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+if settings.db_query_stats and settings.db_query_stats_path:
+    atexit.register(query_stats.dump_json, settings.db_query_stats_path)
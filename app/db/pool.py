@@ -0,0 +1,205 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import mysql.connector
+from mysql.connector import MySQLConnection
+from mysql.connector.errors import PoolError
+
+from app.utils.metrics import Histogram
+
+
+class PoolExhaustedError(PoolError):
+    """Raised when no connection could be checked out within the configured limits."""
+
+
+class _Entry:
+    __slots__ = ("conn", "created_at")
+
+    def __init__(self, conn: MySQLConnection) -> None:
+        self.conn = conn
+        self.created_at = time.monotonic()
+
+
+class PooledConnection:
+    """
+    Thin proxy over a raw connection; close() hands it back to the pool.
+    Supports the same context-manager usage as mysql.connector connections.
+    """
+
+    def __init__(self, pool: "ConnectionPool", entry: _Entry) -> None:
+        self._pool = pool
+        self._entry: Optional[_Entry] = entry
+
+    def __getattr__(self, name: str) -> Any:
+        entry = self.__dict__.get("_entry")
+        if entry is None:
+            raise PoolError("connection was already returned to the pool")
+        return getattr(entry.conn, name)
+
+    def close(self) -> None:
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool._release(entry)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Bounded MySQL connection pool with overflow, blocking checkout and live stats.
+    - Up to `size` idle connections are kept for reuse.
+    - Up to `max_overflow` extra connections may be opened under load; they are
+      closed when released while the idle list is already full.
+    - When every slot is in use, get_connection() waits up to `timeout` seconds
+      (if `block`) before raising PoolExhaustedError.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: Dict[str, Any],
+        size: int = 5,
+        max_overflow: int = 0,
+        timeout: float = 10.0,
+        block: bool = True,
+        recycle: int = 0,
+    ) -> None:
+        if size <= 0:
+            raise ValueError("pool size must be positive")
+        if max_overflow < 0:
+            raise ValueError("max_overflow must be >= 0")
+        self.name = name
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.block = block
+        self.recycle = recycle
+        self._config = dict(config)
+        self._cond = threading.Condition()
+        self._idle: List[_Entry] = []
+        self._live: Set[_Entry] = set()
+        self._checked_out = 0
+        self._waiting = 0
+        self._exhausted_events = 0
+        self._timeouts = 0
+        self._opened = 0
+        self._closed = 0
+        self._checkout_ms = Histogram()
+
+    def get_connection(self) -> PooledConnection:
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        entry: Optional[_Entry] = None
+        with self._cond:
+            exhausted = False
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._checked_out < self.size + self.max_overflow:
+                    break  # reserve a slot, open the connection outside the lock
+                if not exhausted:
+                    exhausted = True
+                    self._exhausted_events += 1
+                remaining = deadline - time.perf_counter()
+                if not self.block or remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolExhaustedError(
+                        f"pool '{self.name}' exhausted: {self._checked_out} connections in use"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._checked_out += 1
+
+        try:
+            if entry is not None and self._is_stale(entry):
+                self._discard(entry)
+                entry = None
+            if entry is None:
+                entry = self._open()
+        except Exception:
+            with self._cond:
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+        self._checkout_ms.observe((time.perf_counter() - started) * 1000.0)
+        return PooledConnection(self, entry)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._cond:
+            ages = [now - e.created_at for e in self._live]
+            data: Dict[str, Any] = {
+                "name": self.name,
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "in_use": self._checked_out,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "exhausted_events": self._exhausted_events,
+                "checkout_timeouts": self._timeouts,
+                "connections_opened": self._opened,
+                "connections_closed": self._closed,
+            }
+        data["connection_age_s"] = {
+            "min": round(min(ages), 1) if ages else 0.0,
+            "max": round(max(ages), 1) if ages else 0.0,
+            "avg": round(sum(ages) / len(ages), 1) if ages else 0.0,
+        }
+        data["checkout_ms"] = self._checkout_ms.snapshot()
+        return data
+
+    def close_all(self) -> None:
+        """Close idle connections; checked-out ones are closed when released."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            self._discard(entry)
+
+    def _open(self) -> _Entry:
+        entry = _Entry(mysql.connector.connect(**self._config))
+        with self._cond:
+            self._live.add(entry)
+            self._opened += 1
+        return entry
+
+    def _discard(self, entry: _Entry) -> None:
+        with self._cond:
+            self._live.discard(entry)
+            self._closed += 1
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+    def _is_stale(self, entry: _Entry) -> bool:
+        if self.recycle > 0 and time.monotonic() - entry.created_at > self.recycle:
+            return True
+        try:
+            return not entry.conn.is_connected()
+        except Exception:
+            return True
+
+    def _release(self, entry: _Entry) -> None:
+        healthy = True
+        try:
+            # never hand out a connection with a half-finished transaction
+            entry.conn.rollback()
+        except Exception:
+            healthy = False
+        with self._cond:
+            keep = healthy and len(self._idle) < self.size
+            if keep:
+                self._idle.append(entry)
+            self._checked_out -= 1
+            self._cond.notify()
+        if not keep:
+            self._discard(entry)
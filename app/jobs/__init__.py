@@ -0,0 +1 @@
+# Batch jobs, run as `python -m app.jobs.<name>`
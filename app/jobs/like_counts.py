@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Reconcile item.like_count with the liked_item rows.
+
+Scans items in id order, chunk by chunk, and recounts items whose stored
+like_count differs from their liked_item rows. --dry-run only reports the
+drift. --pause-ms throttles the scan on busy databases.
+
+With LIKE_COUNT_WRITE_BEHIND on, consoles hold like-count changes in memory
+for up to LIKE_FLUSH_INTERVAL_S, so a drifted chunk is read again
+--settle-ms later (default twice that interval) and only drift that has not
+changed is fixed. Run the job with the consoles' LIKE_COUNT_WRITE_BEHIND
+setting, or pass --settle-ms.
+
+    python -m app.jobs.like_counts --dry-run
+    python -m app.jobs.like_counts --chunk-size 2000 --pause-ms 100
+"""
+import argparse
+
+from app.services.like_count_reconciler import LikeCountReconciler, ReconcileSummary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report drift without updating")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="items compared per query")
+    parser.add_argument("--pause-ms", type=float, default=50, help="sleep between chunks")
+    parser.add_argument("--start-after", type=int, default=0, help="resume after this item id")
+    parser.add_argument("--limit", type=int, help="stop after this many items")
+    parser.add_argument("--samples", type=int, default=20, help="drifted items listed in the report")
+    parser.add_argument("--progress", action="store_true", help="print a line per chunk")
+    parser.add_argument(
+        "--settle-ms", type=float,
+        help="re-check drift after this long before fixing it (default: 2x LIKE_FLUSH_INTERVAL_S with write-behind, else 0)",
+    )
+    args = parser.parse_args()
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+
+    def progress(last_id: int, summary: ReconcileSummary) -> None:
+        print(f"  .. item {last_id}: {summary.scanned} scanned, {summary.drifted} drifted, {summary.fixed} fixed")
+
+    settle_s = None if args.settle_ms is None else args.settle_ms / 1000
+    reconciler = LikeCountReconciler(args.chunk_size, args.pause_ms / 1000, args.samples, settle_s)
+    summary = reconciler.run(
+        dry_run=args.dry_run,
+        start_after=args.start_after,
+        limit=args.limit,
+        on_chunk=progress if args.progress else None,
+    )
+    mode = "dry run" if args.dry_run else "reconcile"
+    print(
+        f"like_count {mode}: {summary.scanned} item(s) scanned, {summary.drifted} drifted, "
+        f"{summary.unsettled} unsettled, {summary.fixed} fixed in {summary.duration_ms} ms"
+    )
+    for item_id, stored, actual in summary.samples:
+        print(f"  item {item_id}: like_count {stored}, liked_item rows {actual} ({actual - stored:+d})")
+
+
+if __name__ == "__main__":
+    main()
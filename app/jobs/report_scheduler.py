@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Run the report scheduler outside the console.
+
+Generates missing daily/weekly reports for recent complete windows and the
+previous month, then keeps running on the REPORT_TIME schedule. --once runs
+both jobs a single time and exits (e.g. from cron).
+
+    python -m app.jobs.report_scheduler --once
+    python -m app.jobs.report_scheduler --workers 4 --backfill-days 30
+"""
+import argparse
+import logging
+import threading
+
+from app.services.report_scheduler_service import ReportSchedulerService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--once", action="store_true", help="run the daily and monthly jobs once and exit")
+    parser.add_argument("--workers", type=int, help="parallel report windows (default REPORT_WORKERS)")
+    parser.add_argument("--backfill-days", type=int, help="days back to fill in (default REPORT_BACKFILL_DAYS)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    service = ReportSchedulerService(workers=args.workers, backfill_days=args.backfill_days)
+    if args.once:
+        for summary in (service.run_daily(), service.run_monthly()):
+            for run in summary.generated + summary.failed:
+                print(
+                    f"{run.type.value:<8} {run.start_date:%Y-%m-%d}  {run.status.value:<9} "
+                    f"{run.duration_ms:>6} ms  report={run.report_id or '-'}"
+                    + (f"  {run.error}" if run.error else "")
+                )
+            print(f"skipped (already generated): {summary.skipped}")
+        return
+
+    service.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Catch-up job for the daily sales rollup (daily_item_sales).
+
+Builds rollup days that have never been built (orders loaded before the
+rollup existed, or inserted outside checkout). --rebuild recomputes every day
+in the window, e.g. after order rows were edited by hand.
+
+    python -m app.jobs.sales_rollup --days 7
+    python -m app.jobs.sales_rollup --start 2025-01-01 --end 2025-03-31 --rebuild
+"""
+import argparse
+from datetime import date, datetime, timedelta
+
+from app.services.sales_rollup_service import SalesRollupService
+
+
+def _parse_day(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=7, help="window ending today (ignored with --start)")
+    parser.add_argument("--start", type=_parse_day, help="first day, YYYY-MM-DD")
+    parser.add_argument("--end", type=_parse_day, help="last day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--rebuild", action="store_true", help="recompute days that are already built")
+    args = parser.parse_args()
+
+    end = args.end or date.today()
+    start = args.start or end - timedelta(days=max(args.days, 1) - 1)
+    if start > end:
+        parser.error("--start must not be after --end")
+
+    built = SalesRollupService().catch_up(start, end, rebuild=args.rebuild)
+    print(f"rollup window {start} .. {end}: {len(built)} day(s) built")
+
+
+if __name__ == "__main__":
+    main()
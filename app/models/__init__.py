@@ -1,4 +1,4 @@
-from .enums import Role, OrderStatus, ReportType, PaymentMethod, MessageRole
+from .enums import Role, OrderStatus, ReportType, ReportRunStatus, PaymentMethod, MessageRole
 from .account import Account
 from .item import Item
 from .liked_item import LikedItem
@@ -7,12 +7,14 @@ from .order import Order
 from .message import Message
 from .report_content import ReportContent
 from .report import Report
+from .report_run import ReportRun
 from .conversation import Conversation
 
 __all__ = [
     "Role",
     "OrderStatus",
     "ReportType",
+    "ReportRunStatus",
     "PaymentMethod",
     "MessageRole",
     "Account",
@@ -23,6 +25,7 @@ __all__ = [
     "Message",
     "ReportContent",
     "Report",
+    "ReportRun",
     "Conversation",
 ]
 
@@ -9,6 +9,9 @@ class Conversation:
     id: Optional[int] = None
     customer_id: str = ""  # UUID (account.id)
     subject: str = ""
+    # Inbox counters maintained by MessageRepository (not edited directly)
+    unread_count: int = 0
+    last_message_at: Optional[datetime] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
 
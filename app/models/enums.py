@@ -26,6 +26,11 @@ class ReportType(str, Enum):
     MONTHLY = "Monthly"
 
 
+class ReportRunStatus(str, Enum):
+    SUCCEEDED = "Succeeded"
+    FAILED = "Failed"
+
+
 class MessageRole(str, Enum):
     CUSTOMER = "Customer"
     STAFF = "Staff"
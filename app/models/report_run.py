@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from .enums import ReportRunStatus, ReportType
+
+
+@dataclass(slots=True)
+class ReportRun:
+    # DB: INT AUTO_INCREMENT
+    id: Optional[int] = None
+    type: ReportType = ReportType.DAILY
+    start_date: datetime = field(default_factory=datetime.utcnow)
+    end_date: datetime = field(default_factory=datetime.utcnow)
+    status: ReportRunStatus = ReportRunStatus.SUCCEEDED
+    report_id: Optional[int] = None  # report.id when the run succeeded
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    duration_ms: int = 0
+    error: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.type, ReportType):
+            raise ValueError("type must be an instance of ReportType enum")
+        if not isinstance(self.status, ReportRunStatus):
+            raise ValueError("status must be an instance of ReportRunStatus enum")
+        if self.duration_ms < 0:
+            raise ValueError("duration_ms must be >= 0")
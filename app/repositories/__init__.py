@@ -3,6 +3,7 @@ from .conversation_repository import ConversationRepository
 from .item_repository import ItemRepository
 from .message_repository import MessageRepository
 from .report_repository import ReportRepository
+from .unit_of_work import UnitOfWork
 
 __all__ = [
     "AccountRepository",
@@ -10,4 +11,5 @@ __all__ = [
     "ItemRepository",
     "MessageRepository",
     "ReportRepository",
+    "UnitOfWork",
 ]
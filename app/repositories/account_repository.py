@@ -1,32 +1,42 @@
 from __future__ import annotations
 
-from typing import Optional
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from app.models import Account, Role
 from . import base
-
-
-def _row_to_account(row: dict) -> Account:
-    return Account(
-        id=row["id"],
-        user_name=row["user_name"],
-        password=row["password"],
-        salt=row["salt"],
-        first_name=row["first_name"],
-        last_name=row["last_name"],
-        role=Role(row["role"]),
-        email=row["email"],
-        country=row.get("country"),
-        state=row.get("state"),
-        city=row.get("city"),
-        address_line=row.get("address_line"),
-        zip_code=row.get("zip_code"),
-        phone=row.get("phone"),
-        password_reset_token=row.get("password_reset_token"),
-        password_reset_token_expiration=row.get("password_reset_token_expiration"),
-        created_at=row["created_at"],
-        updated_at=row["updated_at"],
-    )
+from .mapping import RowMapper, columns_sql
+
+
+ACCOUNT_COLUMNS = (
+    "id",
+    "user_name",
+    "password",
+    "salt",
+    "first_name",
+    "last_name",
+    "role",
+    "email",
+    "country",
+    "state",
+    "city",
+    "address_line",
+    "zip_code",
+    "phone",
+    "password_reset_token",
+    "password_reset_token_expiration",
+    "created_at",
+    "updated_at",
+)
+_ACCOUNT_SELECT = columns_sql(ACCOUNT_COLUMNS)
+_row_to_account = RowMapper(Account, ACCOUNT_COLUMNS, converters={"role": Role, "salt": bytes})
+
+_UUID_FRAGMENT_RE = re.compile(r"^[0-9a-f-]+$")
+
+
+def _prefix_pattern(term: str) -> str:
+    """LIKE pattern matching values that start with `term` (wildcards escaped)."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
 
 
 class AccountRepository:
@@ -62,54 +72,115 @@ class AccountRepository:
 
     @staticmethod
     def get_by_username(user_name: str) -> Optional[Account]:
-        row = base.fetch_one(
-            f"SELECT * FROM {AccountRepository.TABLE} WHERE user_name=%s",
+        row = base.fetch_one_tuple(
+            f"SELECT {_ACCOUNT_SELECT} FROM {AccountRepository.TABLE} WHERE user_name=%s",
             (user_name,),
         )
         return _row_to_account(row) if row else None
 
     @staticmethod
     def get_by_email(email: str) -> Optional[Account]:
-        row = base.fetch_one(
-            f"SELECT * FROM {AccountRepository.TABLE} WHERE email=%s",
+        row = base.fetch_one_tuple(
+            f"SELECT {_ACCOUNT_SELECT} FROM {AccountRepository.TABLE} WHERE email=%s",
             (email,),
         )
         return _row_to_account(row) if row else None
 
     @staticmethod
     def get_by_id(acc_id: str) -> Optional[Account]:
-        row = base.fetch_one(
-            f"SELECT * FROM {AccountRepository.TABLE} WHERE id=%s",
+        row = base.fetch_one_tuple_cached(
+            AccountRepository.TABLE,
+            acc_id,
+            f"SELECT {_ACCOUNT_SELECT} FROM {AccountRepository.TABLE} WHERE id=%s",
             (acc_id,),
         )
         return _row_to_account(row) if row else None
 
     @staticmethod
-    def get_by_name_or_id(first_name: str | None, last_name: str | None, id: str | None) -> Optional[list[Account]]:
-        if first_name is None and last_name is None and id is None:
-            return None
-
-        sql = f"SELECT * FROM {AccountRepository.TABLE} WHERE ("
-
-        if first_name is not None:
-            sql += f"first_name LIKE '%{first_name}%'"
-
-        if last_name is not None:
-            if first_name is not None:
-                sql += f" OR last_name LIKE '%{last_name}%'"
-            else:
-                sql += f"last_name LIKE '%{last_name}%'"
-
-        if id is not None:
-            if first_name is not None or last_name is not None:
-                sql += f" OR id LIKE '%{id}%'"
-            else:
-                sql += f"id LIKE '%{id}%'"
+    def get_by_ids(acc_ids: Iterable[str]) -> Dict[str, Account]:
+        """Batch lookup: id -> Account for the ids that exist (one query per chunk)."""
+        rows = base.fetch_all_tuples_by_ids(
+            f"SELECT {_ACCOUNT_SELECT} FROM {AccountRepository.TABLE} WHERE id IN ({{ids}})", acc_ids
+        )
+        return {acc.id: acc for acc in _row_to_account.map_all(rows)}
 
-        sql += f") AND role = \"Customer\""
+    @staticmethod
+    def get_by_name_or_id(
+        first_name: str | None, last_name: str | None, id: str | None, limit: int = 100
+    ) -> Optional[list[Account]]:
+        """Customers whose first name, last name or id contains any given value (parameterized)."""
+        clauses: List[str] = []
+        params: list = []
+        for column, value in (("first_name", first_name), ("last_name", last_name), ("id", id)):
+            if value is not None:
+                clauses.append(f"{column} LIKE %s")
+                params.append("%" + _prefix_pattern(value))
+        if not clauses:
+            return None
+        sql = (
+            f"SELECT {_ACCOUNT_SELECT} FROM {AccountRepository.TABLE} "
+            f"WHERE ({' OR '.join(clauses)}) AND role=%s LIMIT %s"
+        )
+        rows = base.fetch_all_tuples(sql, tuple(params) + (Role.CUSTOMER.value, limit))
+        return _row_to_account.map_all(rows) if rows else None
 
-        rows = base.fetch_all(sql)
-        return [_row_to_account(row) for row in rows] if rows else None
+    @staticmethod
+    def search_customers(query: str, limit: int, offset: int = 0) -> List[Account]:
+        """
+        Ranked prefix search over customer names, user names, emails and ids.
+        - One word matches the start of last_name, first_name, user_name, email
+          or id; two or more words match "first last" or "last first".
+        - Exact matches rank first, then last-name, first-name, user-name,
+          email and id matches; ties are ordered by name.
+        Every branch is an index range scan (idx_account_role_last_first,
+        idx_account_role_first_last, the unique keys, the primary key) capped at
+        offset + limit rows, so cost does not depend on table size.
+        """
+        terms = query.strip().lower().split()
+        if not terms:
+            return []
+        cap = offset + limit
+        branches: List[Tuple[str, list]] = []
+
+        def branch(rank_sql: str, where: str, order: str, params: list) -> None:
+            branches.append(
+                (
+                    f"(SELECT id, {rank_sql} AS r FROM {AccountRepository.TABLE} "
+                    f"WHERE role=%s AND {where} ORDER BY {order} LIMIT %s)",
+                    params,
+                )
+            )
+
+        role = Role.CUSTOMER.value
+        if len(terms) == 1:
+            t = terms[0]
+            like = _prefix_pattern(t)
+            branch("IF(last_name=%s, 0, 2)", "last_name LIKE %s", "last_name, first_name",
+                   [t, role, like, cap])
+            branch("IF(first_name=%s, 1, 3)", "first_name LIKE %s", "first_name, last_name",
+                   [t, role, like, cap])
+            branch("IF(user_name=%s, 0, 4)", "user_name LIKE %s", "user_name", [t, role, like, cap])
+            if "@" in t or "." in t:
+                branch("IF(email=%s, 0, 5)", "email LIKE %s", "email", [t, role, like, cap])
+            if _UUID_FRAGMENT_RE.match(t):
+                branch("IF(id=%s, 0, 6)", "id LIKE %s", "id", [t, role, like, cap])
+        else:
+            first, last = terms[0], " ".join(terms[1:])
+            branch("IF(first_name=%s AND last_name=%s, 0, 1)", "first_name LIKE %s AND last_name LIKE %s",
+                   "first_name, last_name", [first, last, role, _prefix_pattern(first), _prefix_pattern(last), cap])
+            last, first = terms[0], " ".join(terms[1:])
+            branch("IF(last_name=%s AND first_name=%s, 0, 2)", "last_name LIKE %s AND first_name LIKE %s",
+                   "last_name, first_name", [last, first, role, _prefix_pattern(last), _prefix_pattern(first), cap])
+
+        union = " UNION ALL ".join(sql for sql, _ in branches)
+        params = [p for _, branch_params in branches for p in branch_params]
+        sql = (
+            f"SELECT {columns_sql(ACCOUNT_COLUMNS, 'a')} FROM {AccountRepository.TABLE} a "
+            f"JOIN (SELECT id, MIN(r) AS r FROM ({union}) hits GROUP BY id) h ON h.id = a.id "
+            "ORDER BY h.r, a.last_name, a.first_name, a.id LIMIT %s OFFSET %s"
+        )
+        rows = base.fetch_all_tuples(sql, tuple(params) + (limit, offset))
+        return _row_to_account.map_all(rows)
 
     # NOTE: update_basic and update_address were removed in favor of update_partial
 
@@ -142,8 +213,18 @@ class AccountRepository:
                 account.password_reset_token_expiration,
                 account.id,
             ),
+            cache_key=account.id,
         )
 
+    @staticmethod
+    def replace_password_hash(acc_id: str, old_hash: str, new_hash: str, salt: bytes) -> bool:
+        """Swap in a rehashed password unless the password changed meanwhile."""
+        return base.execute_count(
+            f"UPDATE {AccountRepository.TABLE} SET password=%s, salt=%s WHERE id=%s AND password=%s",
+            (new_hash, salt, acc_id, old_hash),
+            cache_keys=[acc_id],
+        ) > 0
+
     @staticmethod
     def update_partial(acc_id: str, data: dict) -> None:
         """Update only the provided non-None fields for an account record."""
@@ -1,51 +1,463 @@
 from __future__ import annotations
 
+import re
+import threading
+import time
 from contextlib import contextmanager
 from dataclasses import asdict
-from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple, TypeVar
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Sequence, Tuple, TypeVar
 
+from mysql.connector import Error as DBError
+
+from app.config.settings import settings
 from app.db.connection import db_cursor
+from app.db.instrumentation import timed
+from .cache import CacheBackend, LRUCache
 
 T = TypeVar("T")
 
+# Max values bound into one `IN (...)` list by the *_by_ids helpers
+IN_CHUNK_SIZE = 1000
+
+# ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT: the transaction was rolled back and may be retried
+RETRYABLE_ERRNOS = frozenset({1213, 1205})
+
+# Process-wide outcome counters for run_transaction (see transaction_stats)
+_txn_lock = threading.Lock()
+_txn_counts: Dict[str, int] = {
+    "transactions": 0,
+    "committed": 0,
+    "retries": 0,
+    "deadlocks": 0,
+    "lock_wait_timeouts": 0,
+    "gave_up": 0,
+}
+
+# Per-thread active unit of work: (connection, cursor) or None
+_local = threading.local()
+
+# Read-through cache for hot single-row lookups (see fetch_one_tuple_cached)
+_cache: Optional[CacheBackend] = (
+    LRUCache(settings.cache_max_entries, settings.cache_ttl_s) if settings.cache_enabled else None
+)
+
+_COLUMN_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_WRITE_TABLE_RE = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?([A-Za-z_][A-Za-z0-9_]*)`?",
+    re.IGNORECASE,
+)
+
+
+def _active() -> Optional[Tuple[Any, Any]]:
+    return getattr(_local, "ctx", None)
+
+
+def in_unit_of_work() -> bool:
+    return _active() is not None
+
+
+def _mark_write() -> None:
+    # Inside a unit of work the pin starts at commit (and not at all on rollback)
+    if _active() is not None:
+        _local.uow_wrote = True
+    else:
+        _local.last_write_at = time.monotonic()
+
+
+def set_cache(cache: Optional[CacheBackend]) -> None:
+    """Swap the read-through cache implementation (None disables caching)."""
+    global _cache
+    _cache = cache
+
+
+def cache_stats() -> Dict[str, Any]:
+    return _cache.stats() if _cache is not None else {}
+
+
+def invalidate_cache(table: str, key: Optional[Hashable] = None) -> None:
+    """
+    Drop cached rows for `table` (one `key`, or all when key is None).
+    Inside a unit of work the invalidation is repeated after commit so readers
+    cannot re-cache the pre-commit row in between.
+    """
+    if _cache is None:
+        return
+    _cache.invalidate(table, key)
+    if _active() is not None:
+        pending = getattr(_local, "pending_invalidations", None)
+        if pending is None:
+            pending = _local.pending_invalidations = []
+        pending.append((table, key))
+
+
+def _invalidate_for(query: str, cache_key: Optional[Hashable]) -> None:
+    m = _WRITE_TABLE_RE.match(query)
+    if m:
+        invalidate_cache(m.group(1), cache_key)
+
+
+def _reads_may_use_replica() -> bool:
+    # Reads go to a replica unless this thread wrote recently (read-your-writes)
+    # or explicitly asked for the primary via read_from_primary().
+    if getattr(_local, "primary_reads", 0):
+        return False
+    last_write = getattr(_local, "last_write_at", None)
+    return last_write is None or time.monotonic() - last_write >= settings.db_read_after_write_pin_s
+
+
+@contextmanager
+def read_from_primary() -> Iterator[None]:
+    """Force reads issued in the block (on this thread) to the primary."""
+    _local.primary_reads = getattr(_local, "primary_reads", 0) + 1
+    try:
+        yield
+    finally:
+        _local.primary_reads -= 1
+
+
+@contextmanager
+def unit_of_work() -> Iterator[Tuple[Any, Any]]:
+    """
+    Run every base helper inside the block on one pooled connection and commit once.
+    - Commits when the block exits normally, rolls back if it raises.
+    - Nested calls join the outermost unit of work (no savepoints).
+    Usage:
+        with unit_of_work():
+            order_id = OrderRepository.create_order(...)
+            OrderRepository.add_order_items(order_id, lines)
+    """
+    active = _active()
+    if active is not None:
+        yield active
+        return
+    _local.pending_invalidations = None
+    _local.after_commit = None
+    _local.uow_wrote = False
+    try:
+        with db_cursor(dictionary=True) as ctx:
+            _local.ctx = ctx
+            try:
+                yield ctx
+            finally:
+                _local.ctx = None
+        if _local.uow_wrote:
+            # committed writes: pin this thread's reads to the primary (read-your-writes)
+            _local.last_write_at = time.monotonic()
+        pending = getattr(_local, "pending_invalidations", None) or []
+        callbacks = getattr(_local, "after_commit", None) or []
+    finally:
+        _local.pending_invalidations = None
+        _local.after_commit = None
+        _local.uow_wrote = False
+    # committed: replay invalidations recorded during the unit of work
+    if _cache is not None:
+        for table, key in pending:
+            _cache.invalidate(table, key)
+    for fn in callbacks:
+        fn()
+
+
+def after_commit(fn: Callable[[], None]) -> None:
+    """
+    Run `fn` once the current unit of work commits (dropped if it rolls back);
+    outside a unit of work the write already committed, so run it now.
+    """
+    if _active() is None:
+        fn()
+        return
+    callbacks = getattr(_local, "after_commit", None)
+    if callbacks is None:
+        callbacks = _local.after_commit = []
+    callbacks.append(fn)
+
+
+def run_transaction(work: Callable[[], T], attempts: int = 3, backoff_s: float = 0.05) -> T:
+    """
+    Run `work` inside a unit of work, retrying the whole transaction when MySQL
+    aborts it with a deadlock or lock-wait timeout. Other errors propagate.
+    """
+    if _active() is not None:
+        return work()  # joined an outer unit of work; the outer caller owns retries
+    _count_txn("transactions")
+    for attempt in range(1, attempts + 1):
+        try:
+            with unit_of_work():
+                result = work()
+            _count_txn("committed")
+            return result
+        except DBError as exc:
+            errno = getattr(exc, "errno", None)
+            if errno == 1213:
+                _count_txn("deadlocks")
+            elif errno == 1205:
+                _count_txn("lock_wait_timeouts")
+            if errno not in RETRYABLE_ERRNOS:
+                raise
+            if attempt == attempts:
+                _count_txn("gave_up")
+                raise
+            _count_txn("retries")
+            time.sleep(backoff_s * attempt)
+    raise AssertionError("unreachable")
+
+
+def _count_txn(name: str) -> None:
+    with _txn_lock:
+        _txn_counts[name] += 1
+
+
+def transaction_stats() -> Dict[str, int]:
+    """Counters for run_transaction: deadlocks / lock-wait timeouts seen, retries, give-ups."""
+    with _txn_lock:
+        return dict(_txn_counts)
+
+
+def reset_transaction_stats() -> None:
+    with _txn_lock:
+        for name in _txn_counts:
+            _txn_counts[name] = 0
+
 
 @contextmanager
 def transaction_cursor() -> Iterator[Tuple[Any, Any]]:
-    # delegates to db_cursor which already wraps commit/rollback
+    # Reuse the active unit of work if any; otherwise delegate to db_cursor,
+    # which already wraps commit/rollback for a single statement.
+    active = _active()
+    if active is not None:
+        yield active
+        return
     with db_cursor(dictionary=True) as ctx:
         yield ctx
 
 
-def execute(query: str, params: Sequence[Any] | Dict[str, Any] | None = None) -> int:
+def execute(
+    query: str,
+    params: Sequence[Any] | Dict[str, Any] | None = None,
+    cache_key: Optional[Hashable] = None,
+) -> int:
+    """
+    Run a write statement. Cached rows of the written table are invalidated:
+    only `cache_key` when given, otherwise the whole table.
+    """
     with transaction_cursor() as (conn, cur):
-        cur.execute(query, params or ())
+        with timed(query):
+            cur.execute(query, params or ())
+        _mark_write()
+        _invalidate_for(query, cache_key)
         # lastrowid is available for AUTO_INCREMENT tables
         return getattr(cur, "lastrowid", 0) or 0
 
 
+def execute_count(
+    query: str,
+    params: Sequence[Any] | Dict[str, Any] | None = None,
+    cache_keys: Optional[Iterable[Hashable]] = None,
+) -> int:
+    """
+    Like execute but returns the number of affected rows, for callers that must
+    verify a conditional write. `cache_keys` limits invalidation to those rows.
+    """
+    with transaction_cursor() as (conn, cur):
+        with timed(query):
+            cur.execute(query, params or ())
+        _mark_write()
+        m = _WRITE_TABLE_RE.match(query)
+        if m and cache_keys is not None:
+            for key in cache_keys:
+                invalidate_cache(m.group(1), key)
+        elif m:
+            invalidate_cache(m.group(1))
+        return cur.rowcount
+
+
 def executemany(query: str, param_list: Iterable[Sequence[Any] | Dict[str, Any]]) -> None:
     with transaction_cursor() as (conn, cur):
-        cur.executemany(query, list(param_list))
+        with timed(query):
+            cur.executemany(query, list(param_list))
+        _mark_write()
+        _invalidate_for(query, None)
+
+
+@contextmanager
+def _read_cursor(dictionary: bool = True) -> Iterator[Any]:
+    # Inside a unit of work reads stay on its (primary) connection; otherwise
+    # they may be routed to a replica.
+    active = _active()
+    if active is not None:
+        conn, cur = active
+        if dictionary:
+            yield cur
+            return
+        cur = conn.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+        return
+    with db_cursor(dictionary=dictionary, readonly=_reads_may_use_replica()) as (conn, cur):
+        yield cur
 
 
 def fetch_one(query: str, params: Sequence[Any] | Dict[str, Any] | None = None) -> Optional[Dict[str, Any]]:
-    with transaction_cursor() as (conn, cur):
-        cur.execute(query, params or ())
-        row = cur.fetchone()
+    with _read_cursor() as cur:
+        with timed(query):
+            cur.execute(query, params or ())
+            row = cur.fetchone()
         return dict(row) if row is not None else None
 
 
 def fetch_all(query: str, params: Sequence[Any] | Dict[str, Any] | None = None) -> list[Dict[str, Any]]:
-    with transaction_cursor() as (conn, cur):
+    with _read_cursor() as cur:
+        with timed(query):
+            cur.execute(query, params or ())
+            # dictionary cursors already return fresh dicts; no need to copy them again
+            return cur.fetchall() or []
+
+
+def fetch_one_tuple(query: str, params: Sequence[Any] | Dict[str, Any] | None = None) -> Optional[Tuple[Any, ...]]:
+    """Like fetch_one but returns the raw row tuple (select-list order)."""
+    with _read_cursor(dictionary=False) as cur:
+        with timed(query):
+            cur.execute(query, params or ())
+            return cur.fetchone()
+
+
+def fetch_all_tuples(query: str, params: Sequence[Any] | Dict[str, Any] | None = None) -> list[Tuple[Any, ...]]:
+    """Like fetch_all but returns raw row tuples; pair with a RowMapper."""
+    with _read_cursor(dictionary=False) as cur:
+        with timed(query):
+            cur.execute(query, params or ())
+            return cur.fetchall() or []
+
+
+def fetch_one_tuple_cached(
+    table: str,
+    key: Hashable,
+    query: str,
+    params: Sequence[Any] | Dict[str, Any] | None = None,
+) -> Optional[Tuple[Any, ...]]:
+    """
+    Read-through variant of fetch_one_tuple for single-row lookups by key.
+    Misses (None) are cached too. Bypassed inside a unit of work, where reads
+    must see the transaction's own writes and locks.
+    Misses are filled from the primary: a lagging replica's pre-write row
+    would otherwise be cached for the whole TTL right after the write
+    invalidated it.
+    """
+    if _cache is None or _active() is not None:
+        return fetch_one_tuple(query, params)
+    hit, row = _cache.get(table, key)
+    if hit:
+        return row
+    generation = _cache.generation(table)
+    with read_from_primary():
+        row = fetch_one_tuple(query, params)
+    _cache.put(table, key, row, generation)
+    return row
+
+
+def fetch_all_tuples_cached(
+    table: str,
+    key: Hashable,
+    query: str,
+    params: Sequence[Any] | Dict[str, Any] | None = None,
+) -> list[Tuple[Any, ...]]:
+    """Read-through variant of fetch_all_tuples for small aggregate results (see fetch_one_tuple_cached)."""
+    if _cache is None or _active() is not None:
+        return fetch_all_tuples(query, params)
+    hit, rows = _cache.get(table, key)
+    if hit:
+        return rows
+    generation = _cache.generation(table)
+    with read_from_primary():
+        rows = fetch_all_tuples(query, params)
+    _cache.put(table, key, rows, generation)
+    return rows
+
+
+def chunked(values: Sequence[T], size: int = IN_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def fetch_all_tuples_by_ids(
+    query: str,
+    ids: Iterable[Any],
+    chunk_size: int = IN_CHUNK_SIZE,
+) -> list[Tuple[Any, ...]]:
+    """
+    Multi-get: run `query` once per chunk of distinct `ids`.
+    `query` must contain a single `{ids}` slot, rendered as a %s placeholder list, e.g.
+        "SELECT id, name FROM item WHERE id IN ({ids})"
+    """
+    unique = list(dict.fromkeys(ids))
+    rows: list[Tuple[Any, ...]] = []
+    for chunk in chunked(unique, chunk_size):
+        sql = query.format(ids=", ".join(["%s"] * len(chunk)))
+        rows.extend(fetch_all_tuples(sql, tuple(chunk)))
+    return rows
+
+
+def fetch_iter(
+    query: str,
+    params: Sequence[Any] | Dict[str, Any] | None = None,
+    fetch_size: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows through an unbuffered cursor, `fetch_size` rows per round trip.
+    Memory stays flat regardless of result size. The connection is held until
+    the generator is exhausted or closed, so consume it promptly; inside a unit
+    of work, finish iterating before issuing other statements.
+    """
+    return _iter_rows(query, params, fetch_size, dictionary=True)
+
+
+def fetch_iter_tuples(
+    query: str,
+    params: Sequence[Any] | Dict[str, Any] | None = None,
+    fetch_size: Optional[int] = None,
+) -> Iterator[Tuple[Any, ...]]:
+    """Tuple-row variant of fetch_iter."""
+    return _iter_rows(query, params, fetch_size, dictionary=False)
+
+
+def _iter_rows(
+    query: str,
+    params: Sequence[Any] | Dict[str, Any] | None,
+    fetch_size: Optional[int],
+    dictionary: bool,
+) -> Iterator[Any]:
+    size = fetch_size or settings.db_fetch_size
+    active = _active()
+    if active is not None:
+        conn, _ = active
+        cur = conn.cursor(dictionary=dictionary, buffered=False)
+        try:
+            yield from _stream(cur, query, params, size)
+        finally:
+            cur.close()
+        return
+    with db_cursor(dictionary=dictionary, readonly=_reads_may_use_replica()) as (conn, cur):
+        yield from _stream(cur, query, params, size)
+
+
+def _stream(cur: Any, query: str, params: Sequence[Any] | Dict[str, Any] | None, size: int) -> Iterator[Any]:
+    # timed from execute until the last batch is fetched (time spent in the consumer included)
+    with timed(query):
         cur.execute(query, params or ())
-        rows = cur.fetchall() or []
-        return [dict(r) for r in rows]
+        while True:
+            batch = cur.fetchmany(size)
+            if not batch:
+                return
+            yield from batch
 
 
-def insert_from_dataclass(table: str, data: Any, include: Optional[set[str]] = None) -> None:
+def insert_from_dataclass(table: str, data: Any, include: Optional[set[str]] = None) -> int:
     """
     Convenience insert using a dataclass' fields mapped to column names.
     Use only when field names match column names exactly.
+    Returns the new AUTO_INCREMENT id (0 for tables without one).
     """
     row = asdict(data)
     if include:
@@ -53,7 +465,7 @@ def insert_from_dataclass(table: str, data: Any, include: Optional[set[str]] = N
     columns = ", ".join(row.keys())
     placeholders = ", ".join(["%s"] * len(row))
     sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-    execute(sql, list(row.values()))
+    return execute(sql, list(row.values()))
 
 
 def update(table: str, id_value: int | str, data: dict, id_column: str = "id") -> None:
@@ -71,18 +483,15 @@ def update(table: str, id_value: int | str, data: dict, id_column: str = "id") -
         return
 
     # very small safety check for column names: only allow alnum + underscore and must start with letter/_
-    import re
-
-    col_re = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
     for k in fields.keys():
-        if not col_re.match(k):
+        if not _COLUMN_RE.match(k):
             raise ValueError(f"Invalid column name: {k}")
 
     set_clause = ", ".join([f"{col}=%s" for col in fields.keys()])
     params = list(fields.values()) + [id_value]
     sql = f"UPDATE {table} SET {set_clause} WHERE {id_column}=%s"
-    execute(sql, params)
+    execute(sql, params, cache_key=id_value if id_column == "id" else None)
 
 def delete_from_dataclass(table: str, id: int | str) -> None:
-    sql = f"DELETE FROM {table} WHERE id={id}"
-    execute(sql)
+    sql = f"DELETE FROM {table} WHERE id=%s"
+    execute(sql, (id,), cache_key=id)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Protocol, Set, Tuple
+
+
+class CacheBackend(Protocol):
+    """Interface base.py expects from a read-through cache (see base.set_cache)."""
+
+    def get(self, table: str, key: Hashable) -> Tuple[bool, Any]: ...
+
+    def generation(self, table: str) -> int: ...
+
+    def put(self, table: str, key: Hashable, value: Any, generation: int) -> None: ...
+
+    def invalidate(self, table: str, key: Optional[Hashable] = None) -> None: ...
+
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class LRUCache:
+    """
+    Bounded in-process LRU cache with per-entry TTL, keyed by (table, key).
+    - invalidate(table, key) drops one entry; invalidate(table) drops the whole table.
+    - Each table has a generation counter bumped on invalidation; put() ignores
+      values read before the latest invalidation, so a slow reader cannot
+      re-insert a row that a concurrent write just changed.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_s: float = 10.0) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._by_table: Dict[str, Set[Hashable]] = {}
+        self._generations: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def get(self, table: str, key: Hashable) -> Tuple[bool, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((table, key))
+            if entry is None:
+                self._misses += 1
+                return False, None
+            expires_at, value = entry
+            if expires_at <= now:
+                self._drop((table, key))
+                self._expirations += 1
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end((table, key))
+            self._hits += 1
+            return True, value
+
+    def generation(self, table: str) -> int:
+        with self._lock:
+            return self._generations.get(table, 0)
+
+    def put(self, table: str, key: Hashable, value: Any, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(table, 0) != generation:
+                return
+            self._entries[(table, key)] = (time.monotonic() + self.ttl_s, value)
+            self._entries.move_to_end((table, key))
+            self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._evictions += 1
+
+    def invalidate(self, table: str, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            if key is None:
+                for k in self._by_table.pop(table, set()):
+                    self._entries.pop((table, k), None)
+                    self._invalidations += 1
+            elif (table, key) in self._entries:
+                self._drop((table, key))
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            for table in self._generations:
+                self._generations[table] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+    def _drop(self, full_key: Tuple[str, Hashable]) -> None:
+        self._entries.pop(full_key, None)
+        keys = self._by_table.get(full_key[0])
+        if keys is not None:
+            keys.discard(full_key[1])
@@ -1,19 +1,16 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from app.models import Conversation
 from . import base
+from .mapping import RowMapper, columns_sql
 
 
-def _row_to_conversation(row: dict) -> Conversation:
-    return Conversation(
-        id=row["id"],
-        customer_id=row["customer_id"],
-        subject=row["subject"],
-        created_at=row["created_at"],
-        updated_at=row["updated_at"],
-    )
+CONVERSATION_COLUMNS = ("id", "customer_id", "subject", "unread_count", "last_message_at", "created_at", "updated_at")
+_CONVERSATION_SELECT = columns_sql(CONVERSATION_COLUMNS)
+_row_to_conversation = RowMapper(Conversation, CONVERSATION_COLUMNS)
 
 
 class ConversationRepository:
@@ -27,24 +24,99 @@ class ConversationRepository:
 
     @staticmethod
     def get(conversation_id: int) -> Optional[Conversation]:
-        row = base.fetch_one(f"SELECT * FROM {ConversationRepository.TABLE} WHERE id=%s", (conversation_id,))
+        row = base.fetch_one_tuple(f"SELECT {_CONVERSATION_SELECT} FROM {ConversationRepository.TABLE} WHERE id=%s", (conversation_id,))
         return _row_to_conversation(row) if row else None
 
+    @staticmethod
+    def get_by_ids(conversation_ids: Iterable[int]) -> Dict[int, Conversation]:
+        """Batch lookup: id -> Conversation for the ids that exist (one query per chunk)."""
+        rows = base.fetch_all_tuples_by_ids(
+            f"SELECT {_CONVERSATION_SELECT} FROM {ConversationRepository.TABLE} WHERE id IN ({{ids}})",
+            conversation_ids,
+        )
+        return {c.id: c for c in _row_to_conversation.map_all(rows)}
+
     @staticmethod
     def list_by_customer(customer_id: str) -> List[Conversation]:
-        rows = base.fetch_all(
-            f"SELECT * FROM {ConversationRepository.TABLE} WHERE customer_id=%s ORDER BY updated_at DESC",
+        rows = base.fetch_all_tuples(
+            f"SELECT {_CONVERSATION_SELECT} FROM {ConversationRepository.TABLE} WHERE customer_id=%s ORDER BY updated_at DESC",
             (customer_id,),
         )
-        return [_row_to_conversation(r) for r in rows]
+        return _row_to_conversation.map_all(rows)
 
     @staticmethod
     def list_all() -> List[Conversation]:
-        rows = base.fetch_all(
-            f"SELECT * FROM {ConversationRepository.TABLE} ORDER BY updated_at DESC",
+        rows = base.fetch_all_tuples(
+            f"SELECT {_CONVERSATION_SELECT} FROM {ConversationRepository.TABLE} ORDER BY updated_at DESC",
             (),
         )
-        return [_row_to_conversation(r) for r in rows]
+        return _row_to_conversation.map_all(rows)
+
+    @staticmethod
+    def iter_all(fetch_size: int | None = None) -> Iterator[Conversation]:
+        """Streaming variant of list_all."""
+        rows = base.fetch_iter_tuples(
+            f"SELECT {_CONVERSATION_SELECT} FROM {ConversationRepository.TABLE} ORDER BY updated_at DESC",
+            (),
+            fetch_size,
+        )
+        return (_row_to_conversation(r) for r in rows)
+
+    @staticmethod
+    def list_inbox(
+        limit: int,
+        unread_only: bool = False,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Conversation]:
+        """
+        Conversations by most recent message, newest first, one page at a time.
+        `before` is the (last_message_at, id) of the last row of the previous
+        page. Served by idx_conversation_inbox / idx_conversation_activity;
+        conversations without messages are not listed.
+        """
+        where = ["last_message_at IS NOT NULL"]
+        params: list = []
+        if unread_only:
+            where.insert(0, "has_unread = TRUE")
+        if before is not None:
+            where.append("(last_message_at < %s OR (last_message_at = %s AND id < %s))")
+            params.extend((before[0], before[0], before[1]))
+        params.append(limit)
+        rows = base.fetch_all_tuples(
+            f"SELECT {_CONVERSATION_SELECT} FROM {ConversationRepository.TABLE} "
+            f"WHERE {' AND '.join(where)} "
+            "ORDER BY last_message_at DESC, id DESC LIMIT %s",
+            tuple(params),
+        )
+        return _row_to_conversation.map_all(rows)
+
+    @staticmethod
+    def record_message(conversation_id: int, unread_delta: int) -> None:
+        # Run before the message INSERT: locking the conversation row first
+        # serializes with mark_read and avoids a lock-order deadlock.
+        base.execute(
+            f"UPDATE {ConversationRepository.TABLE} "
+            "SET last_message_at = CURRENT_TIMESTAMP, unread_count = unread_count + %s WHERE id=%s",
+            (unread_delta, conversation_id),
+        )
+
+    @staticmethod
+    def clear_unread(conversation_id: int) -> bool:
+        """Zero the unread counter; False when nothing was unread."""
+        return base.execute_count(
+            f"UPDATE {ConversationRepository.TABLE} SET unread_count = 0 WHERE id=%s AND unread_count > 0",
+            (conversation_id,),
+        ) > 0
+
+    @staticmethod
+    def refresh_counters() -> None:
+        """Recompute unread_count / last_message_at from the message table (backfill, repair)."""
+        base.execute(
+            f"UPDATE {ConversationRepository.TABLE} c SET "
+            "unread_count = (SELECT COUNT(*) FROM message m WHERE m.conversation_id = c.id "
+            "AND m.role = 'Customer' AND m.is_read = FALSE), "
+            "last_message_at = (SELECT MAX(m.created_at) FROM message m WHERE m.conversation_id = c.id)"
+        )
 
     @staticmethod
     def update_partial(conv_id: int, data: dict) -> None:
@@ -1,40 +1,107 @@
 from __future__ import annotations
 
-from typing import Optional
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
 from app.models import Item
 from . import base
+from .mapping import RowMapper, columns_sql
 
-def _row_to_item(row: dict) -> Item:
-    return Item(
-        id=row["id"],
-        name=row.get("name"),
-        description=row.get("description"),
-        category=row.get("category"),
-        price=row.get("price"),
-        stock_quantity=row.get("stock_quantity"),
-        like_count=row.get("like_count"),
-    )
+ITEM_COLUMNS = ("id", "name", "description", "category", "price", "stock_quantity", "like_count")
+_ITEM_SELECT = columns_sql(ITEM_COLUMNS)
+_row_to_item = RowMapper(Item, ITEM_COLUMNS)
+
+# Cache namespace for category facet counts; dropped by writes that can change them
+_FACETS_CACHE = "item_facets"
+
+# Called with (item id, new name) after a committed create/rename, (item id, None) after a delete
+NameListener = Callable[[int, Optional[str]], None]
+_name_listeners: List[NameListener] = []
+
+# sort name -> (ORDER BY, keyset predicate after (key, id), key column)
+_BROWSE_SORTS = {
+    "popular": ("like_count DESC, id ASC", "(like_count < %s OR (like_count = %s AND id > %s))", "like_count"),
+    "price_asc": ("price ASC, id ASC", "(price > %s OR (price = %s AND id > %s))", "price"),
+    "price_desc": ("price DESC, id DESC", "(price < %s OR (price = %s AND id < %s))", "price"),
+}
 
 class ItemRepository:
     TABLE = "item"
 
     @staticmethod
     def list() -> Optional[list[Item]]:
-        rows = base.fetch_all(
-            f"SELECT * FROM {ItemRepository.TABLE}"
+        rows = base.fetch_all_tuples(
+            f"SELECT {_ITEM_SELECT} FROM {ItemRepository.TABLE}"
+        )
+        return _row_to_item.map_all(rows) if rows else None
+
+    @staticmethod
+    def iter_all(fetch_size: int | None = None) -> Iterator[Item]:
+        """Stream every item in id order without materializing the table."""
+        rows = base.fetch_iter_tuples(
+            f"SELECT {_ITEM_SELECT} FROM {ItemRepository.TABLE} ORDER BY id ASC", (), fetch_size
+        )
+        return (_row_to_item(row) for row in rows)
+
+    @staticmethod
+    def iter_names(fetch_size: int | None = None) -> Iterator[tuple[int, str]]:
+        """Stream (id, name) for every item in id order."""
+        return base.fetch_iter_tuples(
+            f"SELECT id, name FROM {ItemRepository.TABLE} ORDER BY id ASC", (), fetch_size
         )
-        return [_row_to_item(row) for row in rows] if rows else None
 
     @staticmethod
     def get_by_id(id: int) -> Optional[Item]:
-        row = base.fetch_one(
-            f"SELECT * FROM {ItemRepository.TABLE} WHERE id={id}"
+        row = base.fetch_one_tuple_cached(
+            ItemRepository.TABLE, id, f"SELECT {_ITEM_SELECT} FROM {ItemRepository.TABLE} WHERE id=%s", (id,)
         )
         return _row_to_item(row) if row else None
 
+    @staticmethod
+    def get_by_ids(ids: Iterable[int]) -> Dict[int, Item]:
+        """Batch lookup: id -> Item for the ids that exist (one query per chunk)."""
+        rows = base.fetch_all_tuples_by_ids(
+            f"SELECT {_ITEM_SELECT} FROM {ItemRepository.TABLE} WHERE id IN ({{ids}})", ids
+        )
+        return {it.id: it for it in _row_to_item.map_all(rows)}
+
+    @staticmethod
+    def lock_by_ids(ids: Iterable[int]) -> Dict[int, Item]:
+        """
+        SELECT ... FOR UPDATE the given items, in ascending id order so concurrent
+        transactions acquire row locks in the same order (no lock-order deadlocks).
+        Must be called inside a unit of work; locks are held until it commits.
+        """
+        rows = base.fetch_all_tuples_by_ids(
+            f"SELECT {_ITEM_SELECT} FROM {ItemRepository.TABLE} WHERE id IN ({{ids}}) ORDER BY id ASC FOR UPDATE",
+            sorted(set(ids)),
+        )
+        return {it.id: it for it in _row_to_item.map_all(rows)}
+
+    @staticmethod
+    def add_name_listener(listener: NameListener) -> None:
+        """Subscribe in-process caches of item names (e.g. the fuzzy lookup index) to writes."""
+        if listener not in _name_listeners:
+            _name_listeners.append(listener)
+
+    @staticmethod
+    def remove_name_listener(listener: NameListener) -> None:
+        if listener in _name_listeners:
+            _name_listeners.remove(listener)
+
+    @staticmethod
+    def _notify_name(id: int, name: Optional[str]) -> None:
+        if not _name_listeners:
+            return
+
+        def notify() -> None:
+            for listener in list(_name_listeners):
+                listener(id, name)
+
+        base.after_commit(notify)
+
     @staticmethod
     def create(item: Item) -> None:
-        base.insert_from_dataclass(
+        item.id = base.insert_from_dataclass(
             ItemRepository.TABLE,
             item,
             include={
@@ -45,11 +112,16 @@ class ItemRepository:
                 "stock_quantity",
                 "like_count"
             }
-        )
+        ) or item.id
+        base.invalidate_cache(_FACETS_CACHE)
+        if item.id:
+            ItemRepository._notify_name(item.id, item.name)
 
     @staticmethod
     def delete(id: int) -> None:
         base.delete_from_dataclass(ItemRepository.TABLE, id)
+        base.invalidate_cache(_FACETS_CACHE)
+        ItemRepository._notify_name(id, None)
 
     @staticmethod
     def update(id: int, item: Item) -> None:
@@ -63,16 +135,93 @@ class ItemRepository:
             "like_count": item.like_count,
         }
         base.update(ItemRepository.TABLE, id, data)
+        base.invalidate_cache(_FACETS_CACHE)
+        if item.name is not None:
+            ItemRepository._notify_name(id, item.name)
 
     @staticmethod
     def update_partial(id: int, data: dict) -> None:
         """Update only the provided non-None fields for an item record."""
         base.update(ItemRepository.TABLE, id, data)
+        if "category" in data or "price" in data:
+            base.invalidate_cache(_FACETS_CACHE)
+        if data.get("name") is not None:
+            ItemRepository._notify_name(id, data["name"])
+
+    @staticmethod
+    def browse(
+        limit: int,
+        category: Optional[str] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        sort: str = "popular",
+        after: Optional[tuple] = None,
+    ) -> list[Item]:
+        """
+        Keyset page of items filtered by category ("" = uncategorized: NULL or '') and price range.
+        `sort` is one of _BROWSE_SORTS; `after` is the (sort key, id) of the previous
+        page's last item. With a category the scan runs on idx_item_category_popularity
+        or idx_item_category_price; without one on idx_item_popularity or idx_item_price.
+        """
+        order, keyset, _ = _BROWSE_SORTS[sort]
+        where: list[str] = []
+        params: list = []
+        if category == "":
+            # blank categories stored before create_item normalized them count as uncategorized
+            where.append("(category IS NULL OR category = '')")
+        elif category is not None:
+            where.append("category = %s")
+            params.append(category)
+        if min_price is not None:
+            where.append("price >= %s")
+            params.append(min_price)
+        if max_price is not None:
+            where.append("price <= %s")
+            params.append(max_price)
+        if after is not None:
+            where.append(keyset)
+            params.extend((after[0], after[0], after[1]))
+        sql = f"SELECT {_ITEM_SELECT} FROM {ItemRepository.TABLE}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT %s"
+        rows = base.fetch_all_tuples(sql, tuple(params) + (limit,))
+        return _row_to_item.map_all(rows)
+
+    @staticmethod
+    def browse_key(item: Item, sort: str):
+        """The (sort key, id) keyset position of `item` for `sort`."""
+        return getattr(item, _BROWSE_SORTS[sort][2]), int(item.id or 0)
+
+    @staticmethod
+    def category_counts(
+        min_price: Optional[Decimal] = None, max_price: Optional[Decimal] = None
+    ) -> list[tuple[Optional[str], int]]:
+        """
+        (category, item count) for every category, optionally within a price range;
+        NULL and '' are both reported as None (uncategorized).
+        Answered from idx_item_category_price alone and cached until an item is
+        created, deleted or has its category or price changed (or the cache TTL ends).
+        """
+        sql = f"SELECT NULLIF(category, '') AS category, COUNT(*) FROM {ItemRepository.TABLE}"
+        where: list[str] = []
+        params: list = []
+        if min_price is not None:
+            where.append("price >= %s")
+            params.append(min_price)
+        if max_price is not None:
+            where.append("price <= %s")
+            params.append(max_price)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " GROUP BY NULLIF(category, '') ORDER BY 1"
+        rows = base.fetch_all_tuples_cached(_FACETS_CACHE, (min_price, max_price), sql, tuple(params))
+        return [(r[0], int(r[1])) for r in rows]
 
     @staticmethod
     def list_all_popular_first(limit: int | None = None, offset: int | None = None) -> list[Item]:
         # Return items ordered by popularity (likes) then id. Supports optional pagination.
-        sql = f"SELECT * FROM {ItemRepository.TABLE} ORDER BY like_count DESC, id ASC"
+        sql = f"SELECT {_ITEM_SELECT} FROM {ItemRepository.TABLE} ORDER BY like_count DESC, id ASC"
         params: tuple = ()
         if limit is not None:
             sql += " LIMIT %s"
@@ -80,5 +229,80 @@ class ItemRepository:
             if offset is not None:
                 sql += " OFFSET %s"
                 params = (limit, offset)
-        rows = base.fetch_all(sql, params)
-        return [_row_to_item(r) for r in rows]
+        rows = base.fetch_all_tuples(sql, params)
+        return _row_to_item.map_all(rows)
+
+    @staticmethod
+    def search(
+        boolean_query: str, limit: int, offset: int = 0, candidates: int = 1000, like_weight: float = 0.1
+    ) -> list[Item]:
+        """
+        Full-text search over name, description and category (ft_item_text).
+        - `boolean_query` is a MySQL BOOLEAN MODE expression.
+        - The `candidates` most relevant matches come straight from the
+          full-text index (InnoDB's BM25-style relevance); only those are
+          re-ranked by relevance * (1 + like_weight * ln(1 + like_count)), so
+          cost is bounded for common terms. Pages past `candidates` are empty.
+        """
+        if offset >= candidates:
+            return []
+        match = "MATCH(name, description, category) AGAINST (%s IN BOOLEAN MODE)"
+        sql = (
+            f"SELECT {columns_sql(ITEM_COLUMNS, 'i')} FROM {ItemRepository.TABLE} i "
+            f"JOIN (SELECT id, {match} AS relevance FROM {ItemRepository.TABLE} "
+            f"WHERE {match} ORDER BY relevance DESC LIMIT %s) hits ON hits.id = i.id "
+            "ORDER BY hits.relevance * (1 + %s * LN(1 + i.like_count)) DESC, i.id ASC "
+            "LIMIT %s OFFSET %s"
+        )
+        rows = base.fetch_all_tuples(
+            sql, (boolean_query, boolean_query, candidates, like_weight, min(limit, candidates - offset), offset)
+        )
+        return _row_to_item.map_all(rows)
+
+    @staticmethod
+    def like_counts_after(after_id: int, limit: int) -> list[tuple[int, int, int]]:
+        """
+        (item id, stored like_count, liked_item count) for the next `limit` items after
+        `after_id`, by id. Plain consistent read over the primary key and
+        idx_liked_item_item_id: takes no locks.
+        """
+        rows = base.fetch_all_tuples(
+            f"SELECT i.id, i.like_count, "
+            "(SELECT COUNT(*) FROM liked_item li WHERE li.item_id = i.id) "
+            f"FROM {ItemRepository.TABLE} i WHERE i.id > %s ORDER BY i.id LIMIT %s",
+            (after_id, limit),
+        )
+        return [(int(r[0]), int(r[1]), int(r[2])) for r in rows]
+
+    @staticmethod
+    def add_like_counts(deltas: Dict[int, int]) -> int:
+        """
+        Apply signed like_count changes, item id -> delta, without reading liked_item.
+        One CASE UPDATE per chunk in ascending id order (the lock order checkout uses);
+        returns rows changed.
+        """
+        ids = sorted(iid for iid, delta in deltas.items() if delta)
+        changed = 0
+        for chunk in base.chunked(ids):
+            changed += base.execute_count(
+                f"UPDATE {ItemRepository.TABLE} SET like_count = GREATEST(like_count + CASE id "
+                + " ".join(["WHEN %s THEN %s"] * len(chunk))
+                + f" END, 0) WHERE id IN ({', '.join(['%s'] * len(chunk))})",
+                (*(v for iid in chunk for v in (iid, deltas[iid])), *chunk),
+                cache_keys=chunk,
+            )
+        return changed
+
+    @staticmethod
+    def recount_like_counts(ids: Iterable[int]) -> int:
+        """Set like_count from liked_item for `ids` (grouped UPDATE per chunk); returns rows changed."""
+        changed = 0
+        for chunk in base.chunked(sorted(set(ids))):
+            changed += base.execute_count(
+                f"UPDATE {ItemRepository.TABLE} SET like_count = "
+                "(SELECT COUNT(*) FROM liked_item li WHERE li.item_id = item.id) "
+                f"WHERE id IN ({', '.join(['%s'] * len(chunk))})",
+                tuple(chunk),
+                cache_keys=chunk,
+            )
+        return changed
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from app.config.settings import settings
+from . import base
+from .item_repository import ItemRepository
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class LikeCounterBuffer:
+    """
+    Write-behind maintenance of item.like_count.
+    - Committed likes/unlikes only add a signed delta per item in memory
+      instead of updating the item row, so likes of a hot item no longer
+      serialize on its exclusive row lock. The liked_item INSERT's foreign
+      key check still takes a shared lock on the item row, so a like still
+      briefly waits for, and blocks, a checkout updating the same item.
+    - A background thread flushes every `flush_interval_s`, or as soon as
+      `max_pending` items are pending. A flush applies the summed deltas as
+      `like_count = like_count + delta` in one CASE UPDATE per chunk, so its
+      cost and item lock time do not depend on how many likes an item has.
+      A failed flush puts its deltas back for the next one; deltas lost with
+      a crashed process are repaired by python -m app.jobs.like_counts.
+    - Lag (time from the first unflushed change to its flush) is reported
+      by stats().
+    """
+
+    def __init__(self, flush_interval_s: Optional[float] = None, max_pending: Optional[int] = None) -> None:
+        self.flush_interval_s = flush_interval_s or settings.like_flush_interval_s
+        self.max_pending = max_pending or settings.like_flush_max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # item id -> summed like_count delta since the last flush
+        self._deltas: Dict[int, int] = {}
+        # item id -> monotonic time it first became pending since the last flush
+        self._since: Dict[int, float] = {}
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"flushes": 0, "items_flushed": 0, "failed_flushes": 0, "last_lag_ms": 0.0, "max_lag_ms": 0.0}
+
+    def mark(self, item_ids: Iterable[int], delta: int) -> None:
+        """Record a committed like (+1) or unlike (-1) of each of `item_ids`."""
+        now = time.monotonic()
+        with self._lock:
+            for iid in item_ids:
+                self._deltas[iid] = self._deltas.get(iid, 0) + delta
+                self._since.setdefault(iid, now)
+            full = len(self._deltas) >= self.max_pending
+        self.start()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Apply every pending delta now; returns the number of items flushed."""
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._deltas = self._deltas, {}
+                since, self._since = self._since, {}
+            if not deltas:
+                return 0
+            try:
+                base.run_transaction(lambda: ItemRepository.add_like_counts(deltas))
+            except Exception:
+                with self._lock:
+                    for iid, delta in deltas.items():
+                        self._deltas[iid] = self._deltas.get(iid, 0) + delta
+                        self._since[iid] = min(since[iid], self._since.get(iid, since[iid]))
+                    self._stats["failed_flushes"] += 1
+                logger.exception("like_count flush of %d item(s) failed; will retry", len(deltas))
+                return 0
+            lag_ms = (time.monotonic() - min(since.values())) * 1000
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["items_flushed"] += len(deltas)
+                self._stats["last_lag_ms"] = lag_ms
+                self._stats["max_lag_ms"] = max(self._stats["max_lag_ms"], lag_ms)
+            if lag_ms > self.flush_interval_s * 1000 * 5:
+                logger.warning("like_count flush lag %.0f ms for %d item(s)", lag_ms, len(deltas))
+            return len(deltas)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            oldest = min(self._since.values(), default=None)
+            return {
+                **self._stats,
+                "pending": len(self._deltas),
+                "pending_lag_ms": (time.monotonic() - oldest) * 1000 if oldest is not None else 0.0,
+            }
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="like-counter-flush", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the flusher after a final flush."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        self._stopped.set()
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            self.flush()
+
+
+_buffer: Optional[LikeCounterBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_like_buffer() -> Optional[LikeCounterBuffer]:
+    """Process-wide buffer (created when settings.like_count_write_behind is on), else None."""
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None and settings.like_count_write_behind:
+            _buffer = LikeCounterBuffer()
+        return _buffer
+
+
+def set_like_buffer(buffer: Optional[LikeCounterBuffer]) -> None:
+    """Swap the process-wide buffer (None re-creates it from settings on next use)."""
+    global _buffer
+    with _buffer_lock:
+        _buffer = buffer
@@ -1,31 +1,110 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Iterable, List, Sequence, Set
 
 from . import base
+from .like_counter_buffer import get_like_buffer
 
 
 class LikedItemRepository:
     TABLE = "liked_item"
 
     @staticmethod
-    def like(customer_id: str, item_id: int) -> None:
-        # Insert ignore-like behavior by checking uniqueness before insert
-        sql = (
-            f"INSERT INTO {LikedItemRepository.TABLE} (customer_id, item_id) "
-            "VALUES (%s, %s)"
-        )
-        base.execute(sql, (customer_id, item_id))
-        # Update item's like_count
-        base.execute("UPDATE item SET like_count = like_count + 1 WHERE id=%s", (item_id,))
+    def like(customer_id: str, item_id: int) -> bool:
+        return bool(LikedItemRepository.like_many(customer_id, [item_id]))
 
     @staticmethod
-    def unlike(customer_id: str, item_id: int) -> None:
-        base.execute(
-            f"DELETE FROM {LikedItemRepository.TABLE} WHERE customer_id=%s AND item_id=%s",
-            (customer_id, item_id),
-        )
-        base.execute("UPDATE item SET like_count = GREATEST(like_count - 1, 0) WHERE id=%s", (item_id,))
+    def unlike(customer_id: str, item_id: int) -> bool:
+        return bool(LikedItemRepository.unlike_many(customer_id, [item_id]))
+
+    @staticmethod
+    def like_many(customer_id: str, item_ids: Iterable[int]) -> List[int]:
+        """
+        Like every existing item in `item_ids` not already liked, in one transaction.
+        Returns the ids that were newly liked; like_count is bumped for exactly those
+        (or, with the write-behind buffer, shortly after commit).
+        """
+        ids = sorted(set(item_ids))
+        if not ids:
+            return []
+        buffer = get_like_buffer()
+
+        def work() -> List[int]:
+            existing, liked = LikedItemRepository._lock_items(customer_id, ids, lock_items=buffer is None)
+            added = [iid for iid in ids if iid in existing and iid not in liked]
+            for chunk in base.chunked(added):
+                # No IGNORE: these rows are locked and known missing, so a failure here
+                # (e.g. an unknown customer_id) must abort rather than leave like_count
+                # bumped for rows that were never written
+                base.execute(
+                    f"INSERT INTO {LikedItemRepository.TABLE} (customer_id, item_id) VALUES "
+                    + ", ".join(["(%s, %s)"] * len(chunk)),
+                    tuple(v for iid in chunk for v in (customer_id, iid)),
+                )
+                if buffer is None:
+                    base.execute_count(
+                        f"UPDATE item SET like_count = like_count + 1 WHERE id IN ({', '.join(['%s'] * len(chunk))})",
+                        tuple(chunk),
+                        cache_keys=chunk,
+                    )
+            if buffer is not None and added:
+                base.after_commit(lambda: buffer.mark(added, 1))
+            return added
+
+        return base.run_transaction(work)
+
+    @staticmethod
+    def unlike_many(customer_id: str, item_ids: Iterable[int]) -> List[int]:
+        """Remove the customer's likes for `item_ids` in one transaction; returns the ids actually unliked."""
+        ids = sorted(set(item_ids))
+        if not ids:
+            return []
+
+        buffer = get_like_buffer()
+
+        def work() -> List[int]:
+            _, liked = LikedItemRepository._lock_items(customer_id, ids, lock_items=buffer is None)
+            removed = [iid for iid in ids if iid in liked]
+            for chunk in base.chunked(removed):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                base.execute(
+                    f"DELETE FROM {LikedItemRepository.TABLE} WHERE customer_id=%s AND item_id IN ({placeholders})",
+                    (customer_id, *chunk),
+                )
+                if buffer is None:
+                    base.execute_count(
+                        f"UPDATE item SET like_count = GREATEST(like_count - 1, 0) WHERE id IN ({placeholders})",
+                        tuple(chunk),
+                        cache_keys=chunk,
+                    )
+            if buffer is not None and removed:
+                base.after_commit(lambda: buffer.mark(removed, -1))
+            return removed
+
+        return base.run_transaction(work)
+
+    @staticmethod
+    def _lock_items(customer_id: str, ids: Sequence[int], lock_items: bool = True) -> tuple[Set[int], Set[int]]:
+        """
+        Lock the customer's like rows for `ids` and, with `lock_items`, the item
+        rows too (ascending id, so concurrent batches cannot deadlock each other).
+        Returns (existing item ids, ids the customer already likes).
+        """
+        existing: Set[int] = set()
+        liked: Set[int] = set()
+        lock = "FOR UPDATE" if lock_items else "FOR UPDATE OF li"
+        for chunk in base.chunked(ids):
+            rows = base.fetch_all_tuples(
+                f"SELECT i.id, li.item_id FROM item i "
+                f"LEFT JOIN {LikedItemRepository.TABLE} li ON li.item_id = i.id AND li.customer_id = %s "
+                f"WHERE i.id IN ({', '.join(['%s'] * len(chunk))}) ORDER BY i.id {lock}",
+                (customer_id, *chunk),
+            )
+            for item_id, liked_id in rows:
+                existing.add(item_id)
+                if liked_id is not None:
+                    liked.add(item_id)
+        return existing, liked
 
     @staticmethod
     def list_by_customer(customer_id: str) -> list[dict]:
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import MISSING, fields
+from typing import Any, Callable, Dict, Generic, Optional, Sequence, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def columns_sql(columns: Sequence[str], alias: str | None = None) -> str:
+    """Render an explicit select list so tuple positions match the mapper."""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(f"{prefix}{c}" for c in columns)
+
+
+class RowMapper(Generic[T]):
+    """
+    Precompiled positional row -> model constructor for tuple cursor rows.
+    - `columns` is the select-list order; each position maps to the same-named field.
+    - `converters` optionally coerce raw DB values (e.g. str -> enum) per column.
+    - trusted=True (default) builds instances without running __post_init__,
+      skipping validation the schema already enforces (NOT NULL, enums, types).
+      Use trusted=False for data that did not come from the database.
+    Fields of the model that are not selected get their dataclass defaults.
+    """
+
+    def __init__(
+        self,
+        model: Type[T],
+        columns: Sequence[str],
+        converters: Optional[Dict[str, Callable[[Any], Any]]] = None,
+        trusted: bool = True,
+    ) -> None:
+        self.model = model
+        self.columns = tuple(columns)
+        self.trusted = trusted
+        self._converters = dict(converters or {})
+        self._build = self._compile()
+
+    def __call__(self, row: Sequence[Any]) -> T:
+        return self._build(row)
+
+    def map_all(self, rows: Sequence[Sequence[Any]]) -> list[T]:
+        build = self._build
+        return [build(r) for r in rows]
+
+    def _compile(self) -> Callable[[Sequence[Any]], T]:
+        model_fields = {f.name: f for f in fields(self.model)}
+        unknown = [c for c in self.columns if c not in model_fields]
+        if unknown:
+            raise ValueError(f"{self.model.__name__} has no field(s): {', '.join(unknown)}")
+
+        env: Dict[str, Any] = {"_cls": self.model, "_new": object.__new__}
+        positions = {c: i for i, c in enumerate(self.columns)}
+
+        def value_expr(name: str) -> str:
+            if name in positions:
+                expr = f"row[{positions[name]}]"
+                if name in self._converters:
+                    env[f"_c_{name}"] = self._converters[name]
+                    expr = f"_c_{name}({expr})"
+                return expr
+            f = model_fields[name]
+            if f.default is not MISSING:
+                env[f"_d_{name}"] = f.default
+                return f"_d_{name}"
+            if f.default_factory is not MISSING:  # type: ignore[misc]
+                env[f"_f_{name}"] = f.default_factory  # type: ignore[misc]
+                return f"_f_{name}()"
+            raise ValueError(f"{self.model.__name__}.{name} is not selected and has no default")
+
+        names = list(model_fields)
+        if self.trusted:
+            body = ["    obj = _new(_cls)"]
+            body += [f"    obj.{n} = {value_expr(n)}" for n in names]
+            body.append("    return obj")
+        else:
+            args = ", ".join(f"{n}={value_expr(n)}" for n in names)
+            body = [f"    return _cls({args})"]
+        src = "def _build(row):\n" + "\n".join(body) + "\n"
+        exec(compile(src, f"<RowMapper {self.model.__name__}>", "exec"), env)
+        return env["_build"]
@@ -4,19 +4,13 @@ from typing import List
 
 from app.models import Message, MessageRole
 from . import base
+from .conversation_repository import ConversationRepository
+from .mapping import RowMapper, columns_sql
 
 
-def _row_to_message(row: dict) -> Message:
-    return Message(
-        id=row["id"],
-        conversation_id=row["conversation_id"],
-        user_id=row["user_id"],
-        role=MessageRole(row["role"]),
-        content=row["content"],
-        created_at=row["created_at"],
-        updated_at=row["updated_at"],
-        is_read=bool(row["is_read"]),
-    )
+MESSAGE_COLUMNS = ("id", "conversation_id", "user_id", "role", "content", "created_at", "updated_at", "is_read")
+_MESSAGE_SELECT = columns_sql(MESSAGE_COLUMNS)
+_row_to_message = RowMapper(Message, MESSAGE_COLUMNS, converters={"role": MessageRole, "is_read": bool})
 
 
 class MessageRepository:
@@ -25,45 +19,62 @@ class MessageRepository:
     @staticmethod
     def create(conversation_id: int, user_id: str, role: MessageRole, content: str) -> int:
         sql = f"INSERT INTO {MessageRepository.TABLE} (conversation_id, user_id, role, content) VALUES (%s, %s, %s, %s)"
-        new_id = base.execute(sql, (conversation_id, user_id, role.value, content))
+        # The message and the conversation's inbox counters commit together
+        with base.unit_of_work():
+            ConversationRepository.record_message(conversation_id, 1 if role == MessageRole.CUSTOMER else 0)
+            new_id = base.execute(sql, (conversation_id, user_id, role.value, content))
         return int(new_id)
 
     @staticmethod
     def list_by_conversation(conversation_id: int) -> List[Message]:
-        rows = base.fetch_all(
-            f"SELECT * FROM {MessageRepository.TABLE} WHERE conversation_id=%s ORDER BY created_at ASC",
+        rows = base.fetch_all_tuples(
+            f"SELECT {_MESSAGE_SELECT} FROM {MessageRepository.TABLE} WHERE conversation_id=%s ORDER BY created_at ASC",
             (conversation_id,),
         )
-        return [_row_to_message(r) for r in rows]
+        return _row_to_message.map_all(rows)
 
     @staticmethod
-    def list_since(conversation_id: int, after_id: int) -> List[Message]:
-        rows = base.fetch_all(
-            f"SELECT * FROM {MessageRepository.TABLE} WHERE conversation_id=%s AND id>%s ORDER BY id ASC",
-            (conversation_id, after_id),
-        )
-        return [_row_to_message(r) for r in rows]
+    def list_recent(conversation_id: int, limit: int, before_id: int | None = None) -> List[Message]:
+        """
+        Newest `limit` messages (older than `before_id` when given), returned oldest first.
+        Served from idx_message_conversation_id, whose entries are ordered by (conversation_id, id).
+        """
+        if before_id is None:
+            rows = base.fetch_all_tuples(
+                f"SELECT {_MESSAGE_SELECT} FROM {MessageRepository.TABLE} "
+                "WHERE conversation_id=%s ORDER BY id DESC LIMIT %s",
+                (conversation_id, limit),
+            )
+        else:
+            rows = base.fetch_all_tuples(
+                f"SELECT {_MESSAGE_SELECT} FROM {MessageRepository.TABLE} "
+                "WHERE conversation_id=%s AND id<%s ORDER BY id DESC LIMIT %s",
+                (conversation_id, before_id, limit),
+            )
+        rows.reverse()
+        return _row_to_message.map_all(rows)
 
     @staticmethod
-    def list_unread_conversation_summaries() -> list[dict]:
-        sql = (
-            "SELECT DISTINCT c.id AS id, c.subject AS subject "
-            "FROM message m "
-            "JOIN conversation c ON c.id = m.conversation_id "
-            "WHERE m.role=%s AND m.is_read=FALSE "
-            "ORDER BY c.id ASC"
+    def list_since(conversation_id: int, after_id: int) -> List[Message]:
+        rows = base.fetch_all_tuples(
+            f"SELECT {_MESSAGE_SELECT} FROM {MessageRepository.TABLE} WHERE conversation_id=%s AND id>%s ORDER BY id ASC",
+            (conversation_id, after_id),
         )
-        rows = base.fetch_all(sql, (MessageRole.CUSTOMER.value,))
-        return rows
+        return _row_to_message.map_all(rows)
 
     @staticmethod
     def mark_conversation_read(conversation_id: int) -> None:
-        sql = (
-            f"UPDATE {MessageRepository.TABLE} "
-            "SET is_read=TRUE "
-            "WHERE conversation_id=%s AND role=%s AND is_read=FALSE"
-        )
-        base.execute(sql, (conversation_id, MessageRole.CUSTOMER.value))
+        # The counter check makes the common nothing-unread case a single-row
+        # update; otherwise the scan is bounded by idx_message_conversation_unread.
+        with base.unit_of_work():
+            if not ConversationRepository.clear_unread(conversation_id):
+                return
+            base.execute(
+                f"UPDATE {MessageRepository.TABLE} "
+                "SET is_read=TRUE "
+                "WHERE conversation_id=%s AND is_read=FALSE AND role=%s",
+                (conversation_id, MessageRole.CUSTOMER.value),
+            )
 
     @staticmethod
     def update_partial(msg_id: int, data: dict) -> None:
@@ -1,29 +1,16 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from app.models import OrderStatus, PaymentMethod
+from app.models import Item, OrderStatus, PaymentMethod
 from app.models.order import Order
 from . import base
-from app.repositories.item_repository import ItemRepository
 
 
 class OrderRepository:
     ORDER_TABLE = "`order`"
     ITEM_TABLE = "order_item"
-    _has_item_name_col: Optional[bool] = None
-
-    @staticmethod
-    def _ensure_item_name_probe() -> bool:
-        if OrderRepository._has_item_name_col is None:
-            row = base.fetch_one(
-                "SELECT 1 FROM INFORMATION_SCHEMA.COLUMNS "
-                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'order_item' "
-                "AND COLUMN_NAME = 'item_name' LIMIT 1"
-            )
-            OrderRepository._has_item_name_col = bool(row)
-        return bool(OrderRepository._has_item_name_col)
 
     @staticmethod
     def create_order(
@@ -55,39 +42,46 @@ class OrderRepository:
         return int(order_id)
 
     @staticmethod
-    def add_order_item(order_id: int, item_id: int, quantity: int, unit_price: Decimal) -> int:
-        sub_total = (unit_price * Decimal(quantity)).quantize(Decimal("0.01"))
-        if OrderRepository._ensure_item_name_probe():
-            # Include item_name column if it exists
-            item = ItemRepository.get_by_id(item_id)
-            item_name = item.name if item and item.name else None
-            sql = (
-                f"INSERT INTO {OrderRepository.ITEM_TABLE} "
-                "(order_id, item_id, quantity, unit_price, sub_total, item_name) "
-                "VALUES (%s, %s, %s, %s, %s, %s)"
-            )
-            return int(base.execute(sql, (order_id, item_id, quantity, str(unit_price), str(sub_total), item_name)))
-        else:
-            sql = (
-                f"INSERT INTO {OrderRepository.ITEM_TABLE} "
-                "(order_id, item_id, quantity, unit_price, sub_total) "
-                "VALUES (%s, %s, %s, %s, %s)"
+    def add_order_items(order_id: int, lines: Sequence[Tuple[Item, int]]) -> None:
+        """
+        Insert all order lines in one multi-row INSERT, snapshotting name,
+        description, category and price from the (already locked) items.
+        """
+        if not lines:
+            return
+        sql = (
+            f"INSERT INTO {OrderRepository.ITEM_TABLE} "
+            "(order_id, item_id, item_name, item_description, item_category, quantity, unit_price, sub_total) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        params = []
+        for item, qty in lines:
+            sub_total = (item.price * Decimal(qty)).quantize(Decimal("0.01"))
+            params.append(
+                (order_id, item.id, item.name, item.description, item.category, qty, str(item.price), str(sub_total))
             )
-            return int(base.execute(sql, (order_id, item_id, quantity, str(unit_price), str(sub_total))))
+        base.executemany(sql, params)
 
     @staticmethod
-    def update_total(order_id: int) -> None:
+    def decrement_stock(quantities: Dict[int, int]) -> int:
+        """
+        Decrement stock for several items in one statement; returns the number of
+        rows updated. A row whose stock is below the requested quantity is left
+        untouched, so callers compare the result with len(quantities).
+        """
+        if not quantities:
+            return 0
+        ids = sorted(quantities)
+        case = " ".join(["WHEN %s THEN %s"] * len(ids))
+        case_params: list = []
+        for iid in ids:
+            case_params.extend((iid, quantities[iid]))
+        placeholders = ", ".join(["%s"] * len(ids))
         sql = (
-            f"UPDATE {OrderRepository.ORDER_TABLE} o "
-            "JOIN (SELECT order_id, SUM(sub_total) AS total FROM order_item WHERE order_id=%s) s "
-            "ON s.order_id = o.id "
-            "SET o.total_amount = s.total"
+            f"UPDATE item SET stock_quantity = stock_quantity - (CASE id {case} END) "
+            f"WHERE id IN ({placeholders}) AND stock_quantity >= (CASE id {case} END)"
         )
-        base.execute(sql, (order_id,))
-
-    @staticmethod
-    def decrement_stock_for_item(item_id: int, quantity: int = 1) -> None:
-        base.execute("UPDATE item SET stock_quantity = stock_quantity - %s WHERE id=%s AND stock_quantity >= %s", (quantity, item_id, quantity))
+        return base.execute_count(sql, case_params + ids + case_params, cache_keys=ids)
 
     @staticmethod
     def list_orders_by_customer(customer_id: str) -> list[dict]:
@@ -1,38 +1,29 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence, Set
 
-from app.models import Report, ReportType, ReportContent
+from app.models import Report, ReportContent, ReportRun, ReportRunStatus, ReportType
 from . import base
+from .mapping import RowMapper, columns_sql
 
 
-def _row_to_report(row: dict) -> Report:
-    return Report(
-        id=row["id"],
-        type=ReportType(row["type"]),
-        start_date=row["start_date"],
-        end_date=row["end_date"],
-        created_date=row["created_date"],
-        sold_quantity=row["sold_quantity"],
-        total_revenue=row["total_revenue"],
-    )
-
-
-def _row_to_content(row: dict) -> ReportContent:
-    return ReportContent(
-        id=row["id"],
-        report_id=row["report_id"],
-        item_id=row["item_id"],
-        item_sold=row["item_sold"],
-        unit_price=row["unit_price"],
-        sub_total=row["sub_total"],
-    )
+REPORT_COLUMNS = ("id", "type", "start_date", "end_date", "created_date", "sold_quantity", "total_revenue")
+CONTENT_COLUMNS = ("id", "report_id", "item_id", "item_sold", "unit_price", "sub_total")
+RUN_COLUMNS = ("id", "type", "start_date", "end_date", "status", "report_id", "started_at", "duration_ms", "error")
+_REPORT_SELECT = columns_sql(REPORT_COLUMNS)
+_CONTENT_SELECT = columns_sql(CONTENT_COLUMNS)
+_row_to_report = RowMapper(Report, REPORT_COLUMNS, converters={"type": ReportType})
+_row_to_content = RowMapper(ReportContent, CONTENT_COLUMNS)
+_row_to_run = RowMapper(ReportRun, RUN_COLUMNS, converters={"type": ReportType, "status": ReportRunStatus})
 
 
 class ReportRepository:
     REPORT_TABLE = "report"
     CONTENT_TABLE = "report_content"
+    RUN_TABLE = "report_run"
+    # Rows per multi-row INSERT in add_contents; keeps each packet well under max_allowed_packet
+    CONTENT_INSERT_CHUNK = 500
 
     @staticmethod
     def create_report(report: Report) -> int:
@@ -67,51 +58,125 @@ class ReportRepository:
         )
         return int(new_id)
 
+    @staticmethod
+    def add_contents(contents: Sequence[ReportContent], chunk_size: int | None = None) -> None:
+        """
+        Insert many contents with chunked multi-row INSERTs in one transaction.
+        Generated ids are not read back; the contents keep id=None.
+        """
+        sql = (
+            f"INSERT INTO {ReportRepository.CONTENT_TABLE} "
+            "(report_id, item_id, item_sold, unit_price, sub_total) "
+            "VALUES (%s, %s, %s, %s, %s)"
+        )
+        with base.unit_of_work():
+            for chunk in base.chunked(contents, chunk_size or ReportRepository.CONTENT_INSERT_CHUNK):
+                base.executemany(
+                    sql,
+                    [(c.report_id, c.item_id, c.item_sold, c.unit_price, c.sub_total) for c in chunk],
+                )
+
     @staticmethod
     def get_report(report_id: int) -> Optional[Report]:
-        row = base.fetch_one(f"SELECT * FROM {ReportRepository.REPORT_TABLE} WHERE id=%s", (report_id,))
+        row = base.fetch_one_tuple(f"SELECT {_REPORT_SELECT} FROM {ReportRepository.REPORT_TABLE} WHERE id=%s", (report_id,))
         return _row_to_report(row) if row else None
 
     @staticmethod
     def get_contents(report_id: int) -> List[ReportContent]:
-        rows = base.fetch_all(
-            f"SELECT * FROM {ReportRepository.CONTENT_TABLE} WHERE report_id=%s ORDER BY id ASC",
+        rows = base.fetch_all_tuples(
+            f"SELECT {_CONTENT_SELECT} FROM {ReportRepository.CONTENT_TABLE} WHERE report_id=%s ORDER BY id ASC",
             (report_id,),
         )
-        return [_row_to_content(r) for r in rows]
+        return _row_to_content.map_all(rows)
 
     @staticmethod
     def list_reports_by_type_between(rtype: ReportType, start: datetime, end: datetime) -> List[Report]:
-        rows = base.fetch_all(
-            f"SELECT * FROM {ReportRepository.REPORT_TABLE} "
+        rows = base.fetch_all_tuples(
+            f"SELECT {_REPORT_SELECT} FROM {ReportRepository.REPORT_TABLE} "
             "WHERE type=%s AND start_date>= %s AND end_date<= %s ORDER BY created_date DESC",
             (rtype.value, start, end),
         )
-        return [_row_to_report(r) for r in rows]
+        return _row_to_report.map_all(rows)
 
     @staticmethod
-    def aggregate_sales(start: datetime, end: datetime) -> list[dict]:
-        # Aggregate item sales from order/order_item between dates
+    def find_latest_by_start(rtype: ReportType, start: datetime) -> Optional[Report]:
+        row = base.fetch_one_tuple(
+            f"SELECT {_REPORT_SELECT} FROM {ReportRepository.REPORT_TABLE} "
+            "WHERE type=%s AND start_date=%s ORDER BY created_date DESC, id DESC LIMIT 1",
+            (rtype.value, start),
+        )
+        return _row_to_report(row) if row else None
+
+    @staticmethod
+    def existing_starts(rtype: ReportType, start: datetime, end: datetime) -> Set[datetime]:
+        """Start dates of `rtype` reports starting within [start, end] (windows are keyed by type + start)."""
+        rows = base.fetch_all_tuples(
+            f"SELECT DISTINCT start_date FROM {ReportRepository.REPORT_TABLE} "
+            "WHERE type=%s AND start_date BETWEEN %s AND %s",
+            (rtype.value, start, end),
+        )
+        return {r[0] for r in rows}
+
+    @staticmethod
+    def add_run(run: ReportRun) -> int:
         sql = (
-            "SELECT oi.item_id AS item_id, "
-            "SUM(oi.quantity) AS item_sold, "
-            "ROUND(SUM(oi.sub_total) / NULLIF(SUM(oi.quantity),0), 2) AS unit_price, "
-            "SUM(oi.sub_total) AS sub_total "
-            "FROM order_item oi "
-            "JOIN `order` o ON o.id = oi.order_id "
-            "WHERE o.order_date BETWEEN %s AND %s "
-            "GROUP BY oi.item_id "
-            "ORDER BY oi.item_id"
+            f"INSERT INTO {ReportRepository.RUN_TABLE} "
+            "(type, start_date, end_date, status, report_id, started_at, duration_ms, error) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"
+        )
+        new_id = base.execute(
+            sql,
+            (
+                run.type.value,
+                run.start_date,
+                run.end_date,
+                run.status.value,
+                run.report_id,
+                run.started_at,
+                run.duration_ms,
+                run.error,
+            ),
+        )
+        return int(new_id)
+
+    @staticmethod
+    def list_runs(limit: int = 50) -> List[ReportRun]:
+        rows = base.fetch_all_tuples(
+            f"SELECT {columns_sql(RUN_COLUMNS)} FROM {ReportRepository.RUN_TABLE} "
+            "ORDER BY started_at DESC, id DESC LIMIT %s",
+            (limit,),
         )
-        return base.fetch_all(sql, (start, end))
+        return _row_to_run.map_all(rows)
+
+    _AGGREGATE_SALES_SQL = (
+        "SELECT oi.item_id AS item_id, "
+        "SUM(oi.quantity) AS item_sold, "
+        "ROUND(SUM(oi.sub_total) / NULLIF(SUM(oi.quantity),0), 2) AS unit_price, "
+        "SUM(oi.sub_total) AS sub_total "
+        "FROM order_item oi "
+        "JOIN `order` o ON o.id = oi.order_id "
+        "WHERE o.order_date BETWEEN %s AND %s AND oi.item_id IS NOT NULL "
+        "GROUP BY oi.item_id "
+        "ORDER BY oi.item_id"
+    )
+
+    @staticmethod
+    def aggregate_sales(start: datetime, end: datetime) -> list[dict]:
+        # Aggregate item sales from order/order_item between dates
+        return base.fetch_all(ReportRepository._AGGREGATE_SALES_SQL, (start, end))
+
+    @staticmethod
+    def iter_aggregate_sales(start: datetime, end: datetime, fetch_size: int | None = None) -> Iterator[dict]:
+        """Streaming variant of aggregate_sales (one row per item sold in the window)."""
+        return base.fetch_iter(ReportRepository._AGGREGATE_SALES_SQL, (start, end), fetch_size)
 
     @staticmethod
     def list_all_reports() -> List[Report]:
-        rows = base.fetch_all(
-            f"SELECT * FROM {ReportRepository.REPORT_TABLE} ORDER BY created_date DESC",
+        rows = base.fetch_all_tuples(
+            f"SELECT {_REPORT_SELECT} FROM {ReportRepository.REPORT_TABLE} ORDER BY created_date DESC",
             (),
         )
-        return [_row_to_report(r) for r in rows]
+        return _row_to_report.map_all(rows)
 
     @staticmethod
     def get_detailed_contents(report_id: int) -> list[dict]:
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Set
+
+from . import base
+
+
+class SalesRollupRepository:
+    """
+    Per-day, per-item sales totals (daily_item_sales) used by reports instead
+    of rescanning order_item JOIN `order`.
+    - record_order() adds one order's lines to its day at checkout time.
+    - rebuild_days() recomputes whole days from the order tables and marks them
+      built in daily_item_sales_day; only built days are trusted by reports.
+    """
+
+    TABLE = "daily_item_sales"
+    DAY_TABLE = "daily_item_sales_day"
+
+    # daily_item_sales has no FK to item, so rows of deleted items linger; the
+    # join drops them, as order_item.item_id IS NOT NULL does on the raw path
+    _AGGREGATE_SQL = (
+        "SELECT d.item_id AS item_id, "
+        "SUM(d.item_sold) AS item_sold, "
+        "ROUND(SUM(d.revenue) / NULLIF(SUM(d.item_sold),0), 2) AS unit_price, "
+        "SUM(d.revenue) AS sub_total "
+        "FROM daily_item_sales d "
+        "JOIN item i ON i.id = d.item_id "
+        "WHERE d.sale_date BETWEEN %s AND %s "
+        "GROUP BY d.item_id "
+        "ORDER BY d.item_id"
+    )
+
+    @staticmethod
+    def record_order(order_id: int) -> None:
+        # Derived table so ON DUPLICATE KEY UPDATE may reference the grouped values
+        sql = (
+            f"INSERT INTO {SalesRollupRepository.TABLE} (sale_date, item_id, item_sold, revenue) "
+            "SELECT * FROM ("
+            "SELECT DATE(o.order_date) AS sale_date, oi.item_id AS item_id, "
+            "SUM(oi.quantity) AS item_sold, SUM(oi.sub_total) AS revenue "
+            "FROM order_item oi JOIN `order` o ON o.id = oi.order_id "
+            "WHERE oi.order_id = %s AND oi.item_id IS NOT NULL "
+            "GROUP BY DATE(o.order_date), oi.item_id"
+            ") AS s "
+            f"ON DUPLICATE KEY UPDATE item_sold = {SalesRollupRepository.TABLE}.item_sold + s.item_sold, "
+            f"revenue = {SalesRollupRepository.TABLE}.revenue + s.revenue"
+        )
+        base.execute(sql, (order_id,))
+
+    @staticmethod
+    def rebuild_days(start_day: date, end_day: date) -> None:
+        """
+        Recompute [start_day, end_day] from the order tables in one transaction,
+        retried if it deadlocks with a concurrent checkout's record_order.
+        """
+        lower = datetime.combine(start_day, datetime.min.time())
+        upper = datetime.combine(end_day + timedelta(days=1), datetime.min.time())
+        days = [(start_day + timedelta(days=n),) for n in range((end_day - start_day).days + 1)]
+
+        def work() -> None:
+            base.execute(
+                f"DELETE FROM {SalesRollupRepository.TABLE} WHERE sale_date BETWEEN %s AND %s",
+                (start_day, end_day),
+            )
+            base.execute(
+                f"INSERT INTO {SalesRollupRepository.TABLE} (sale_date, item_id, item_sold, revenue) "
+                "SELECT DATE(o.order_date), oi.item_id, SUM(oi.quantity), SUM(oi.sub_total) "
+                "FROM `order` o JOIN order_item oi ON oi.order_id = o.id "
+                "WHERE o.order_date >= %s AND o.order_date < %s AND oi.item_id IS NOT NULL "
+                "GROUP BY DATE(o.order_date), oi.item_id",
+                (lower, upper),
+            )
+            base.executemany(
+                f"INSERT INTO {SalesRollupRepository.DAY_TABLE} (sale_date) VALUES (%s) "
+                "ON DUPLICATE KEY UPDATE built_at = CURRENT_TIMESTAMP",
+                days,
+            )
+
+        base.run_transaction(work)
+
+    @staticmethod
+    def built_days(start_day: date, end_day: date) -> Set[date]:
+        rows = base.fetch_all_tuples(
+            f"SELECT sale_date FROM {SalesRollupRepository.DAY_TABLE} WHERE sale_date BETWEEN %s AND %s",
+            (start_day, end_day),
+        )
+        return {r[0] for r in rows}
+
+    @staticmethod
+    def missing_days(start_day: date, end_day: date) -> List[date]:
+        built = SalesRollupRepository.built_days(start_day, end_day)
+        span = (end_day - start_day).days + 1
+        return [d for d in (start_day + timedelta(days=n) for n in range(span)) if d not in built]
+
+    @staticmethod
+    def aggregate_sales(start_day: date, end_day: date) -> list[dict]:
+        """Same row shape as ReportRepository.aggregate_sales, summed over whole days."""
+        return base.fetch_all(SalesRollupRepository._AGGREGATE_SQL, (start_day, end_day))
+
+    @staticmethod
+    def iter_aggregate_sales(start_day: date, end_day: date, fetch_size: int | None = None) -> Iterator[dict]:
+        return base.fetch_iter(SalesRollupRepository._AGGREGATE_SQL, (start_day, end_day), fetch_size)
+
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from . import base
+from .account_repository import AccountRepository
+from .conversation_repository import ConversationRepository
+from .item_repository import ItemRepository
+from .liked_item_repository import LikedItemRepository
+from .message_repository import MessageRepository
+from .order_repository import OrderRepository
+from .report_repository import ReportRepository
+from .sales_rollup_repository import SalesRollupRepository
+
+
+class UnitOfWork:
+    """Repository-aware session over base.unit_of_work.
+
+    Every repository call made while the session is open shares one pooled
+    connection and is committed once on exit (or rolled back on error).
+    Usage:
+        with UnitOfWork() as uow:
+            order_id = uow.orders.create_order(...)
+            uow.orders.add_order_items(order_id, lines)
+    """
+
+    accounts = AccountRepository
+    conversations = ConversationRepository
+    items = ItemRepository
+    liked_items = LikedItemRepository
+    messages = MessageRepository
+    orders = OrderRepository
+    reports = ReportRepository
+    sales_rollup = SalesRollupRepository
+
+    def __init__(self) -> None:
+        self._ctx: Optional[Any] = None
+
+    def __enter__(self) -> "UnitOfWork":
+        self._ctx = base.unit_of_work()
+        self._ctx.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        ctx, self._ctx = self._ctx, None
+        return bool(ctx.__exit__(exc_type, exc, tb))
@@ -1,20 +1,40 @@
 from __future__ import annotations
 
-from typing import Optional
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
 
 from app.models import Account
 from app.repositories.account_repository import AccountRepository
 
 
+@dataclass
+class CustomerSearchPage:
+    accounts: List[Account]  # best match first
+    page: int  # zero-based
+    has_more: bool
+
+
 class AccountService:
     @staticmethod
     def get_by_id(acc_id: str) -> Optional[Account]:
         return AccountRepository.get_by_id(acc_id)
 
+    @staticmethod
+    def get_by_ids(acc_ids: Iterable[str]) -> Dict[str, Account]:
+        return AccountRepository.get_by_ids(acc_ids)
+
     @staticmethod
     def get_by_name_or_id(first_name: str | None, last_name: str | None, id: str | None) -> Optional[list[Account]]:
         return AccountRepository.get_by_name_or_id(first_name, last_name, id)
 
+    @staticmethod
+    def search_customers(query: str, page: int = 0, page_size: int = 20) -> CustomerSearchPage:
+        """Ranked prefix search by name, user name, email or id, one page at a time."""
+        if page < 0 or page_size <= 0:
+            raise ValueError("page must be >= 0 and page_size positive")
+        accounts = AccountRepository.search_customers(query, page_size + 1, page * page_size)
+        return CustomerSearchPage(accounts[:page_size], page, len(accounts) > page_size)
+
     @staticmethod
     def get_by_username(user_name: str) -> Optional[Account]:
         return AccountRepository.get_by_username(user_name)
@@ -36,6 +56,10 @@ class AccountService:
     def update_account(account: Account) -> None:
         AccountRepository.update(account)
 
+    @staticmethod
+    def replace_password_hash(acc_id: str, old_hash: str, new_hash: str, salt: bytes) -> bool:
+        return AccountRepository.replace_password_hash(acc_id, old_hash, new_hash, salt)
+
     @staticmethod
     def update_partial(acc_id: str, data: dict | None = None, **kwargs) -> None:
         """Update only the provided non-None fields for an account record.
@@ -1,14 +1,18 @@
 from dataclasses import dataclass
 from typing import Optional
+import logging
 import random
 import string
 from datetime import datetime, timedelta
 
 from app.models import Account, Role
 from app.services.account_service import AccountService
-from app.utils.hashing import make_password_hash, verify_password
+from app.services.password_hasher import get_hasher
 from app.utils.validators import ensure_email, ensure_length_max, ensure_non_empty
 
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
 
 @dataclass
 class AuthResult:
@@ -53,7 +57,7 @@ class AuthService:
         if AccountService.get_by_email(email):
             return AuthResult(False, "Email already exists")
 
-        pwd_hash, salt = make_password_hash(password)
+        pwd_hash, salt = get_hasher().hash(password)
 
         account = Account(
             user_name=user_name,
@@ -74,8 +78,11 @@ class AuthService:
         account = AccountService.get_by_username(user_name)
         if account is None:
             return AuthResult(False, "Invalid username or password")
-        if not verify_password(password, account.salt, account.password):
+        hasher = get_hasher()
+        if not hasher.verify(password, account.salt, account.password):
             return AuthResult(False, "Invalid username or password")
+        if hasher.needs_rehash(account.password):
+            self._rehash(account, password)
         return AuthResult(True, "Login successful", account)
     
     # Password reset initiation: send token to email
@@ -118,7 +125,7 @@ class AuthService:
         if account is None:
             return AuthResult(False, "Email not found")
         
-        pwd_hash, salt = make_password_hash(new_password)
+        pwd_hash, salt = get_hasher().hash(new_password)
         account.password = pwd_hash
         account.salt = salt
         # Clear reset token and expiration
@@ -128,6 +135,16 @@ class AuthService:
         
         return AuthResult(True, "Password has been reset successfully")
     
+    # Upgrade a legacy / lower-cost hash while the plain password is at hand
+    def _rehash(self, account: Account, password: str) -> None:
+        try:
+            new_hash, salt = get_hasher().hash(password)
+            if AccountService.replace_password_hash(account.id, account.password, new_hash, salt):
+                account.password, account.salt = new_hash, salt
+        except Exception:
+            # The old hash still verifies; try again at the next login
+            logger.exception("password rehash failed for account %s", account.id)
+
     # Helper methods for token generation and expiration
     def _generate_reset_token(self) -> str:
         return ''.join(random.choices(string.digits, k=6))  # 6-digit numeric token
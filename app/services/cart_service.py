@@ -33,8 +33,9 @@ class CartService:
     def list_items(self, customer_id: str) -> List[Tuple[Item, int]]:
         bag = self._cart.get(customer_id, {})
         out: List[Tuple[Item, int]] = []
+        found = self._items.get_by_ids(bag.keys())
         for iid, qty in sorted(bag.items()):
-            it = self._items.get_by_id(iid)
+            it = found.get(iid)
             if it:
                 out.append((it, qty))
         return out
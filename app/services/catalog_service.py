@@ -1,11 +1,70 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import re
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
 from typing import Optional, List
 
 from app.models import Item
 from app.repositories.item_repository import ItemRepository
 
 
+@dataclass
+class CatalogPage:
+    items: List[Item]
+    # Opaque token for the following page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class CatalogFilter:
+    category: Optional[str] = None  # None = any, "" = uncategorized
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    sort: str = "popular"  # popular | price_asc | price_desc
+
+
+@dataclass
+class CategoryFacet:
+    category: Optional[str]  # None for uncategorized items
+    count: int
+
+
+@dataclass
+class SearchPage:
+    items: List[Item]  # best match first
+    page: int  # 1-based
+    has_more: bool
+
+
+# Characters with meaning in MySQL BOOLEAN MODE full-text queries
+_FT_OPERATORS = re.compile(r'[+\-<>()~*"@]+')
+
+
+def _boolean_query(text: str) -> str:
+    """'red shoe' -> '+red* +shoe*': every word required, each as a prefix."""
+    words = _FT_OPERATORS.sub(" ", text).split()
+    return " ".join(f"+{w}*" for w in words)
+
+
+def _encode_browse_cursor(sort: str, key, item_id: int) -> str:
+    raw = f"{sort}:{key}:{item_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_browse_cursor(token: str, sort: str) -> tuple:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        token_sort, key, item_id = base64.urlsafe_b64decode(padded).decode("ascii").split(":")
+        if token_sort != sort:
+            raise ValueError
+        return (int(key) if sort == "popular" else Decimal(key)), int(item_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, InvalidOperation):
+        raise ValueError("invalid page token")
+
+
 class CatalogService:
     """High-level API for catalog/browsing functionality.
 
@@ -21,4 +80,60 @@ class CatalogService:
         offset = (page - 1) * page_size
         return ItemRepository.list_all_popular_first(limit=page_size, offset=offset)
 
-    # Future helpers: search_by_name, filter_by_category, etc.
+    SORTS = ("popular", "price_asc", "price_desc")
+
+    def browse(
+        self, filters: Optional[CatalogFilter] = None, cursor: Optional[str] = None, page_size: int = 25
+    ) -> CatalogPage:
+        """Filtered, sorted, cursor-paginated listing; each page is one index range scan."""
+        filters = filters or CatalogFilter()
+        if filters.sort not in self.SORTS:
+            raise ValueError(f"sort must be one of {', '.join(self.SORTS)}")
+        if (
+            filters.min_price is not None
+            and filters.max_price is not None
+            and filters.min_price > filters.max_price
+        ):
+            raise ValueError("min_price must not exceed max_price")
+        if page_size <= 0:
+            page_size = 25
+        after = _decode_browse_cursor(cursor, filters.sort) if cursor else None
+        items = ItemRepository.browse(
+            page_size + 1, filters.category, filters.min_price, filters.max_price, filters.sort, after
+        )
+        next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            next_cursor = _encode_browse_cursor(filters.sort, *ItemRepository.browse_key(items[-1], filters.sort))
+        return CatalogPage(items=items, next_cursor=next_cursor)
+
+    def category_facets(
+        self, min_price: Optional[Decimal] = None, max_price: Optional[Decimal] = None
+    ) -> List[CategoryFacet]:
+        """Item count per category (within the price range), most items first."""
+        counts = ItemRepository.category_counts(min_price, max_price)
+        facets = [CategoryFacet(category, count) for category, count in counts]
+        facets.sort(key=lambda f: (-f.count, f.category or ""))
+        return facets
+
+    # Results scanned per query; ranking blends relevance with popularity
+    SEARCH_CANDIDATES = 1000
+    SEARCH_LIKE_WEIGHT = 0.1
+
+    def search(self, query: str, page: int = 1, page_size: int = 25) -> SearchPage:
+        """Ranked full-text search over item name, description and category."""
+        if page <= 0:
+            page = 1
+        if page_size <= 0:
+            page_size = 25
+        boolean_query = _boolean_query(query)
+        if not boolean_query:
+            return SearchPage(items=[], page=page, has_more=False)
+        items = ItemRepository.search(
+            boolean_query,
+            limit=page_size + 1,
+            offset=(page - 1) * page_size,
+            candidates=self.SEARCH_CANDIDATES,
+            like_weight=self.SEARCH_LIKE_WEIGHT,
+        )
+        return SearchPage(items=items[:page_size], page=page, has_more=len(items) > page_size)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from app.models import Conversation
 from app.repositories.conversation_repository import ConversationRepository
@@ -13,11 +14,22 @@ class ConversationService:
     def get(self, conversation_id: int) -> Optional[Conversation]:
         return ConversationRepository.get(conversation_id)
 
+    def get_by_ids(self, conversation_ids: Iterable[int]) -> Dict[int, Conversation]:
+        return ConversationRepository.get_by_ids(conversation_ids)
+
     def list_by_customer(self, customer_id: str) -> List[Conversation]:
         return ConversationRepository.list_by_customer(customer_id)
 
     def list_all(self) -> List[Conversation]:
         return ConversationRepository.list_all()
 
+    def iter_all(self) -> Iterator[Conversation]:
+        return ConversationRepository.iter_all()
+
+    def list_inbox(
+        self, limit: int, unread_only: bool = False, before: Optional[Tuple[datetime, int]] = None
+    ) -> List[Conversation]:
+        return ConversationRepository.list_inbox(limit, unread_only, before)
+
     def update_partial(self, conv_id: int, data: dict) -> None:
         ConversationRepository.update_partial(conv_id, data)
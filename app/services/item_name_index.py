@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.repositories.item_repository import ItemRepository
+from app.utils.trigram import TrigramIndex
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+class ItemNameIndex:
+    """
+    Typo-tolerant "did you mean" lookup over item names.
+    - Names live in an in-memory TrigramIndex loaded on first use by
+      streaming (id, name) from the item table; the index is capped at
+      `max_items` names so its memory stays bounded on large catalogs.
+    - It subscribes to ItemRepository's committed creates, renames and
+      deletes. Changes that commit while the table is being streamed are
+      queued and replayed once the load finishes; each carries the item's
+      final name, so replaying one the scan already saw is harmless.
+    - Queries run under a lock held only for the lookup, never for the load.
+    """
+
+    def __init__(self, max_items: Optional[int] = None, min_similarity: Optional[float] = None) -> None:
+        self.max_items = max_items or settings.item_fuzzy_max_items
+        self.min_similarity = settings.item_fuzzy_min_similarity if min_similarity is None else min_similarity
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._index: Optional[TrigramIndex] = None
+        # Changes committed during a load; None when no load is running
+        self._pending: Optional[List[Tuple[int, Optional[str]]]] = None
+        self._stats: Dict[str, float] = {"items": 0, "skipped": 0, "build_ms": 0.0, "memory_bytes": 0}
+
+    def suggest(self, query: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """(item id, similarity) of the closest names, most similar first."""
+        self.ensure_loaded()
+        with self._lock:
+            return self._index.search(query, limit=limit, min_similarity=self.min_similarity)
+
+    def ensure_loaded(self) -> None:
+        if self._index is not None:
+            return
+        with self._build_lock:
+            if self._index is None:
+                self.reload()
+
+    def reload(self) -> None:
+        """(Re)load every item name from the database."""
+        started = time.perf_counter()
+        ItemRepository.add_name_listener(self._on_name_change)
+        with self._lock:
+            self._pending = []
+        index = TrigramIndex(max_docs=self.max_items)
+        skipped = 0
+        try:
+            for item_id, name in ItemRepository.iter_names():
+                if name and not index.add(item_id, name) and len(index) >= self.max_items:
+                    skipped += 1
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            for item_id, name in self._pending:
+                self._apply(index, item_id, name)
+            self._pending = None
+            self._index = index
+            self._stats = {
+                "items": len(index),
+                "skipped": skipped,
+                "build_ms": (time.perf_counter() - started) * 1000,
+                "memory_bytes": index.memory_bytes(),
+            }
+        if skipped:
+            logger.warning("item name index full at %d names; %d item(s) not indexed", self.max_items, skipped)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        ItemRepository.remove_name_listener(self._on_name_change)
+        with self._lock:
+            self._index = None
+
+    def _on_name_change(self, item_id: int, name: Optional[str]) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((item_id, name))
+            elif self._index is not None:
+                self._apply(self._index, item_id, name)
+
+    @staticmethod
+    def _apply(index: TrigramIndex, item_id: int, name: Optional[str]) -> None:
+        if name:
+            index.add(item_id, name)
+        else:
+            index.remove(item_id)
+
+
+_index: Optional[ItemNameIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_item_index() -> ItemNameIndex:
+    """Process-wide index configured from settings, loaded on first lookup."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ItemNameIndex()
+        return _index
+
+
+def set_item_index(index: Optional[ItemNameIndex]) -> None:
+    """Swap the process-wide index (None re-creates it from settings on next use)."""
+    global _index
+    with _index_lock:
+        old, _index = _index, index
+    if old is not None and old is not index:
+        old.close()
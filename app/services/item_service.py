@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 from app.models.item import Item
 from app.repositories.item_repository import ItemRepository
+from app.services.item_name_index import get_item_index
 from app.utils.validators import *
 
 
@@ -12,6 +13,12 @@ class ItemResult:
     message: str
     item: Optional[Item] = None
 
+
+@dataclass
+class ItemSuggestion:
+    item: Item
+    similarity: float  # 0-1 trigram similarity of the name to the query
+
 class ItemService:
     def create_item(
         self,
@@ -25,8 +32,8 @@ class ItemService:
         name = ensure_length_max(ensure_non_empty(name, "name"), "name", 100)
         if description:
             description = ensure_length_max(description, "description", 250)
-        if category:
-            category = ensure_length_max(category, "category", 100)
+        # blank is stored as NULL so catalog filters see one "uncategorized"
+        category = ensure_length_max(category, "category", 100) if category and category.strip() else None
 
         if price <= 0.00:
             return ItemResult(False, "Price is invalid")
@@ -54,5 +61,14 @@ class ItemService:
     def get_by_id(self, id: int) -> Optional[Item]:
         return ItemRepository.get_by_id(id)
 
+    def get_by_ids(self, ids: Iterable[int]) -> Dict[int, Item]:
+        return ItemRepository.get_by_ids(ids)
+
+    def did_you_mean(self, query: str, limit: int = 5) -> List[ItemSuggestion]:
+        """Items whose names are closest to a possibly misspelled `query`, best first."""
+        matches = get_item_index().suggest(query, limit=limit)
+        items = ItemRepository.get_by_ids(iid for iid, _ in matches)
+        return [ItemSuggestion(items[iid], score) for iid, score in matches if iid in items]
+
     def list_items(self) -> Optional[list[Item]]:
         return ItemRepository.list()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.repositories import base
+from app.repositories.item_repository import ItemRepository
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+@dataclass
+class ReconcileSummary:
+    scanned: int = 0
+    drifted: int = 0
+    # drift that changed between the two checks (likes still being flushed)
+    unsettled: int = 0
+    fixed: int = 0
+    # (item id, stored like_count, actual likes), capped at sample_size
+    samples: List[Tuple[int, int, int]] = field(default_factory=list)
+    duration_ms: int = 0
+
+
+class LikeCountReconciler:
+    """
+    Repairs item.like_count drift against liked_item.
+    - Walks item ids in keyset chunks of `chunk_size`, reading stored and
+      actual counts without locks.
+    - Drifted items of a chunk are recounted by one grouped UPDATE in its own
+      short transaction (skipped with dry_run); the value is recomputed at
+      write time, so likes committed since the read are not lost.
+    - With write-behind like counts (settings.like_count_write_behind),
+      stored counts trail liked_item by the deltas consoles have not flushed
+      yet, and recounting such an item would make the later flush add them
+      twice. A drifted chunk is therefore read again `settle_s` later (by
+      default twice the flush interval) and only items whose drift is
+      unchanged are fixed; the rest are counted as unsettled and left to
+      the next run.
+    - Sleeps `pause_s` between chunks so the scan does not crowd out
+      production traffic on large tables.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        pause_s: float = 0.05,
+        sample_size: int = 20,
+        settle_s: Optional[float] = None,
+    ) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if settle_s is None:
+            settle_s = 2 * settings.like_flush_interval_s if settings.like_count_write_behind else 0.0
+        self.chunk_size = chunk_size
+        self.pause_s = max(0.0, pause_s)
+        self.sample_size = sample_size
+        self.settle_s = max(0.0, settle_s)
+
+    def run(
+        self,
+        dry_run: bool = False,
+        start_after: int = 0,
+        limit: Optional[int] = None,
+        on_chunk: Optional[Callable[[int, ReconcileSummary], None]] = None,
+    ) -> ReconcileSummary:
+        """Reconcile items with id > start_after (at most `limit` of them); on_chunk gets (last id, summary)."""
+        started = time.perf_counter()
+        summary = ReconcileSummary()
+        after = start_after
+        while limit is None or summary.scanned < limit:
+            size = self.chunk_size if limit is None else min(self.chunk_size, limit - summary.scanned)
+            rows = ItemRepository.like_counts_after(after, size)
+            if not rows:
+                break
+            drift = [r for r in rows if r[1] != r[2]]
+            if drift and self.settle_s:
+                settled = self._settled(after, size, drift)
+                summary.unsettled += len(drift) - len(settled)
+                drift = settled
+            last_id = rows[-1][0]
+            summary.scanned += len(rows)
+            summary.drifted += len(drift)
+            room = self.sample_size - len(summary.samples)
+            if room > 0:
+                summary.samples.extend(drift[:room])
+            if drift and not dry_run:
+                summary.fixed += base.run_transaction(
+                    lambda: ItemRepository.recount_like_counts(iid for iid, _, _ in drift)
+                )
+            after = last_id
+            if on_chunk is not None:
+                on_chunk(last_id, summary)
+            if len(rows) < size:
+                break
+            if self.pause_s:
+                time.sleep(self.pause_s)
+        summary.duration_ms = int((time.perf_counter() - started) * 1000)
+        logger.info(
+            "like_count reconcile%s: %d scanned, %d drifted, %d unsettled, %d fixed in %d ms",
+            " (dry run)" if dry_run else "", summary.scanned, summary.drifted, summary.unsettled, summary.fixed,
+            summary.duration_ms,
+        )
+        return summary
+
+    def _settled(self, after: int, size: int, drift: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+        """The drifted rows whose drift is unchanged when the chunk is read again `settle_s` later."""
+        time.sleep(self.settle_s)
+        again = {iid: stored - actual for iid, stored, actual in ItemRepository.like_counts_after(after, size)}
+        return [r for r in drift if again.get(r[0]) == r[1] - r[2]]
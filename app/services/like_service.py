@@ -7,25 +7,12 @@ from app.repositories.liked_item_repository import LikedItemRepository
 
 class LikeService:
     def like_items(self, customer_id: str, item_ids: Iterable[int]) -> int:
-        count = 0
-        for iid in item_ids:
-            try:
-                LikedItemRepository.like(customer_id, iid)
-                count += 1
-            except Exception:
-                # ignore duplicates or failures per-id
-                pass
-        return count
+        """Like several items at once; unknown or already-liked ids are skipped."""
+        return len(LikedItemRepository.like_many(customer_id, item_ids))
 
     def unlike_items(self, customer_id: str, item_ids: Iterable[int]) -> int:
-        count = 0
-        for iid in item_ids:
-            try:
-                LikedItemRepository.unlike(customer_id, iid)
-                count += 1
-            except Exception:
-                pass
-        return count
+        """Remove several likes at once; ids that were not liked are skipped."""
+        return len(LikedItemRepository.unlike_many(customer_id, item_ids))
 
     def list_liked(self, customer_id: str) -> list[dict]:
         return LikedItemRepository.list_by_customer(customer_id)
@@ -3,22 +3,34 @@ from __future__ import annotations
 from typing import List
 
 from app.models import Message, MessageRole
+from app.repositories import base
 from app.repositories.message_repository import MessageRepository
+from app.services.notification_bus import MessageEvent, Subscription, get_bus
 
 
 class MessageService:
     def create(self, conversation_id: int, user_id: str, role: MessageRole, content: str) -> int:
-        return MessageRepository.create(conversation_id, user_id, role, content)
+        msg_id = MessageRepository.create(conversation_id, user_id, role, content)
+        event = MessageEvent(conversation_id, msg_id, user_id, role, content)
+        # Subscribers must never see a message that is later rolled back
+        base.after_commit(lambda: get_bus().publish(event))
+        return msg_id
+
+    def subscribe(self, conversation_id: int) -> Subscription:
+        return get_bus().subscribe(conversation_id)
+
+    def push_is_distributed(self) -> bool:
+        return get_bus().distributed
 
     def list_by_conversation(self, conversation_id: int) -> List[Message]:
         return MessageRepository.list_by_conversation(conversation_id)
 
+    def list_recent(self, conversation_id: int, limit: int, before_id: int | None = None) -> List[Message]:
+        return MessageRepository.list_recent(conversation_id, limit, before_id)
+
     def list_since(self, conversation_id: int, after_id: int) -> List[Message]:
         return MessageRepository.list_since(conversation_id, after_id)
 
-    def list_unread_conversation_summaries(self) -> list[dict]:
-        return MessageRepository.list_unread_conversation_summaries()
-
     def mark_conversation_read(self, conversation_id: int) -> None:
         MessageRepository.mark_conversation_read(conversation_id)
 
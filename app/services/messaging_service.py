@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from app.models import Conversation, Message, MessageRole
+from app.repositories.unit_of_work import UnitOfWork
 from app.services.conversation_service import ConversationService
 from app.services.message_service import MessageService
+from app.services.notification_bus import Subscription
 from app.utils.validators import ensure_length_max, ensure_non_empty
 
 
@@ -15,13 +18,27 @@ class ConversationSummary:
     subject: str
 
 
+@dataclass
+class InboxPage:
+    conversations: List[Conversation]  # most recent activity first
+    next_cursor: Optional[Tuple[datetime, int]]  # pass back for the next page; None when exhausted
+
+
+@dataclass
+class MessagePage:
+    messages: List[Message]  # oldest first
+    older_cursor: Optional[int]  # pass as before_id for the previous page; None when exhausted
+
+
 class MessagingService:
     def start_conversation(self, customer_id: str, subject: str, content: str) -> int:
         customer_id = ensure_non_empty(customer_id, "customer_id")
         subject = ensure_length_max(ensure_non_empty(subject, "subject"), "subject", 200)
         content = ensure_non_empty(content, "content")
-        conv_id = ConversationService().create(customer_id, subject)
-        MessageService().create(conv_id, customer_id, MessageRole.CUSTOMER, content)
+        # Conversation and its opening message are created together
+        with UnitOfWork():
+            conv_id = ConversationService().create(customer_id, subject)
+            MessageService().create(conv_id, customer_id, MessageRole.CUSTOMER, content)
         return conv_id
 
     def customer_reply(self, customer_id: str, conversation_id: int, content: str) -> None:
@@ -47,8 +64,18 @@ class MessagingService:
     def get_conversation_messages(self, conversation_id: int) -> List[Message]:
         return MessageService().list_by_conversation(conversation_id)
 
-    def list_unread_conversation_summaries(self) -> list[dict]:
-        return MessageService().list_unread_conversation_summaries()
+    def list_inbox(
+        self, page_size: int = 20, unread_only: bool = False, cursor: Optional[Tuple[datetime, int]] = None
+    ) -> InboxPage:
+        """Staff inbox page ordered by last message, read from the conversation counters."""
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        convs = ConversationService().list_inbox(page_size + 1, unread_only, cursor)
+        if len(convs) <= page_size:
+            return InboxPage(convs, None)
+        convs = convs[:page_size]
+        last = convs[-1]
+        return InboxPage(convs, (last.last_message_at, int(last.id or 0)))
 
     def mark_conversation_read(self, conversation_id: int) -> None:
         MessageService().mark_conversation_read(conversation_id)
@@ -57,10 +84,30 @@ class MessagingService:
         return ConversationService().get(conversation_id)
 
     def list_all_conversations(self) -> List[ConversationSummary]:
-        convs = ConversationService().list_all()
+        convs = ConversationService().iter_all()
         return [ConversationSummary(id=int(c.id or 0), subject=c.subject) for c in convs]
 
+    def get_message_page(
+        self, conversation_id: int, page_size: int = 50, before_id: Optional[int] = None
+    ) -> MessagePage:
+        """Newest `page_size` messages before `before_id` (or the latest), with a cursor for older ones."""
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        msgs = MessageService().list_recent(conversation_id, page_size + 1, before_id)
+        has_more = len(msgs) > page_size
+        if has_more:
+            msgs = msgs[1:]
+        return MessagePage(msgs, int(msgs[0].id or 0) if has_more else None)
+
     def get_since(self, conversation_id: int, after_id: int) -> List[Message]:
         return MessageService().list_since(conversation_id, after_id)
 
+    def subscribe(self, conversation_id: int) -> Subscription:
+        """New-message events for one conversation, pushed after each commit."""
+        return MessageService().subscribe(conversation_id)
+
+    def push_is_distributed(self) -> bool:
+        """Whether events from other console processes currently arrive by push."""
+        return MessageService().push_is_distributed()
+
 
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol, Set, Union
+
+from app.config.settings import settings
+from app.models import MessageRole
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+@dataclass(frozen=True)
+class MessageEvent:
+    """A committed message, carried in full so subscribers need no query to show it."""
+
+    conversation_id: int
+    message_id: int
+    user_id: str
+    role: MessageRole
+    content: str
+
+
+@dataclass(frozen=True)
+class MessageNotice:
+    """A message committed by another process; subscribers load it from the database."""
+
+    conversation_id: int
+    message_id: int
+
+
+class Resync:
+    """Delivered when events may have been missed (e.g. after a hub reconnect)."""
+
+
+RESYNC = Resync()
+
+Notification = Union[MessageEvent, MessageNotice, Resync]
+
+
+class Subscription:
+    """Per-conversation event queue; read with get(), release with close()."""
+
+    def __init__(self, bus: "InProcessBus", conversation_id: int) -> None:
+        self.conversation_id = conversation_id
+        self._bus = bus
+        self._queue: "queue.Queue[Notification]" = queue.Queue()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Notification]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._bus._unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class NotificationBus(Protocol):
+    @property
+    def distributed(self) -> bool:
+        """True while events published by other processes are delivered too."""
+        ...
+
+    def publish(self, event: MessageEvent) -> None: ...
+
+    def subscribe(self, conversation_id: int) -> Subscription: ...
+
+
+class InProcessBus:
+    """Fan-out of events to subscriptions in this process; publish never blocks."""
+
+    distributed = False
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subs: Dict[int, Set[Subscription]] = {}
+
+    def publish(self, event: Union[MessageEvent, MessageNotice]) -> None:
+        with self._lock:
+            targets = list(self._subs.get(event.conversation_id, ()))
+        for sub in targets:
+            sub._queue.put_nowait(event)
+
+    def subscribe(self, conversation_id: int) -> Subscription:
+        sub = Subscription(self, conversation_id)
+        with self._lock:
+            self._subs.setdefault(conversation_id, set()).add(sub)
+        return sub
+
+    def resync_all(self) -> None:
+        with self._lock:
+            targets = [s for subs in self._subs.values() for s in subs]
+        for sub in targets:
+            sub._queue.put_nowait(RESYNC)
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subs.get(sub.conversation_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.conversation_id]
+
+
+class _Hub:
+    """Localhost relay: every JSON line received from one client is sent to all others."""
+
+    def __init__(self, server: socket.socket) -> None:
+        self._server = server
+        self._lock = threading.Lock()
+        # client -> lock serializing writes to it, so relayed lines never interleave
+        self._clients: Dict[socket.socket, threading.Lock] = {}
+        threading.Thread(target=self._accept_loop, name="notify-hub", daemon=True).start()
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            with self._lock:
+                self._clients[conn] = threading.Lock()
+            threading.Thread(target=self._client_loop, args=(conn,), name="notify-hub-client", daemon=True).start()
+
+    def _client_loop(self, conn: socket.socket) -> None:
+        try:
+            for line in conn.makefile("rb"):
+                with self._lock:
+                    others = [(c, lock) for c, lock in self._clients.items() if c is not conn]
+                for other, send_lock in others:
+                    try:
+                        with send_lock:
+                            other.sendall(line)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._clients.pop(conn, None)
+            conn.close()
+
+
+class SocketBus:
+    """
+    Multi-process stand-in for a pub/sub broker over a localhost TCP hub.
+    - Events are delivered locally first, then relayed through the hub to
+      every other connected process as ids only (MessageNotice): the hub is
+      unauthenticated, so message content never leaves the process and a
+      forged notice can at most trigger a database read.
+    - The first process that cannot reach the hub starts it; if the hosting
+      process exits, the others reconnect and one of them takes over.
+    - `distributed` is False while disconnected; subscribers get RESYNC after
+      each (re)connect so they can fetch anything they missed.
+    """
+
+    RECONNECT_S = 1.0
+
+    def __init__(self, host: str, port: int) -> None:
+        self._addr = (host, port)
+        self._local = InProcessBus()
+        self._origin = uuid.uuid4().hex
+        self._send_lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._hub: Optional[_Hub] = None
+        self._connected = threading.Event()
+        threading.Thread(target=self._run, name="notify-bus", daemon=True).start()
+        # Give the first connection attempt a moment so a fresh chat starts in push mode
+        self._connected.wait(0.5)
+
+    @property
+    def distributed(self) -> bool:
+        return self._connected.is_set()
+
+    def publish(self, event: MessageEvent) -> None:
+        self._local.publish(event)
+        payload = {"o": self._origin, "c": event.conversation_id, "m": event.message_id}
+        line = (json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._send_lock:
+            sock = self._sock
+            if sock is None:
+                return
+            try:
+                sock.sendall(line)
+            except OSError:
+                pass  # reader loop notices the broken connection and reconnects
+
+    def subscribe(self, conversation_id: int) -> Subscription:
+        return self._local.subscribe(conversation_id)
+
+    def _run(self) -> None:
+        while True:
+            sock = self._connect()
+            if sock is None:
+                time.sleep(self.RECONNECT_S)
+                continue
+            with self._send_lock:
+                self._sock = sock
+            self._connected.set()
+            self._local.resync_all()
+            try:
+                for line in sock.makefile("rb"):
+                    self._deliver(line)
+            except OSError:
+                pass
+            finally:
+                self._connected.clear()
+                with self._send_lock:
+                    self._sock = None
+                sock.close()
+            logger.info("notification hub connection lost; reconnecting")
+
+    def _connect(self) -> Optional[socket.socket]:
+        sock = self._try_connect()
+        if sock is None and self._hub is None:
+            try:
+                server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                if os.name != "nt":  # on Windows SO_REUSEADDR would let a second hub bind the port
+                    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                server.bind(self._addr)
+                server.listen()
+                self._hub = _Hub(server)
+            except OSError:
+                return None  # another process won the race; connect on the next attempt
+            sock = self._try_connect()
+        return sock
+
+    def _try_connect(self) -> Optional[socket.socket]:
+        try:
+            sock = socket.create_connection(self._addr, timeout=0.5)
+        except OSError:
+            return None
+        sock.settimeout(None)  # reads block until the next event
+        return sock
+
+    def _deliver(self, line: bytes) -> None:
+        try:
+            data = json.loads(line)
+            if data.get("o") == self._origin:
+                return
+            event = MessageNotice(conversation_id=int(data["c"]), message_id=int(data["m"]))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("dropping malformed notification: %r", line[:200])
+            return
+        self._local.publish(event)
+
+
+_bus: Optional[NotificationBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_bus() -> NotificationBus:
+    """Process-wide bus chosen by settings.notify_bus, created on first use."""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            if settings.notify_bus == "socket":
+                host, _, port = settings.notify_hub.rpartition(":")
+                _bus = SocketBus(host or "127.0.0.1", int(port))
+            else:
+                _bus = InProcessBus()
+        return _bus
+
+
+def set_bus(bus: Optional[NotificationBus]) -> None:
+    """Swap the process-wide bus (None re-creates it from settings on next use)."""
+    global _bus
+    with _bus_lock:
+        _bus = bus
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from app.models import PaymentMethod, OrderStatus
+from app.models import Item, PaymentMethod, OrderStatus
 from app.models.order import Order
-from app.services.item_service import ItemService
+from app.repositories import base
 from app.repositories.order_repository import OrderRepository
+from app.repositories.unit_of_work import UnitOfWork
 
 class OrderService:
+    # Whole-checkout attempts when MySQL aborts the transaction (deadlock / lock wait)
+    CHECKOUT_ATTEMPTS = 3
+
     def place_order(
         self,
         customer_id: str,
@@ -18,42 +22,62 @@ class OrderService:
         to_address_line: Optional[str],
         payment_method: PaymentMethod,
     ) -> int:
-        # Calculate total and validate stock
-        total = Decimal("0.00")
-        selected: List[tuple[int, int, Decimal]] = []
-        item_svc = ItemService()
-        for iid, qty in item_id_to_quantity.items():
-            it = item_svc.get_by_id(iid)
-            if it is None:
-                raise ValueError(f"Item {iid} not found")
-            if qty <= 0:
-                continue
-            if it.stock_quantity < qty:
-                raise ValueError(f"Item {iid} does not have enough stock")
-            price = Decimal(str(it.price))
-            total += (price * Decimal(qty))
-            selected.append((iid, qty, price))
-        total = total.quantize(Decimal("0.01"))
-
-        # Create order
-        order_id = OrderRepository.create_order(
-            customer_id=customer_id,
-            to_state=to_state,
-            to_city=to_city,
-            to_address_line=to_address_line,
-            payment_method=payment_method,
-            status=OrderStatus.PROCESSING,
-            total_amount=total,
+        """
+        Checkout in a single transaction:
+        lock the items (ascending id, FOR UPDATE), validate stock, insert the
+        order with its in-process total, insert all lines in one statement, add
+        them to the daily sales rollup and decrement stock with a checked row count.
+        """
+        return base.run_transaction(
+            lambda: self._checkout(
+                customer_id, item_id_to_quantity, to_state, to_city, to_address_line, payment_method
+            ),
+            attempts=self.CHECKOUT_ATTEMPTS,
         )
 
-        # Add items and decrement stock
-        for iid, qty, price in selected:
-            OrderRepository.add_order_item(order_id, iid, qty, price)
-            OrderRepository.decrement_stock_for_item(iid, qty)
+    def _checkout(
+        self,
+        customer_id: str,
+        item_id_to_quantity: Dict[int, int],
+        to_state: Optional[str],
+        to_city: Optional[str],
+        to_address_line: Optional[str],
+        payment_method: PaymentMethod,
+    ) -> int:
+        with UnitOfWork() as uow:
+            locked = uow.items.lock_by_ids(item_id_to_quantity.keys())
+
+            # Calculate total and validate stock against the locked rows
+            total = Decimal("0.00")
+            lines: List[Tuple[Item, int]] = []
+            for iid, qty in item_id_to_quantity.items():
+                it = locked.get(iid)
+                if it is None:
+                    raise ValueError(f"Item {iid} not found")
+                if qty <= 0:
+                    continue
+                if it.stock_quantity < qty:
+                    raise ValueError(f"Item {iid} does not have enough stock")
+                total += (it.price * Decimal(qty)).quantize(Decimal("0.01"))
+                lines.append((it, qty))
+
+            order_id = uow.orders.create_order(
+                customer_id=customer_id,
+                to_state=to_state,
+                to_city=to_city,
+                to_address_line=to_address_line,
+                payment_method=payment_method,
+                status=OrderStatus.PROCESSING,
+                total_amount=total.quantize(Decimal("0.01")),
+            )
+            uow.orders.add_order_items(order_id, lines)
+            uow.sales_rollup.record_order(order_id)
 
-        # Ensure total matches
-        OrderRepository.update_total(order_id)
-        return order_id
+            updated = uow.orders.decrement_stock({int(it.id): qty for it, qty in lines})
+            if updated != len(lines):
+                # cannot happen while the rows are locked; abort rather than oversell
+                raise ValueError("Stock changed during checkout, please try again")
+            return order_id
 
     def list_orders(self, customer_id: str) -> list[dict]:
         return OrderRepository.list_orders_by_customer(customer_id)
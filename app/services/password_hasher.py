@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Tuple, TypeVar
+
+from app.config.settings import settings
+from app.utils import hashing
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    PBKDF2 hashing off the calling thread.
+    - With workers > 0, hashes run in a process pool (started on first use), so
+      a burst of logins uses every core instead of serializing on the GIL; the
+      caller only waits on a future.
+    - With workers == 0, hashes run inline (single-user console, tests).
+    - submit_* return concurrent futures; hash_async / verify_async await them
+      from asyncio code.
+    New hashes use `iterations`; needs_rehash() reports accounts stored at a
+    different cost so login can upgrade them.
+    """
+
+    def __init__(self, workers: Optional[int] = None, iterations: Optional[int] = None) -> None:
+        self.workers = max(0, settings.password_hash_workers if workers is None else workers)
+        self.iterations = iterations or settings.password_hash_iterations
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    # --- futures ----------------------------------------------------------
+
+    def submit_hash(self, password: str) -> "Future[Tuple[str, bytes]]":
+        """Future of (stored hash, salt) for a new password."""
+        return self._submit(hashing.make_password_hash, password, 16, self.iterations)
+
+    def submit_verify(self, password: str, salt: bytes, stored_hash: str) -> "Future[bool]":
+        return self._submit(hashing.verify_password, password, bytes(salt), stored_hash)
+
+    # --- blocking / asyncio wrappers -------------------------------------
+
+    def hash(self, password: str) -> Tuple[str, bytes]:
+        return self.submit_hash(password).result()
+
+    def verify(self, password: str, salt: bytes, stored_hash: str) -> bool:
+        return self.submit_verify(password, salt, stored_hash).result()
+
+    async def hash_async(self, password: str) -> Tuple[str, bytes]:
+        return await asyncio.wrap_future(self.submit_hash(password))
+
+    async def verify_async(self, password: str, salt: bytes, stored_hash: str) -> bool:
+        return await asyncio.wrap_future(self.submit_verify(password, salt, stored_hash))
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        return hashing.needs_rehash(stored_hash, self.iterations)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+    # --- internals --------------------------------------------------------
+
+    def _submit(self, fn: Callable[..., T], *args) -> "Future[T]":
+        if self.workers == 0:
+            return _run_inline(fn, *args)
+        try:
+            return self._get_pool().submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OS); start a fresh pool once
+            logger.warning("password hashing pool broken; restarting it")
+            self.shutdown(wait=False)
+            return self._get_pool().submit(fn, *args)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+
+def _run_inline(fn: Callable[..., T], *args) -> "Future[T]":
+    future: "Future[T]" = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_hasher() -> PasswordHasher:
+    """Process-wide hasher configured from settings, created on first use."""
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher()
+        return _hasher
+
+
+def set_hasher(hasher: Optional[PasswordHasher]) -> None:
+    """Swap the process-wide hasher (None re-creates it from settings on next use)."""
+    global _hasher
+    with _hasher_lock:
+        old, _hasher = _hasher, hasher
+    if old is not None and old is not hasher:
+        old.shutdown(wait=False)
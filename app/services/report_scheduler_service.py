@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from app.config.settings import settings
+from app.models import ReportRun, ReportRunStatus, ReportType
+from app.repositories.report_repository import ReportRepository
+from app.services.report_service import ReportService
+from app.services.sales_rollup_service import SalesRollupService
+from app.utils.scheduling import Scheduler, day_window, month_window, parse_time_of_day, week_start
+
+logger = logging.getLogger(__name__)
+# Silent unless the host configures logging (the console UI must not be interleaved)
+logger.addHandler(logging.NullHandler())
+
+
+@dataclass(frozen=True)
+class ReportWindow:
+    type: ReportType
+    start: datetime
+    end: datetime
+
+
+@dataclass
+class SchedulerRunSummary:
+    generated: List[ReportRun] = field(default_factory=list)
+    failed: List[ReportRun] = field(default_factory=list)
+    skipped: int = 0
+    duration_ms: int = 0
+
+
+class ReportSchedulerService:
+    """
+    Precomputes reports for complete windows so CEO views read stored rows.
+    - Daily job (at settings.report_time): missing daily reports for the last
+      `backfill_days` days and missing Monday-Sunday weekly reports in that range.
+    - Monthly job (1st of the month, same time): the previous month.
+    Windows that already have a report are skipped; the rest are generated in
+    parallel on `workers` threads, each recorded in report_run.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        backfill_days: Optional[int] = None,
+        report_service: Optional[ReportService] = None,
+        today: Callable[[], date] = date.today,
+    ) -> None:
+        self.workers = max(1, workers or settings.report_workers)
+        self.backfill_days = max(1, backfill_days or settings.report_backfill_days)
+        self._reports = report_service or ReportService()
+        self._rollups = SalesRollupService()
+        self._today = today
+        self._scheduler: Optional[Scheduler] = None
+
+    # --- window selection -------------------------------------------------
+
+    def daily_windows(self, today: date) -> List[ReportWindow]:
+        windows = [
+            ReportWindow(ReportType.DAILY, *day_window(today - timedelta(days=n)))
+            for n in range(self.backfill_days, 0, -1)
+        ]
+        this_week = week_start(today)
+        for n in range(max(1, self.backfill_days // 7), 0, -1):
+            first = this_week - timedelta(days=7 * n)
+            windows.append(
+                ReportWindow(ReportType.WEEKLY, day_window(first)[0], day_window(first + timedelta(days=6))[1])
+            )
+        return windows
+
+    def monthly_windows(self, today: date) -> List[ReportWindow]:
+        last_month = today.replace(day=1) - timedelta(days=1)
+        return [ReportWindow(ReportType.MONTHLY, *month_window(last_month.year, last_month.month))]
+
+    # --- execution --------------------------------------------------------
+
+    def run_daily(self) -> SchedulerRunSummary:
+        return self.run_windows(self.daily_windows(self._today()))
+
+    def run_monthly(self) -> SchedulerRunSummary:
+        return self.run_windows(self.monthly_windows(self._today()))
+
+    def run_windows(self, windows: List[ReportWindow]) -> SchedulerRunSummary:
+        started = time.perf_counter()
+        summary = SchedulerRunSummary()
+        todo = self._missing(windows)
+        summary.skipped = len(windows) - len(todo)
+        if todo:
+            # Build rollup days once up front so parallel workers only read them
+            self._rollups.ensure_built(
+                min(w.start for w in todo).date(), max(w.end for w in todo).date()
+            )
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(todo)), thread_name_prefix="report") as pool:
+                for run in pool.map(self._generate, todo):
+                    (summary.generated if run.status is ReportRunStatus.SUCCEEDED else summary.failed).append(run)
+        summary.duration_ms = int((time.perf_counter() - started) * 1000)
+        logger.info(
+            "report scheduler: %d generated, %d failed, %d skipped in %d ms",
+            len(summary.generated), len(summary.failed), summary.skipped, summary.duration_ms,
+        )
+        return summary
+
+    def _missing(self, windows: List[ReportWindow]) -> List[ReportWindow]:
+        by_type: Dict[ReportType, List[ReportWindow]] = {}
+        for w in windows:
+            by_type.setdefault(w.type, []).append(w)
+        todo: List[ReportWindow] = []
+        for rtype, group in by_type.items():
+            existing = ReportRepository.existing_starts(
+                rtype, min(w.start for w in group), max(w.start for w in group)
+            )
+            todo.extend(w for w in group if w.start not in existing)
+        return todo
+
+    def _generate(self, window: ReportWindow) -> ReportRun:
+        run = ReportRun(
+            type=window.type,
+            start_date=window.start,
+            end_date=window.end,
+            started_at=datetime.utcnow().replace(microsecond=0),  # same clock as report.created_date
+        )
+        began = time.perf_counter()
+        try:
+            generated = self._reports.generate_report(window.type, window.start, window.end)
+            run.report_id = generated.report.id
+        except Exception as exc:
+            logger.exception("report %s %s failed", window.type.value, window.start.date())
+            run.status = ReportRunStatus.FAILED
+            run.error = f"{type(exc).__name__}: {exc}"[:500]
+        run.duration_ms = int((time.perf_counter() - began) * 1000)
+        try:
+            run.id = ReportRepository.add_run(run)
+        except Exception:
+            logger.exception("could not record report run for %s %s", window.type.value, window.start.date())
+        return run
+
+    # --- background scheduling ---------------------------------------------
+
+    def start(self, catch_up: bool = True) -> None:
+        """Start the background scheduler; with `catch_up`, both jobs also run immediately."""
+        if self._scheduler is not None:
+            return
+        at = parse_time_of_day(settings.report_time)
+        scheduler = Scheduler()
+        scheduler.daily("daily-reports", self.run_daily, at, run_now=catch_up)
+        scheduler.monthly("monthly-reports", self.run_monthly, at, run_now=catch_up)
+        scheduler.start()
+        self._scheduler = scheduler
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        scheduler, self._scheduler = self._scheduler, None
+        if scheduler is not None:
+            scheduler.stop(timeout)
+
+    def list_runs(self, limit: int = 50) -> List[ReportRun]:
+        return ReportRepository.list_runs(limit)
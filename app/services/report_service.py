@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, date
+from datetime import datetime, time, timedelta, date
 from decimal import Decimal
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from app.models import Report, ReportContent, ReportType
 from app.repositories.report_repository import ReportRepository
+from app.repositories.sales_rollup_repository import SalesRollupRepository
+from app.repositories.unit_of_work import UnitOfWork
+from app.services.sales_rollup_service import SalesRollupService
 
 
 @dataclass
@@ -15,58 +18,74 @@ class GeneratedReport:
     contents: List[ReportContent]
 
 
+def _whole_days(start: datetime, end: datetime) -> Optional[tuple[date, date]]:
+    # [00:00 of day A, end of day B] windows can be served from the daily rollup
+    if start.time() == time.min and end.time() >= time(23, 59, 59) and end.date() >= start.date():
+        return start.date(), end.date()
+    return None
+
+
 class ReportService:
+    def __init__(self) -> None:
+        self._rollups = SalesRollupService()
+
+    def _aggregate(self, start: datetime, end: datetime) -> Iterator[dict]:
+        days = _whole_days(start, end)
+        if days is None:
+            return ReportRepository.iter_aggregate_sales(start, end)
+        return SalesRollupRepository.iter_aggregate_sales(*days)
+
     def generate_report(self, rtype: ReportType, start: datetime, end: datetime) -> GeneratedReport:
-        # Aggregate sales
-        rows = ReportRepository.aggregate_sales(start, end)
-        total_qty = 0
-        total_rev = Decimal("0.00")
-        # Defer ReportContent instantiation until report_id is known
-        pending_rows: List[dict] = []
-        for r in rows:
-            qty = int(r["item_sold"] or 0)
-            rev = Decimal(str(r["sub_total"] or "0.00"))
-            unit = Decimal(str(r["unit_price"] or "0.00"))
-            total_qty += qty
-            total_rev += rev
-            pending_rows.append(
-                {
-                    "item_id": int(r["item_id"]),
-                    "item_sold": qty,
-                    "unit_price": unit,
-                    "sub_total": rev,
-                }
-            )
-        total_rev = total_rev.quantize(Decimal("0.01"))
-
-        report = Report(
-            id=None,
-            type=rtype,
-            start_date=start,
-            end_date=end,
-            created_date=datetime.utcnow(),
-            sold_quantity=total_qty,
-            total_revenue=total_rev,
-        )
-        report_id = ReportRepository.create_report(report)
-
-        # Now create and persist contents with a valid report_id
-        for pr in pending_rows:
-            rc = ReportContent(
+        """
+        Aggregate the window and persist the header plus all contents in one
+        transaction (contents via chunked multi-row inserts). The result is
+        built in memory, not re-read; content ids are left as None.
+        Missing rollup days are built first, each chunk in its own transaction,
+        so the rebuild's locks on the order tables are not held for the report.
+        """
+        days = _whole_days(start, end)
+        if days is not None:
+            self._rollups.ensure_built(*days)
+        with UnitOfWork() as uow:
+            # Aggregate sales: whole-day windows from the daily rollup, others from the order tables
+            rows = self._aggregate(start, end)
+            total_qty = 0
+            total_rev = Decimal("0.00")
+            # (item_id, item_sold, unit_price, sub_total) until report_id is known
+            pending: List[tuple[int, int, Decimal, Decimal]] = []
+            for r in rows:
+                qty = int(r["item_sold"] or 0)
+                rev = Decimal(str(r["sub_total"] or "0.00"))
+                unit = Decimal(str(r["unit_price"] or "0.00"))
+                total_qty += qty
+                total_rev += rev
+                pending.append((int(r["item_id"]), qty, unit, rev))
+            total_rev = total_rev.quantize(Decimal("0.01"))
+
+            report = Report(
                 id=None,
-                report_id=report_id,
-                item_id=pr["item_id"],
-                item_sold=pr["item_sold"],
-                unit_price=pr["unit_price"],
-                sub_total=pr["sub_total"],
+                type=rtype,
+                start_date=start,
+                end_date=end,
+                # DATETIME column has second precision; match what a re-read would return
+                created_date=datetime.utcnow().replace(microsecond=0),
+                sold_quantity=total_qty,
+                total_revenue=total_rev,
             )
-            ReportRepository.add_content(rc)
-
-        # reload final report
-        final_report = ReportRepository.get_report(report_id)
-        final_contents = ReportRepository.get_contents(report_id)
-        assert final_report is not None
-        return GeneratedReport(final_report, final_contents)
+            report.id = uow.reports.create_report(report)
+            contents = [
+                ReportContent(
+                    id=None,
+                    report_id=report.id,
+                    item_id=item_id,
+                    item_sold=qty,
+                    unit_price=unit,
+                    sub_total=rev,
+                )
+                for item_id, qty, unit, rev in pending
+            ]
+            uow.reports.add_contents(contents)
+        return GeneratedReport(report, contents)
 
     def generate_daily(self, day: date) -> GeneratedReport:
         start = datetime.combine(day, datetime.min.time())
@@ -88,6 +107,13 @@ class ReportService:
             end = next_month - timedelta(microseconds=1)
         return self.generate_report(ReportType.MONTHLY, start, end)
 
+    def find_precomputed(self, rtype: ReportType, start: datetime) -> Optional[GeneratedReport]:
+        """Latest stored report of `rtype` starting at `start` (e.g. built by the scheduler)."""
+        rp = ReportRepository.find_latest_by_start(rtype, start)
+        if rp is None:
+            return None
+        return GeneratedReport(rp, ReportRepository.get_contents(rp.id))
+
     def get_report(self, report_id: int) -> Optional[GeneratedReport]:
         rp = ReportRepository.get_report(report_id)
         if rp is None:
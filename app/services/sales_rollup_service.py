@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, Tuple
+
+from app.repositories.sales_rollup_repository import SalesRollupRepository
+
+
+def _runs(days: Iterable[date]) -> Iterator[Tuple[date, date]]:
+    """Group days into (first, last) runs of consecutive dates."""
+    first = last = None
+    for d in sorted(days):
+        if last is not None and d == last + timedelta(days=1):
+            last = d
+            continue
+        if first is not None:
+            yield first, last
+        first = last = d
+    if first is not None:
+        yield first, last
+
+
+class SalesRollupService:
+    # Days rebuilt per transaction by catch_up; bounds lock time on the rollup table
+    CHUNK_DAYS = 31
+
+    def ensure_built(self, start_day: date, end_day: date) -> List[date]:
+        """Rebuild any day in the window that has never been built; returns those days."""
+        missing = SalesRollupRepository.missing_days(start_day, end_day)
+        for first, last in _runs(missing):
+            self._rebuild(first, last)
+        return missing
+
+    def catch_up(self, start_day: date, end_day: date, rebuild: bool = False) -> List[date]:
+        """
+        Catch-up job entry point: build missing days in [start_day, end_day],
+        or every day when `rebuild` (e.g. after orders were loaded or edited by hand).
+        """
+        if not rebuild:
+            return self.ensure_built(start_day, end_day)
+        self._rebuild(start_day, end_day)
+        span = (end_day - start_day).days + 1
+        return [start_day + timedelta(days=n) for n in range(span)]
+
+    def _rebuild(self, first: date, last: date) -> None:
+        cursor = first
+        while cursor <= last:
+            chunk_end = min(last, cursor + timedelta(days=self.CHUNK_DAYS - 1))
+            SalesRollupRepository.rebuild_days(cursor, chunk_end)
+            cursor = chunk_end + timedelta(days=1)
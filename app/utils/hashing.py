@@ -1,6 +1,18 @@
 import hashlib
+import hmac
+import logging
 import os
-from typing import Tuple
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Stored hashes are "<algorithm>$<iterations>$<hex digest>" so the cost can be
+# raised without invalidating existing accounts (they are rehashed on login).
+# Bare hex digests predate the format and used LEGACY_ITERATIONS.
+ALGORITHM = "pbkdf2_sha256"
+LEGACY_ITERATIONS = 100_000
+DEFAULT_ITERATIONS = LEGACY_ITERATIONS
 
 
 def generate_salt(length: int = 16) -> bytes:
@@ -9,29 +21,59 @@ def generate_salt(length: int = 16) -> bytes:
     return os.urandom(length)
 
 
-def hash_password(password: str, salt: bytes, iterations: int = 100_000) -> str:
+def hash_password(password: str, salt: bytes, iterations: int = DEFAULT_ITERATIONS) -> str:
     if not password:
         raise ValueError("password must be non-empty")
     if not isinstance(salt, (bytes, bytearray)):
         raise ValueError("salt must be bytes")
+    if iterations <= 0:
+        raise ValueError("iterations must be positive")
     dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations, dklen=32)
     return dk.hex()
 
 
-def make_password_hash(password: str, salt_length: int = 16) -> Tuple[str, bytes]:
+def encode_hash(iterations: int, digest_hex: str) -> str:
+    return f"{ALGORITHM}${iterations}${digest_hex}"
+
+
+def parse_hash(stored: str) -> Tuple[str, int, str]:
+    """Stored hash -> (algorithm, iterations, hex digest); bare hex is a legacy hash."""
+    if "$" not in stored:
+        return ALGORITHM, LEGACY_ITERATIONS, stored
+    try:
+        algorithm, iterations, digest_hex = stored.split("$")
+        return algorithm, int(iterations), digest_hex
+    except ValueError:
+        raise ValueError("malformed password hash") from None
+
+
+def make_password_hash(
+    password: str, salt_length: int = 16, iterations: Optional[int] = None
+) -> Tuple[str, bytes]:
+    iterations = iterations or DEFAULT_ITERATIONS
     salt = generate_salt(salt_length)
-    pwd_hash = hash_password(password, salt)
+    pwd_hash = encode_hash(iterations, hash_password(password, salt, iterations))
     return pwd_hash, salt
 
 
-def verify_password(password: str, salt: bytes, expected_hash_hex: str) -> bool:
-    actual = hash_password(password, salt)
-    # constant-time compare
-    if len(actual) != len(expected_hash_hex):
+def verify_password(password: str, salt: bytes, stored_hash: str) -> bool:
+    """False for a wrong password, and for a stored hash that cannot be checked (logged)."""
+    try:
+        algorithm, iterations, expected = parse_hash(stored_hash)
+        if algorithm != ALGORITHM:
+            raise ValueError(f"unsupported password hash algorithm: {algorithm}")
+        actual = hash_password(password, salt, iterations)
+    except (ValueError, TypeError) as exc:
+        # one corrupt account row must fail its own login, not crash the login flow
+        logger.warning("unusable stored password hash: %s", exc)
         return False
-    result = 0
-    for x, y in zip(actual.encode("utf-8"), expected_hash_hex.encode("utf-8")):
-        result |= x ^ y
-    return result == 0
+    # constant-time compare
+    return hmac.compare_digest(actual.encode("utf-8"), expected.encode("utf-8"))
 
 
+def needs_rehash(stored_hash: str, iterations: Optional[int] = None) -> bool:
+    """True when the hash is legacy or uses a different cost than `iterations`."""
+    if "$" not in stored_hash:
+        return True
+    algorithm, stored_iterations, _ = parse_hash(stored_hash)
+    return algorithm != ALGORITHM or stored_iterations != (iterations or DEFAULT_ITERATIONS)
@@ -0,0 +1,57 @@
+import bisect
+import threading
+from typing import Dict, List, Sequence
+
+
+# Upper bounds in milliseconds; the last bucket collects everything above.
+DEFAULT_MS_BUCKETS: Sequence[float] = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket latency histogram (values in milliseconds)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_MS_BUCKETS) -> None:
+        self._bounds: List[float] = sorted(buckets)
+        self._counts: List[int] = [0] * (len(self._bounds) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        idx = bisect.bisect_left(self._bounds, value_ms)
+        with self._lock:
+            self._counts[idx] += 1
+            self.count += 1
+            self.total += value_ms
+            if value_ms > self.max:
+                self.max = value_ms
+
+    def percentile(self, pct: float) -> float:
+        """Approximate percentile: upper bound of the bucket holding the rank."""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = max(1, int(round(self.count * pct / 100.0)))
+            seen = 0
+            for idx, n in enumerate(self._counts):
+                seen += n
+                if seen >= rank:
+                    return self._bounds[idx] if idx < len(self._bounds) else self.max
+            return self.max
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            labels = [f"<={b:g}" for b in self._bounds] + [f">{self._bounds[-1]:g}"]
+            buckets = {label: n for label, n in zip(labels, self._counts) if n}
+            count, total, peak = self.count, self.total, self.max
+        return {
+            "count": count,
+            "total_ms": round(total, 3),
+            "avg_ms": round(total / count, 3) if count else 0.0,
+            "max_ms": round(peak, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": buckets,
+        }
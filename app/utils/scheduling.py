@@ -0,0 +1,149 @@
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+# Silent unless the host configures logging (the console UI must not be interleaved)
+logger.addHandler(logging.NullHandler())
+
+# Upper bound on one sleep so wall-clock jumps (DST, NTP) are noticed
+MAX_SLEEP_S = 60.0
+
+
+def parse_time_of_day(value: str) -> time:
+    """'21:00' -> time(21, 0)."""
+    try:
+        hh, mm = value.strip().split(":")
+        return time(int(hh), int(mm))
+    except ValueError:
+        raise ValueError(f"time of day must be HH:MM, got {value!r}") from None
+
+
+def next_daily_at(now: datetime, at: time) -> datetime:
+    """Next datetime strictly after `now` whose clock time is `at`."""
+    candidate = datetime.combine(now.date(), at)
+    return candidate if candidate > now else candidate + timedelta(days=1)
+
+
+def last_day_of_month(d: date) -> date:
+    first_next = date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+    return first_next - timedelta(days=1)
+
+
+def is_month_end(d: date) -> bool:
+    return d == last_day_of_month(d)
+
+
+def next_month_start_at(now: datetime, at: time) -> datetime:
+    """
+    Next datetime strictly after `now` on the 1st of a month at `at`, i.e. the
+    first run after a month has ended (month-end trigger for complete months).
+    """
+    candidate = datetime.combine(now.date().replace(day=1), at)
+    if candidate > now:
+        return candidate
+    following = last_day_of_month(now.date()) + timedelta(days=1)
+    return datetime.combine(following, at)
+
+
+def day_window(d: date) -> Tuple[datetime, datetime]:
+    return datetime.combine(d, time.min), datetime.combine(d, time.max)
+
+
+def week_start(d: date) -> date:
+    """Monday of the week containing `d`."""
+    return d - timedelta(days=d.weekday())
+
+
+def month_window(year: int, month: int) -> Tuple[datetime, datetime]:
+    first = date(year, month, 1)
+    return datetime.combine(first, time.min), datetime.combine(last_day_of_month(first), time.max)
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    fn: Callable[[], None]
+    # now -> next run time; called after every run
+    next_after: Callable[[datetime], datetime]
+    next_run: Optional[datetime] = None
+
+
+class Scheduler:
+    """
+    Minimal in-process scheduler: one daemon thread sleeps until the earliest
+    job is due, runs it, and reschedules it with its `next_after` rule.
+    Jobs run sequentially on the scheduler thread; a failing job is logged and
+    rescheduled. stop() wakes the thread immediately.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = datetime.now) -> None:
+        self._clock = clock
+        self._jobs: List[ScheduledJob] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_job(
+        self,
+        name: str,
+        fn: Callable[[], None],
+        next_after: Callable[[datetime], datetime],
+        run_now: bool = False,
+    ) -> ScheduledJob:
+        now = self._clock()
+        job = ScheduledJob(name, fn, next_after, now if run_now else next_after(now))
+        with self._lock:
+            self._jobs.append(job)
+        self._wake.set()
+        return job
+
+    def daily(self, name: str, fn: Callable[[], None], at: time, run_now: bool = False) -> ScheduledJob:
+        return self.add_job(name, fn, lambda now: next_daily_at(now, at), run_now)
+
+    def monthly(self, name: str, fn: Callable[[], None], at: time, run_now: bool = False) -> ScheduledJob:
+        return self.add_job(name, fn, lambda now: next_month_start_at(now, at), run_now)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_forever(self) -> None:
+        while not self._stopped.is_set():
+            self.run_pending()
+            self._wake.clear()
+            delay = self._seconds_until_next()
+            self._wake.wait(delay)
+
+    def run_pending(self) -> None:
+        now = self._clock()
+        with self._lock:
+            due = [j for j in self._jobs if j.next_run is not None and j.next_run <= now]
+        for job in due:
+            if self._stopped.is_set():
+                return
+            try:
+                job.fn()
+            except Exception:
+                logger.exception("scheduled job %s failed", job.name)
+            job.next_run = job.next_after(self._clock())
+
+    def _seconds_until_next(self) -> float:
+        with self._lock:
+            runs = [j.next_run for j in self._jobs if j.next_run is not None]
+        if not runs:
+            return MAX_SLEEP_S
+        return min(MAX_SLEEP_S, max(0.0, (min(runs) - self._clock()).total_seconds()))
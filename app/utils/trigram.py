@@ -0,0 +1,147 @@
+import math
+import re
+from array import array
+from heapq import nlargest
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize(text: str) -> str:
+    """Lower-case, with runs of punctuation/whitespace collapsed to one space."""
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    pg_trgm-style trigram set: each word is padded with two leading spaces and
+    one trailing space, so short words and word starts still produce trigrams.
+    """
+    grams: Set[str] = set()
+    for word in normalize(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    In-memory fuzzy lookup by trigram similarity (Jaccard, as in pg_trgm).
+    - Documents live in numbered slots; each trigram's posting list is a
+      compact array of slot numbers (4 bytes per entry), and per document
+      only its key and trigram count are kept, not its text.
+    - remove() and re-add() leave tombstones; postings are compacted once
+      tombstones exceed `compact_ratio` of the slots, so memory stays
+      proportional to the live documents.
+    - At most `max_docs` documents are held; add() returns False beyond that.
+    - search() counts shared trigrams per document by merging the query's
+      posting lists in C (Counter) and scores only documents sharing enough
+      trigrams to reach `min_similarity`; no per-candidate string work is
+      done.
+    Not thread-safe; callers serialize access.
+    """
+
+    def __init__(self, max_docs: int = 2_000_000, max_text_len: int = 64, compact_ratio: float = 0.25) -> None:
+        if max_docs <= 0:
+            raise ValueError("max_docs must be positive")
+        self.max_docs = max_docs
+        self.max_text_len = max_text_len
+        self.compact_ratio = compact_ratio
+        self._postings: Dict[str, array] = {}
+        self._slot_of: Dict[Hashable, int] = {}
+        self._keys: List[Optional[Hashable]] = []  # None marks a tombstone
+        self._sizes = array("H")  # trigrams per slot
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slot_of
+
+    def add(self, key: Hashable, text: str) -> bool:
+        """Index (or re-index) `key`; False when the index is full or the text has no words."""
+        self.remove(key)
+        grams = trigrams(normalize(text)[: self.max_text_len])
+        if not grams or len(self._slot_of) >= self.max_docs:
+            return False
+        slot = len(self._keys)
+        self._keys.append(key)
+        self._sizes.append(len(grams))
+        self._slot_of[key] = slot
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("I")
+            posting.append(slot)
+        return True
+
+    def add_many(self, docs: Iterable[Tuple[Hashable, str]]) -> int:
+        """Bulk add; returns the number of documents indexed."""
+        return sum(1 for key, text in docs if self.add(key, text))
+
+    def remove(self, key: Hashable) -> bool:
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        self._keys[slot] = None
+        self._dead += 1
+        if self._dead > self.compact_ratio * len(self._keys):
+            self.compact()
+        return True
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._slot_of.clear()
+        self._keys.clear()
+        self._sizes = array("H")
+        self._dead = 0
+
+    def compact(self) -> None:
+        """Drop tombstones and renumber slots."""
+        remap = array("i", [-1]) * len(self._keys)
+        keys: List[Optional[Hashable]] = []
+        sizes = array("H")
+        for slot, key in enumerate(self._keys):
+            if key is not None:
+                remap[slot] = len(keys)
+                keys.append(key)
+                sizes.append(self._sizes[slot])
+        postings: Dict[str, array] = {}
+        for gram, posting in self._postings.items():
+            live = array("I", (remap[s] for s in posting if remap[s] >= 0))
+            if live:
+                postings[gram] = live
+        self._postings = postings
+        self._keys, self._sizes = keys, sizes
+        self._slot_of = {key: slot for slot, key in enumerate(keys)}
+        self._dead = 0
+
+    def search(self, query: str, limit: int = 5, min_similarity: float = 0.3) -> List[Tuple[Hashable, float]]:
+        """Best matches as (key, similarity), most similar first."""
+        q = trigrams(normalize(query)[: self.max_text_len])
+        if not q or limit <= 0:
+            return []
+        shared: Counter = Counter()
+        for gram in q:
+            posting = self._postings.get(gram)
+            if posting is not None:
+                shared.update(posting)
+        # J = s / (|q| + |d| - s) >= t needs s >= t * |q| shared trigrams
+        n = len(q)
+        need = max(1, math.ceil(min_similarity * n - 1e-9))
+        keys, sizes = self._keys, self._sizes
+        scored = [
+            (s / (n + sizes[slot] - s), -slot)
+            for slot, s in shared.items()
+            if s >= need and keys[slot] is not None
+        ]
+        best = nlargest(limit, (x for x in scored if x[0] >= min_similarity))
+        return [(keys[-neg_slot], score) for score, neg_slot in best]
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the postings and per-document slots."""
+        postings = sum(p.buffer_info()[1] * p.itemsize + 64 for p in self._postings.values())
+        slots = len(self._keys) * (8 + 2) + len(self._slot_of) * 100
+        return postings + slots
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Catalog search latency: CatalogService.search over a large synthetic catalog.
+
+Loads --items synthetic items (names, descriptions and categories drawn from
+a small vocabulary with Zipf-skewed word frequencies, so some terms match a
+large share of the catalog) into the configured MySQL database, then times
+--queries searches of one or two words, first pages and deeper pages.
+Reports p50/p95/p99 latency. Benchmark items are removed afterwards unless
+--keep is given.
+
+    python -m benchmarks.catalog_search --items 1000000 --queries 500
+"""
+import argparse
+import itertools
+import random
+import time
+import uuid
+from typing import List, Sequence
+
+from app.repositories import base
+from app.services.catalog_service import CatalogService
+
+ADJECTIVES = ["red", "blue", "green", "black", "white", "wireless", "portable", "classic", "smart", "compact",
+              "deluxe", "vintage", "organic", "premium", "mini", "ultra", "silent", "rugged", "slim", "solar"]
+NOUNS = ["shoe", "lamp", "phone", "kettle", "chair", "speaker", "jacket", "watch", "camera", "bottle",
+         "backpack", "keyboard", "blender", "headset", "charger", "tent", "mug", "desk", "drone", "scarf"]
+CATEGORIES = ["Electronics", "Home", "Kitchen", "Outdoors", "Fashion", "Office", "Sports", "Toys"]
+INSERT_CHUNK = 5000
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(len(sorted_values) * pct / 100.0)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def zipf_choice(rng: random.Random, words: List[str]) -> str:
+    cum = _ZIPF_CUM.get(len(words))
+    if cum is None:
+        cum = _ZIPF_CUM[len(words)] = list(itertools.accumulate(1.0 / r for r in range(1, len(words) + 1)))
+    return rng.choices(words, cum_weights=cum)[0]
+
+
+_ZIPF_CUM: dict = {}
+
+
+def load_items(tag: str, n: int, rng: random.Random) -> None:
+    rows = []
+    for i in range(n):
+        adj, noun = zipf_choice(rng, ADJECTIVES), zipf_choice(rng, NOUNS)
+        rows.append((
+            f"{adj.title()} {noun} {i}",
+            f"{zipf_choice(rng, ADJECTIVES)} {noun} for everyday use ({tag})",
+            rng.choice(CATEGORIES),
+            f"{rng.uniform(1, 500):.2f}",
+            rng.randint(0, 100),
+            int(rng.paretovariate(1.5)) - 1,
+        ))
+        if len(rows) == INSERT_CHUNK:
+            _insert(rows)
+            rows = []
+    if rows:
+        _insert(rows)
+
+
+def _insert(rows: list) -> None:
+    base.executemany(
+        "INSERT INTO item (name, description, category, price, stock_quantity, like_count) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        rows,
+    )
+
+
+def cleanup(tag: str, after_id: int) -> None:
+    # Delete in small batches so each transaction's full-text index maintenance stays bounded
+    while base.execute_count(
+        "DELETE FROM item WHERE id > %s AND description LIKE %s ORDER BY id LIMIT 10000",
+        (after_id, f"%({tag})"),
+    ):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--max-page", type=int, default=3, help="pages are drawn from 1..max-page")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="leave benchmark rows in the database")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tag = f"bench-search-{uuid.uuid4().hex[:8]}"
+    after_id = int(base.fetch_one_tuple("SELECT COALESCE(MAX(id), 0) FROM item")[0])
+    catalog = CatalogService()
+    latencies: List[float] = []
+    hits = 0
+    try:
+        started = time.perf_counter()
+        load_items(tag, args.items, rng)
+        load_s = time.perf_counter() - started
+        for _ in range(args.queries):
+            words = [zipf_choice(rng, ADJECTIVES + NOUNS) for _ in range(rng.choice((1, 1, 2)))]
+            if rng.random() < 0.3:
+                words[-1] = words[-1][:3]  # prefix as typed
+            page = rng.randint(1, args.max_page)
+            t0 = time.perf_counter()
+            result = catalog.search(" ".join(words), page=page)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            hits += bool(result.items)
+    finally:
+        if not args.keep:
+            cleanup(tag, after_id)
+
+    latencies.sort()
+    print(f"items loaded: {args.items:,} in {load_s:.1f}s  queries: {args.queries}  with results: {hits}")
+    print(f"latency ms: p50={percentile(latencies, 50):.1f}  p95={percentile(latencies, 95):.1f}  "
+          f"p99={percentile(latencies, 99):.1f}  max={latencies[-1] if latencies else 0.0:.1f}")
+
+
+if __name__ == "__main__":
+    main()
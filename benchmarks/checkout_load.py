@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Concurrent checkout load: many customers buying a few hot items at once.
+
+Drives OrderService.place_order from worker threads against the configured
+MySQL database (DB_* env vars). Item popularity follows a Zipf distribution
+(--skew 0 is uniform), so a handful of rows take most of the lock traffic.
+
+Reports orders/sec, p50/p95/p99 checkout latency, deadlocks, lock-wait
+timeouts and retries seen by base.run_transaction, and verifies that no item
+was oversold. Benchmark accounts, items and orders are removed afterwards
+unless --keep is given.
+
+    python -m benchmarks.checkout_load --customers 32 --orders 50 --items 20 --skew 1.2
+"""
+import argparse
+import os
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+from mysql.connector import Error as DBError
+
+from app.db.connection import pool_stats
+from app.models import Account, PaymentMethod
+from app.repositories import base
+from app.repositories.account_repository import AccountRepository
+from app.services.order_service import OrderService
+
+
+@dataclass
+class WorkerResult:
+    latencies_ms: List[float] = field(default_factory=list)
+    outcomes: Counter = field(default_factory=Counter)
+
+
+def zipf_weights(n: int, skew: float) -> List[float]:
+    return [1.0 / (rank ** skew) for rank in range(1, n + 1)]
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(len(sorted_values) * pct / 100.0)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def create_customers(run_id: str, n: int) -> List[str]:
+    ids: List[str] = []
+    for i in range(n):
+        account = Account(
+            user_name=f"bench_{run_id}_{i}"[:30],
+            password="benchmark-not-a-login",
+            salt=os.urandom(16),
+            first_name="Bench",
+            last_name=f"Customer{i}",
+            email=f"bench_{run_id}_{i}@example.invalid",
+        )
+        AccountRepository.create(account)
+        ids.append(account.id)
+    return ids
+
+
+def create_items(run_id: str, n: int, stock: int) -> List[int]:
+    prefix = f"bench-checkout-{run_id}-"
+    base.executemany(
+        "INSERT INTO item (name, description, category, price, stock_quantity, like_count) "
+        "VALUES (%s, %s, %s, %s, %s, %s)",
+        [(f"{prefix}{i}", "checkout load benchmark", "Benchmark", "9.99", stock, 0) for i in range(n)],
+    )
+    rows = base.fetch_all_tuples("SELECT id FROM item WHERE name LIKE %s ORDER BY id", (prefix + "%",))
+    return [int(r[0]) for r in rows]
+
+
+def worker(
+    customer_id: str,
+    item_ids: List[int],
+    weights: List[float],
+    orders: int,
+    max_lines: int,
+    max_qty: int,
+    seed: int,
+    start: threading.Barrier,
+    result: WorkerResult,
+) -> None:
+    rng = random.Random(seed)
+    service = OrderService()
+    start.wait()
+    for _ in range(orders):
+        wanted: Dict[int, int] = {}
+        for iid in rng.choices(item_ids, weights=weights, k=rng.randint(1, max_lines)):
+            wanted[iid] = wanted.get(iid, 0) + rng.randint(1, max_qty)
+        began = time.perf_counter()
+        try:
+            service.place_order(customer_id, wanted, "CA", "Benchville", "1 Load St", PaymentMethod.CREDIT)
+            outcome = "ok"
+        except ValueError as exc:
+            outcome = "out_of_stock" if "stock" in str(exc).lower() else "rejected"
+        except DBError as exc:
+            outcome = f"db_error_{getattr(exc, 'errno', None)}"
+        result.latencies_ms.append((time.perf_counter() - began) * 1000.0)
+        result.outcomes[outcome] += 1
+
+
+def check_oversell(item_ids: List[int], initial_stock: int) -> List[str]:
+    placeholders = ", ".join(["%s"] * len(item_ids))
+    stock = dict(
+        base.fetch_all_tuples(f"SELECT id, stock_quantity FROM item WHERE id IN ({placeholders})", tuple(item_ids))
+    )
+    sold = dict(
+        base.fetch_all_tuples(
+            f"SELECT item_id, SUM(quantity) FROM order_item WHERE item_id IN ({placeholders}) GROUP BY item_id",
+            tuple(item_ids),
+        )
+    )
+    problems: List[str] = []
+    for iid in item_ids:
+        left, units = int(stock[iid]), int(sold.get(iid) or 0)
+        if left < 0:
+            problems.append(f"item {iid}: stock went negative ({left})")
+        if units > initial_stock:
+            problems.append(f"item {iid}: sold {units} of {initial_stock}")
+        if left != initial_stock - units:
+            problems.append(f"item {iid}: stock {left} != {initial_stock} - {units} sold")
+    return problems
+
+
+def cleanup(customer_ids: List[str], item_ids: List[int]) -> None:
+    customers = ", ".join(["%s"] * len(customer_ids))
+    order_filter = f"SELECT id FROM `order` WHERE customer_id IN ({customers})"
+    with base.unit_of_work():
+        order_ids = [int(r[0]) for r in base.fetch_all_tuples(order_filter, tuple(customer_ids))]
+        for chunk in base.chunked(order_ids):
+            marks = ", ".join(["%s"] * len(chunk))
+            base.execute(f"DELETE FROM order_item WHERE order_id IN ({marks})", tuple(chunk))
+            base.execute(f"DELETE FROM `order` WHERE id IN ({marks})", tuple(chunk))
+        items = ", ".join(["%s"] * len(item_ids))
+        base.execute(f"DELETE FROM daily_item_sales WHERE item_id IN ({items})", tuple(item_ids))
+        base.execute(f"DELETE FROM item WHERE id IN ({items})", tuple(item_ids))
+        base.execute(f"DELETE FROM account WHERE id IN ({customers})", tuple(customer_ids))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=16, help="concurrent customers (threads)")
+    parser.add_argument("--orders", type=int, default=50, help="checkouts per customer")
+    parser.add_argument("--items", type=int, default=20, help="catalog size for the run")
+    parser.add_argument("--stock", type=int, default=500, help="initial stock per item")
+    parser.add_argument("--skew", type=float, default=1.2, help="Zipf exponent for item popularity (0 = uniform)")
+    parser.add_argument("--max-lines", type=int, default=3, help="max items per order")
+    parser.add_argument("--max-qty", type=int, default=2, help="max quantity per line")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="leave benchmark rows in the database")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    customer_ids = create_customers(run_id, args.customers)
+    item_ids = create_items(run_id, args.items, args.stock)
+    weights = zipf_weights(len(item_ids), args.skew)
+
+    results = [WorkerResult() for _ in customer_ids]
+    barrier = threading.Barrier(len(customer_ids) + 1)
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(cid, item_ids, weights, args.orders, args.max_lines, args.max_qty, args.seed + i, barrier, results[i]),
+            daemon=True,
+        )
+        for i, cid in enumerate(customer_ids)
+    ]
+    for t in threads:
+        t.start()
+    base.reset_transaction_stats()
+    barrier.wait()
+    started = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(ms for r in results for ms in r.latencies_ms)
+    outcomes: Counter = Counter()
+    for r in results:
+        outcomes.update(r.outcomes)
+    txn = base.transaction_stats()
+    pool = pool_stats()
+
+    try:
+        problems = check_oversell(item_ids, args.stock)
+    finally:
+        if not args.keep:
+            cleanup(customer_ids, item_ids)
+
+    print(f"customers: {args.customers}  orders/customer: {args.orders}  items: {args.items}  "
+          f"stock/item: {args.stock}  skew: {args.skew}")
+    print(f"elapsed: {elapsed:.2f}s  attempts: {len(latencies)}  "
+          f"orders/sec: {outcomes['ok'] / elapsed:.1f}")
+    print("outcomes: " + ", ".join(f"{k}={v}" for k, v in sorted(outcomes.items())))
+    print(f"latency ms: p50={percentile(latencies, 50):.1f}  p95={percentile(latencies, 95):.1f}  "
+          f"p99={percentile(latencies, 99):.1f}  max={latencies[-1] if latencies else 0.0:.1f}")
+    print(f"deadlocks: {txn['deadlocks']}  lock_wait_timeouts: {txn['lock_wait_timeouts']}  "
+          f"retries: {txn['retries']}  gave_up: {txn['gave_up']}")
+    print(f"pool: exhausted_events={pool['exhausted_events']}  checkout_timeouts={pool['checkout_timeouts']}  "
+          f"checkout p95={pool['checkout_ms']['p95_ms']}ms")
+    if problems:
+        print("OVERSOLD:")
+        for p in problems:
+            print(f"  {p}")
+        raise SystemExit(1)
+    print("oversell check: ok")
+
+
+if __name__ == "__main__":
+    main()
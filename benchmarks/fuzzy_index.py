@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Fuzzy item lookup: trigram index build time, memory and "did you mean" latency.
+
+Runs offline against the same TrigramIndex the item name index uses. Builds
+it over --items synthetic item names ("<Brand> <adjective> <noun> <model>",
+with a few thousand invented brand names so trigrams are not all common),
+then times --queries lookups of indexed names with one or two typos
+(dropped, doubled, swapped or replaced letters). Reports build rate, the
+index's memory estimate and process RSS growth, query p50/p95/p99 latency,
+and how often the intended item was among the top --limit suggestions.
+
+    python -m benchmarks.fuzzy_index --items 1000000 --queries 1000
+"""
+import argparse
+import random
+import resource
+import string
+import time
+from typing import List, Sequence
+
+from app.utils.trigram import TrigramIndex
+
+ADJECTIVES = ["red", "blue", "green", "black", "white", "wireless", "portable", "classic", "smart", "compact",
+              "deluxe", "vintage", "organic", "premium", "mini", "ultra", "silent", "rugged", "slim", "solar"]
+NOUNS = ["shoe", "lamp", "phone", "kettle", "chair", "speaker", "jacket", "watch", "camera", "bottle",
+         "backpack", "keyboard", "blender", "headset", "charger", "tent", "mug", "desk", "drone", "scarf"]
+CONSONANTS = "bcdfghklmnprstvz"
+VOWELS = "aeiou"
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(len(sorted_values) * pct / 100.0)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def brand(rng: random.Random) -> str:
+    syllables = rng.randint(2, 3)
+    return "".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(syllables)).title()
+
+
+def make_names(n: int, rng: random.Random) -> List[str]:
+    brands = [brand(rng) for _ in range(5000)]
+    return [
+        f"{rng.choice(brands)} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.choice(string.ascii_uppercase)}{rng.randint(1, 999)}"
+        for _ in range(n)
+    ]
+
+
+def typo(text: str, rng: random.Random) -> str:
+    i = rng.randrange(len(text))
+    kind = rng.randrange(4)
+    if kind == 0:
+        return text[:i] + text[i + 1:]
+    if kind == 1:
+        return text[:i] + text[i] + text[i:]
+    if kind == 2 and i + 1 < len(text):
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    return text[:i] + rng.choice(string.ascii_lowercase) + text[i + 1:]
+
+
+def rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=5, help="suggestions per query")
+    parser.add_argument("--min-similarity", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = make_names(args.items, rng)
+    rss_before = rss_mb()
+
+    index = TrigramIndex(max_docs=args.items)
+    started = time.perf_counter()
+    index.add_many(enumerate(names, start=1))
+    build_s = time.perf_counter() - started
+    rss_after = rss_mb()
+
+    latencies: List[float] = []
+    found = 0
+    for _ in range(args.queries):
+        item_id = rng.randint(1, args.items)
+        query = names[item_id - 1].lower()
+        for _ in range(rng.choice((1, 2))):
+            query = typo(query, rng)
+        t0 = time.perf_counter()
+        matches = index.search(query, limit=args.limit, min_similarity=args.min_similarity)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        found += any(key == item_id for key, _ in matches)
+
+    latencies.sort()
+    print(f"items: {len(index):,}  build: {build_s:.1f}s ({len(index) / build_s:,.0f} names/s)")
+    print(f"memory: index estimate {index.memory_bytes() / 2**20:.0f} MiB, "
+          f"peak RSS +{rss_after - rss_before:.0f} MiB during build")
+    print(f"queries: {args.queries}  intended item in top {args.limit}: {found / max(1, args.queries):.1%}")
+    print(f"latency ms: p50={percentile(latencies, 50):.1f}  p95={percentile(latencies, 95):.1f}  "
+          f"p99={percentile(latencies, 99):.1f}  max={latencies[-1] if latencies else 0.0:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Password verification throughput: logins/sec inline vs. the hashing process pool.
+
+Runs offline: each "login" is one verify_password of a stored hash, which is
+what dominates AuthService.login. Verifications are submitted concurrently
+(as a burst of logins would be) and the rate is reported in total and per
+worker process.
+
+    python -m benchmarks.login_hashing --logins 200 --workers 1 2 4
+    python -m benchmarks.login_hashing --iterations 600000
+"""
+import argparse
+import os
+import time
+
+from app.services.password_hasher import PasswordHasher
+from app.utils import hashing
+
+
+def run(hasher: PasswordHasher, logins: int, salt: bytes, stored: str) -> float:
+    start = time.perf_counter()
+    futures = [hasher.submit_verify("correct horse", salt, stored) for _ in range(logins)]
+    assert all(f.result() for f in futures)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=hashing.DEFAULT_ITERATIONS)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="pool sizes to measure")
+    args = parser.parse_args()
+
+    stored, salt = hashing.make_password_hash("correct horse", iterations=args.iterations)
+    print(f"logins: {args.logins}, PBKDF2-SHA256 iterations: {args.iterations:,}, cores: {os.cpu_count()}")
+
+    inline = PasswordHasher(workers=0, iterations=args.iterations)
+    elapsed = run(inline, args.logins, salt, stored)
+    base_rate = args.logins / elapsed
+    print(f"inline (caller thread): {base_rate:8.1f} logins/s  {elapsed / args.logins * 1000:6.1f} ms/login")
+
+    for workers in args.workers:
+        hasher = PasswordHasher(workers=workers, iterations=args.iterations)
+        try:
+            run(hasher, workers, salt, stored)  # start the worker processes outside the timing
+            elapsed = run(hasher, args.logins, salt, stored)
+        finally:
+            hasher.shutdown()
+        rate = args.logins / elapsed
+        print(
+            f"pool, {workers} worker(s):     {rate:8.1f} logins/s  {rate / workers:8.1f} per core"
+            f"  ({rate / base_rate:.2f}x inline)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Per-row decode cost: dict rows + validating constructor vs tuple rows + RowMapper.
+
+Runs offline on synthetic rows shaped like `item` results, so it measures only
+the Python-side decode, not the network or MySQL.
+
+    python -m benchmarks.row_decode --rows 1000000
+"""
+import argparse
+import time
+from decimal import Decimal
+from typing import Callable, List
+
+from app.models import Item
+from app.repositories.item_repository import ITEM_COLUMNS, _row_to_item
+
+
+def _legacy_row_to_item(row: dict) -> Item:
+    # Previous hand-written mapper (validated through Item.__post_init__)
+    return Item(
+        id=row["id"],
+        name=row.get("name"),
+        description=row.get("description"),
+        category=row.get("category"),
+        price=row.get("price"),
+        stock_quantity=row.get("stock_quantity"),
+        like_count=row.get("like_count"),
+    )
+
+
+def make_tuples(n: int) -> List[tuple]:
+    price = Decimal("19.99")
+    return [(i, f"Item {i}", "Synthetic item", "Electronics", price, 100, i % 50) for i in range(1, n + 1)]
+
+
+def run_legacy(tuples: List[tuple]) -> float:
+    # dictionary cursor rows, copied with dict(r) as base.fetch_all used to do
+    dict_rows = [dict(zip(ITEM_COLUMNS, t)) for t in tuples]
+    start = time.perf_counter()
+    copied = [dict(r) for r in dict_rows]
+    items = [_legacy_row_to_item(r) for r in copied]
+    elapsed = time.perf_counter() - start
+    assert len(items) == len(tuples)
+    return elapsed
+
+
+def run_mapper(tuples: List[tuple]) -> float:
+    start = time.perf_counter()
+    items = _row_to_item.map_all(tuples)
+    elapsed = time.perf_counter() - start
+    assert len(items) == len(tuples)
+    return elapsed
+
+
+def best_of(fn: Callable[[List[tuple]], float], rows: List[tuple], repeat: int) -> float:
+    return min(fn(rows) for _ in range(repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_tuples(args.rows)
+    legacy = best_of(run_legacy, rows, args.repeat)
+    mapped = best_of(run_mapper, rows, args.repeat)
+    print(f"rows: {args.rows:,}")
+    print(f"dict + dict(r) + Item(...):  {legacy:.3f}s  ({legacy / args.rows * 1e9:.0f} ns/row)")
+    print(f"tuple + RowMapper (trusted): {mapped:.3f}s  ({mapped / args.rows * 1e9:.0f} ns/row)")
+    print(f"speedup: {legacy / mapped:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -189,6 +189,13 @@ def seed_from_csvs(host: str, port: int, database: str, user: str, password: str
             "VALUES (%s,%s,%s,%s,%s,%s)",
             message_values,
         )
+        # conversation inbox counters are normally maintained by the app
+        cursor.execute(
+            "UPDATE conversation c SET "
+            "unread_count = (SELECT COUNT(*) FROM message m WHERE m.conversation_id = c.id "
+            "AND m.role = 'Customer' AND m.is_read = FALSE), "
+            "last_message_at = (SELECT MAX(m.created_at) FROM message m WHERE m.conversation_id = c.id)"
+        )
 
         # 7) report
         report_rows = read_csv_rows(data_dir / "report.csv")
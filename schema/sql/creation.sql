@@ -1,5 +1,8 @@
 
 -- Drop tables in dependency order (optional, for re-runs)
+DROP TABLE IF EXISTS report_run;
+DROP TABLE IF EXISTS daily_item_sales_day;
+DROP TABLE IF EXISTS daily_item_sales;
 DROP TABLE IF EXISTS liked_item;
 DROP TABLE IF EXISTS report_content;
 DROP TABLE IF EXISTS order_item;
@@ -32,7 +35,10 @@ CREATE TABLE account (
     updated_at     DATETIME      NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     PRIMARY KEY (id),
     UNIQUE KEY uq_account_username (user_name),
-    UNIQUE KEY uq_account_email (email)
+    UNIQUE KEY uq_account_email (email),
+    -- staff customer search (prefix matches on "last first" / "first last")
+    KEY idx_account_role_last_first (role, last_name, first_name),
+    KEY idx_account_role_first_last (role, first_name, last_name)
 );
 
 -- 2. ITEM
@@ -44,7 +50,15 @@ CREATE TABLE item (
     price          DECIMAL(10,2) NOT NULL,
     stock_quantity INT           NOT NULL DEFAULT 0,
     like_count     INT           NOT NULL DEFAULT 0,
-    PRIMARY KEY (id)
+    PRIMARY KEY (id),
+    -- popular-first catalog ordering (keyset pagination on like_count, id)
+    KEY idx_item_popularity (like_count DESC, id ASC),
+    -- filtered browsing (ItemRepository.browse) and category facet counts
+    KEY idx_item_category_popularity (category, like_count DESC, id ASC),
+    KEY idx_item_category_price (category, price, id),
+    KEY idx_item_price (price, id),
+    -- catalog search (ItemRepository.search)
+    FULLTEXT KEY ft_item_text (name, description, category)
 );
 
 -- 3. REPORT
@@ -56,7 +70,8 @@ CREATE TABLE report (
     created_date   DATETIME      NOT NULL DEFAULT CURRENT_TIMESTAMP,
     sold_quantity  INT           NOT NULL DEFAULT 0,
     total_revenue  DECIMAL(10,2) NOT NULL DEFAULT 0.00,
-    PRIMARY KEY (id)
+    PRIMARY KEY (id),
+    KEY idx_report_type_start (type, start_date)
 );
 
 -- 4. ORDER
@@ -75,6 +90,7 @@ CREATE TABLE `order` (
     updated_at      DATETIME      NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     PRIMARY KEY (id),
     KEY idx_order_customer_id (customer_id),
+    KEY idx_order_order_date (order_date),
     CONSTRAINT fk_order_customer
         FOREIGN KEY (customer_id) REFERENCES account(id)
         ON UPDATE CASCADE
@@ -86,10 +102,16 @@ CREATE TABLE conversation (
     id              INT           NOT NULL AUTO_INCREMENT,
     customer_id     CHAR(36)      NOT NULL,
     subject         VARCHAR(200)  NOT NULL,
+    -- inbox counters, maintained with every message insert / mark-read
+    unread_count    INT           NOT NULL DEFAULT 0,   -- unread customer messages
+    last_message_at DATETIME      NULL,
+    has_unread      BOOLEAN       AS (unread_count > 0) STORED,
     created_at      DATETIME      NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at      DATETIME      NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     PRIMARY KEY (id),
     KEY idx_conversation_customer_id (customer_id),
+    KEY idx_conversation_inbox (has_unread, last_message_at, id),
+    KEY idx_conversation_activity (last_message_at, id),
     CONSTRAINT fk_conversation_customer
         FOREIGN KEY (customer_id) REFERENCES account(id)
         ON UPDATE CASCADE
@@ -109,7 +131,7 @@ CREATE TABLE message (
     PRIMARY KEY (id),
     KEY idx_message_user_id (user_id),
     KEY idx_message_conversation_id (conversation_id),
-    KEY idx_message_unread (is_read, role),
+    KEY idx_message_conversation_unread (conversation_id, is_read, role),
     CONSTRAINT fk_message_user
         FOREIGN KEY (user_id) REFERENCES account(id)
         ON UPDATE CASCADE
@@ -182,4 +204,43 @@ CREATE TABLE liked_item (
         FOREIGN KEY (item_id) REFERENCES item(id)
         ON UPDATE CASCADE
         ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+-- 10. DAILY_ITEM_SALES
+-- Per-day, per-item sales rollup read by reports; maintained at checkout and
+-- rebuilt per day by the catch-up job (no FK on item_id: history outlives items).
+CREATE TABLE daily_item_sales (
+    sale_date  DATE          NOT NULL,
+    item_id    INT           NOT NULL,
+    item_sold  INT           NOT NULL DEFAULT 0,
+    revenue    DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (sale_date, item_id)
+);
+
+-- 11. DAILY_ITEM_SALES_DAY
+-- Days whose rollup rows have been rebuilt from the order tables.
+CREATE TABLE daily_item_sales_day (
+    sale_date  DATE          NOT NULL,
+    built_at   DATETIME      NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (sale_date)
+);
+
+-- 12. REPORT_RUN
+-- History of scheduled report generation (one row per generated or failed window).
+CREATE TABLE report_run (
+    id           INT           NOT NULL AUTO_INCREMENT,
+    type         ENUM('Daily', 'Weekly', 'Monthly') NOT NULL,
+    start_date   DATETIME      NOT NULL,
+    end_date     DATETIME      NOT NULL,
+    status       ENUM('Succeeded', 'Failed') NOT NULL,
+    report_id    INT           NULL,
+    started_at   DATETIME      NOT NULL,
+    duration_ms  INT           NOT NULL DEFAULT 0,
+    error        VARCHAR(500)  NULL,
+    PRIMARY KEY (id),
+    KEY idx_report_run_started_at (started_at),
+    CONSTRAINT fk_report_run_report
+        FOREIGN KEY (report_id) REFERENCES report(id)
+        ON UPDATE CASCADE
+        ON DELETE SET NULL
+);
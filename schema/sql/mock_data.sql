@@ -90,6 +90,12 @@ INSERT INTO message (
 (3, 1, '11111111-1111-1111-1111-111111111111', 'Customer',
  'New address is 789 New Street, Troy, AL 36082.', 0);
 
+-- Inbox counters (maintained by the app for new messages)
+UPDATE conversation c SET
+    unread_count = (SELECT COUNT(*) FROM message m
+                    WHERE m.conversation_id = c.id AND m.role = 'Customer' AND m.is_read = FALSE),
+    last_message_at = (SELECT MAX(m.created_at) FROM message m WHERE m.conversation_id = c.id);
+
 -- ================
 -- 7. REPORT (Daily sales report)
 -- Total sold quantity: 2 + 1 + 1 + 1 = 5